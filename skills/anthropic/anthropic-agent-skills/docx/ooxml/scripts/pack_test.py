@@ -0,0 +1,133 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+import zipfile
+import zlib
+from pathlib import Path
+from unittest import mock
+
+import pack
+
+DOCUMENT_XML = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    b"<w:body><w:p><w:r><w:t>Hello</w:t></w:r></w:p></w:body></w:document>"
+)
+
+PARTS = {
+    "[Content_Types].xml": b'<?xml version="1.0" encoding="UTF-8"?><Types/>',
+    "word/document.xml": DOCUMENT_XML,
+    "word/media/image1.png": bytes(range(256)) * 64,
+    "word/embeddings/data.bin": b"binary data " * 1000,
+}
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# Run from the ooxml/scripts directory: python -m unittest pack_test
+class TestPackRoundTrip(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+        self.original = self.temp_dir / "original.docx"
+        with zipfile.ZipFile(self.original, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in PARTS.items():
+                zf.writestr(name, data)
+
+        # Extract the parts and record them, as unpack.py does
+        self.unpacked = self.temp_dir / "unpacked"
+        crcs = {}
+        for name, data in PARTS.items():
+            path = self.unpacked / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            crcs[name] = zlib.crc32(data)
+        pack.write_unpack_record(self.unpacked, self.original, crcs)
+
+    def pack(self, **kwargs):
+        output = self.temp_dir / "output.docx"
+        self.assertTrue(pack.pack_document(self.unpacked, output, **kwargs))
+        return output
+
+    def assert_round_trip(self, output, expected=PARTS):
+        with zipfile.ZipFile(output) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual({name: zf.read(name) for name in zf.namelist()}, expected)
+
+    def test_unchanged_parts_copied(self):
+        """Test that unchanged parts are copied with the original's compressed bytes"""
+        output = self.pack()
+        self.assert_round_trip(output)
+        with zipfile.ZipFile(self.original) as original, zipfile.ZipFile(output) as zf:
+            for member in original.infolist():
+                copied = zf.getinfo(member.filename)
+                self.assertEqual(
+                    (copied.compress_type, copied.compress_size, copied.CRC),
+                    (member.compress_type, member.compress_size, member.CRC),
+                )
+
+    def test_public_api_fallback(self):
+        """Test packing without the zipfile internals used to copy raw bytes"""
+        edited = DOCUMENT_XML.replace(b"Hello", b"Edited")
+        (self.unpacked / "word" / "document.xml").write_bytes(edited)
+        expected = dict(PARTS, **{"word/document.xml": edited})
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs), mock.patch.object(
+                pack, "_can_write_compressed", return_value=False
+            ), mock.patch.object(pack, "_write_compressed") as write_compressed:
+                output = self.pack(compression=pack.CompressionPolicy(jobs=jobs))
+                write_compressed.assert_not_called()
+                self.assert_round_trip(output, expected)
+
+    def test_output_mode_follows_umask(self):
+        """Test that the packed file gets the mode of a newly created file"""
+        umask = os.umask(0o027)
+        try:
+            output = self.pack()
+        finally:
+            os.umask(umask)
+        self.assertEqual(output.stat().st_mode & 0o777, 0o640)
+
+    def test_edited_and_reencoded_parts(self):
+        """Test that edited XML is condensed and every part survives --reencode"""
+        pretty = DOCUMENT_XML.replace(b"<w:p>", b"\n    <w:p>").replace(
+            b"Hello", b"Edited"
+        )
+        (self.unpacked / "word" / "document.xml").write_bytes(pretty)
+        expected = dict(
+            PARTS, **{"word/document.xml": DOCUMENT_XML.replace(b"Hello", b"Edited")}
+        )
+        for kwargs in (
+            {},
+            {"reencode": True},
+            {"compression": pack.CompressionPolicy(jobs=2)},
+        ):
+            with self.subTest(**kwargs):
+                self.assert_round_trip(self.pack(**kwargs), expected)
+
+    def test_zip64_local_header(self):
+        """Test that an entry over the Zip64 limit gets a Zip64 local header"""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zinfo = zipfile.ZipInfo("large.bin")
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            zinfo.CRC = 0
+            zinfo.file_size = zipfile.ZIP64_LIMIT + 1
+            zinfo.compress_size = 1
+            pack._write_compressed(zf, zinfo, b"\0")
+            header = struct.unpack(
+                zipfile.structFileHeader, buffer.getvalue()[: zipfile.sizeFileHeader]
+            )
+            zf.filelist.clear()  # The entry's data is not real
+        # Sizes are 0xFFFFFFFF and the real ones follow in the Zip64 extra field
+        self.assertEqual(header[8:10], (0xFFFFFFFF, 0xFFFFFFFF))
+        extra_start = zipfile.sizeFileHeader + header[10]
+        extra_id = struct.unpack("<H", buffer.getvalue()[extra_start : extra_start + 2])
+        self.assertEqual(extra_id, (0x0001,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+"""
+Content-addressed cache of unpacked Office documents.
+
+Each entry holds the tree unpack.py wrote for one archive, keyed by the
+SHA-256 of the archive's bytes, along with the CRC-32 of every part:
+
+    <cache dir>/<sha256>.v<FORMAT_VERSION>/parts.json
+    <cache dir>/<sha256>.v<FORMAT_VERSION>/tree/...
+
+Unpacking an archive that is already cached only clones the tree: each file
+is a reflink (a copy-on-write clone, on filesystems that support them, e.g.
+Btrfs or XFS) or else a plain copy, or optionally a hard link. Entries are
+evicted least recently used first once the cache outgrows its size limit.
+
+The cache is only an optimization: any error reading or writing it is
+ignored, and the document is unpacked as if there were no cache.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Directory of the cache, unless given explicitly
+CACHE_ENV = "OOXML_UNPACK_CACHE"
+
+# Bump when unpack.py's output changes, so that older entries are not used
+FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+# ioctl cloning one file's extents into another (linux/fs.h)
+FICLONE = 0x40049409
+
+
+def default_cache_dir():
+    """Return the cache directory: $OOXML_UNPACK_CACHE, or ooxml-unpack in
+    $XDG_CACHE_HOME (default ~/.cache)."""
+    if os.environ.get(CACHE_ENV):
+        return Path(os.environ[CACHE_ENV])
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "ooxml-unpack"
+
+
+def clone_file(source, destination, link=False):
+    """Create destination with the content of source, sharing storage if possible.
+
+    The destination keeps the modification time of the source, as with
+    shutil.copy2(), but not its permissions.
+
+    Args:
+        source: Existing file
+        destination: File to create or overwrite
+        link: If True, hard link the files; the two are then one file, and
+            changing either in place changes both
+    """
+    # Never write through a link to another file, such as a cached one
+    try:
+        os.unlink(destination)
+    except FileNotFoundError:
+        pass
+    if link:
+        os.link(source, destination)
+        return
+
+    with open(source, "rb") as src, open(destination, "xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            shutil.copyfileobj(src, dst)  # No reflinks on this filesystem
+    stat = os.stat(source)
+    os.utime(destination, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def clone_tree(source, destination, names=None, link=False):
+    """Clone files from one directory into another with clone_file().
+
+    Args:
+        source: Directory to clone from
+        destination: Directory to clone into (created if missing)
+        names: Relative paths of the files to clone (default: all of them)
+        link: If True, hard link the files instead
+    """
+    source = Path(source)
+    destination = Path(destination)
+    if names is None:
+        names = [
+            f.relative_to(source).as_posix() for f in source.rglob("*") if f.is_file()
+        ]
+    destination.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        target = destination / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        clone_file(source / name, target, link)
+
+
+class UnpackCache:
+    """Unpacked trees of Office files, by the SHA-256 of the file."""
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: Directory of the cache (default: default_cache_dir())
+            max_bytes: Size the cache is trimmed to after adding an entry
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, office_file):
+        """Return the cache key of an Office file."""
+        digest = hashlib.sha256()
+        with open(office_file, "rb") as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+        return f"{digest.hexdigest()}.v{FORMAT_VERSION}"
+
+    def get(self, key, output_dir, select=None, link=False):
+        """Clone a cached tree into output_dir.
+
+        Args:
+            key: Cache key of the Office file
+            output_dir: Directory to clone the tree into
+            select: Optional predicate on part names; only the parts it
+                accepts are cloned
+            link: If True, hard link the files instead
+
+        Returns:
+            dict: {part name: CRC-32} of the parts cloned, or None if the
+            file is not cached
+        """
+        entry = self.cache_dir / key
+        try:
+            with open(entry / "parts.json", encoding="utf-8") as f:
+                crcs = json.load(f)["parts"]
+            os.utime(entry)  # Most recently used
+            if select is not None:
+                crcs = {name: crc for name, crc in crcs.items() if select(name)}
+            clone_tree(entry / "tree", output_dir, crcs, link)
+        except (OSError, ValueError, KeyError):
+            return None  # Not cached, or evicted while being cloned
+        return crcs
+
+    def put(self, key, unpacked_dir, crcs):
+        """Add the tree unpack.py wrote for an Office file, then trim the cache.
+
+        Args:
+            key: Cache key of the Office file
+            unpacked_dir: Directory the file was unpacked to
+            crcs: {part name: CRC-32} of every part written
+        """
+        entry = self.cache_dir / key
+        if entry.exists():
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.cache_dir))
+            try:
+                clone_tree(unpacked_dir, staging / "tree", crcs)
+                # Read-only, so that writing through a hard link fails
+                for f in (staging / "tree").rglob("*"):
+                    if f.is_file():
+                        f.chmod(0o444)
+                size = sum(f.stat().st_size for f in staging.rglob("*") if f.is_file())
+                with open(staging / "parts.json", "w", encoding="utf-8") as f:
+                    json.dump({"size": size, "parts": crcs}, f)
+                # Entries appear complete or not at all
+                staging.rename(entry)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+        except OSError:
+            return  # Another process added it first, or the cache is unusable
+        self.trim()
+
+    def trim(self):
+        """Evict least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for entry in self.cache_dir.glob("[!.]*.v*"):
+            try:
+                with open(entry / "parts.json", encoding="utf-8") as f:
+                    size = json.load(f)["size"]
+                entries.append((entry.stat().st_mtime_ns, size, entry))
+            except (OSError, ValueError, KeyError):
+                continue  # Being added or evicted by another process
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            _remove_tree(entry)
+            total -= size
+
+
+def _remove_tree(path):
+    """Remove a cache entry."""
+    # Renamed first so that no reader sees it half removed
+    doomed = path.with_name(f".{path.name}.{os.getpid()}.evicted")
+    try:
+        path.rename(doomed)
+    except OSError:
+        return  # Already evicted
+    shutil.rmtree(doomed, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
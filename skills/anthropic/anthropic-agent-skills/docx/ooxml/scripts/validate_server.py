@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Long-running validation server that keeps compiled XSD schemas in memory.
+
+Usage:
+    python validate_server.py [--socket <path>] [--baseline-cache <dir>] [--no-preload]
+
+Listens on a local Unix socket (by default the one validate_client.py connects
+to, see default_socket_path()). Each connection carries one request, a JSON line
+
+    {"args": {<validate.py options by name, with absolute paths>}}
+
+and gets one JSON line back: the outcome of validate.run(), or {"error": ...}.
+Requests are served one at a time.
+
+All schemas are compiled at startup (unless --no-preload) and stay compiled.
+Requests without their own --baseline-cache share the server's, so the XSD
+errors of each original document are computed once for the server's lifetime.
+
+Stop the server with Ctrl-C or SIGTERM; it removes its socket on exit.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+from pathlib import Path
+
+from validate import run
+from validate_client import default_socket_path
+from validation import DOCXSchemaValidator, PPTXSchemaValidator, schema_registry
+
+
+class ValidationHandler(socketserver.StreamRequestHandler):
+    """Answers one validation request per connection."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return  # A probe, e.g. from remove_stale_socket()
+        try:
+            request = json.loads(line)
+            args = argparse.Namespace(**request["args"])
+            if args.baseline_cache is None:
+                args.baseline_cache = self.server.baseline_cache
+            outcome = run(args)
+        except AssertionError as e:
+            outcome = {"error": str(e)}
+        except Exception as e:
+            outcome = {"error": f"Error: {e}"}
+        self.wfile.write(json.dumps(outcome).encode("utf-8") + b"\n")
+
+
+class ValidationServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path, baseline_cache):
+        self.baseline_cache = str(baseline_cache)
+        super().__init__(str(socket_path), ValidationHandler)
+
+
+def preload_schemas():
+    """Compile every schema a validator may use. Returns the number compiled.
+
+    Schemas that fail to compile are cached as their error, and reported by
+    the checks that need them as usual.
+    """
+    schemas_dir = Path(__file__).parent.parent / "schemas"
+    schema_paths = {
+        schemas_dir / schema
+        for V in (DOCXSchemaValidator, PPTXSchemaValidator)
+        for schema in V.SCHEMA_MAPPINGS.values()
+    }
+    compiled = 0
+    for schema_path in sorted(schema_paths):
+        try:
+            schema_registry.get(schema_path)
+            compiled += 1
+        except Exception:
+            pass
+    return compiled
+
+
+def remove_stale_socket(socket_path):
+    """Remove a socket left behind by a server that is no longer running.
+
+    Raises:
+        ValueError: If a server is still listening on socket_path
+    """
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            os.unlink(socket_path)
+            return
+    raise ValueError(f"A server is already listening on {socket_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve validate.py requests over a Unix socket"
+    )
+    parser.add_argument(
+        "--socket",
+        default=default_socket_path(),
+        help="Path of the Unix socket to listen on",
+    )
+    parser.add_argument(
+        "--baseline-cache",
+        metavar="DIR",
+        help="Directory to persist original-document XSD errors "
+        "(default: a temporary directory removed on exit)",
+    )
+    parser.add_argument(
+        "--no-preload",
+        action="store_true",
+        help="Compile schemas on first use instead of at startup",
+    )
+    args = parser.parse_args()
+
+    try:
+        remove_stale_socket(args.socket)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    if not args.no_preload:
+        print(f"Compiled {preload_schemas()} schemas")
+
+    # Exit through the finally clauses below, like Ctrl-C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        baseline_cache = args.baseline_cache or Path(temp_dir) / "baseline"
+
+        # Only this user may connect
+        old_umask = os.umask(0o077)
+        try:
+            server = ValidationServer(args.socket, baseline_cache)
+        finally:
+            os.umask(old_umask)
+
+        print(f"Listening on {args.socket}")
+        try:
+            with server:
+                server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,69 +3,155 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
 import zipfile
 
 import lxml.etree
 
 from .base import BaseSchemaValidator
+from .rules import Rule
+
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+class DocumentRule(Rule):
+    """Base for rules that only check document.xml files."""
+
+    @classmethod
+    def applies_to(cls, validator, xml_file):
+        return xml_file.name == "document.xml"
+
+    def _preview(self, text):
+        """Return a short repr of text for error messages."""
+        return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+    def _error(self, elem, message):
+        self.result.append(
+            f"  {self.xml_file.relative_to(self.validator.unpacked_dir)}: "
+            f"Line {elem.sourceline}: {message}"
+        )
+
+
+class WhitespaceRule(DocumentRule):
+    """w:t elements with leading or trailing whitespace need xml:space='preserve'."""
+
+    name = "whitespace"
+
+    def end(self, elem, open_tags):
+        if elem.tag != f"{{{WORD_2006_NAMESPACE}}}t" or not elem.text:
+            return
+        text = elem.text
+        # Check if text starts or ends with whitespace
+        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
+            # Check if xml:space="preserve" attribute exists
+            xml_space_attr = f"{{{self.validator.XML_NAMESPACE}}}space"
+            if (
+                xml_space_attr not in elem.attrib
+                or elem.attrib[xml_space_attr] != "preserve"
+            ):
+                self._error(
+                    elem,
+                    f"w:t element with whitespace missing xml:space='preserve': {self._preview(text)}",
+                )
+
+
+class DeletionRule(DocumentRule):
+    """Deleted text must use w:delText, not w:t, inside w:del."""
+
+    name = "deletions"
+
+    def end(self, elem, open_tags):
+        if (
+            elem.tag == f"{{{WORD_2006_NAMESPACE}}}t"
+            and open_tags[f"{{{WORD_2006_NAMESPACE}}}del"]
+            and elem.text
+        ):
+            self._error(elem, f"<w:t> found within <w:del>: {self._preview(elem.text)}")
+
+
+class InsertionRule(DocumentRule):
+    """w:delText may only appear inside w:ins when nested within a w:del."""
+
+    name = "insertions"
+
+    def end(self, elem, open_tags):
+        if (
+            elem.tag == f"{{{WORD_2006_NAMESPACE}}}delText"
+            and open_tags[f"{{{WORD_2006_NAMESPACE}}}ins"]
+            and not open_tags[f"{{{WORD_2006_NAMESPACE}}}del"]
+        ):
+            self._error(
+                elem,
+                f"<w:delText> within <w:ins>: {self._preview(elem.text or '')}",
+            )
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
     """Validator for Word document XML files against XSD schemas."""
 
     # Word-specific namespace
-    WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    WORD_2006_NAMESPACE = WORD_2006_NAMESPACE
 
     # Word-specific element to relationship type mappings
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
-    def validate(self):
+    RULES = BaseSchemaValidator.RULES + [WhitespaceRule, DeletionRule, InsertionRule]
+
+    # Paragraphs and tables of the body are validated one by one in scoped mode
+    SCOPED_XSD_PARTS = {
+        "word/document.xml": (
+            f"{{{WORD_2006_NAMESPACE}}}body",
+            {f"{{{WORD_2006_NAMESPACE}}}p", f"{{{WORD_2006_NAMESPACE}}}tbl"},
+        ),
+    }
+
+    def _run_checks(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not self._check("xml", self.validate_xml):
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self._check("namespaces", self.validate_namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self._check("unique_ids", self.validate_unique_ids):
             all_valid = False
 
         # Test 3: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self._check("file_references", self.validate_file_references):
             all_valid = False
 
         # Test 4: Content type declarations
-        if not self.validate_content_types():
+        if not self._check("content_types", self.validate_content_types):
             all_valid = False
 
         # Test 5: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self._check("xsd", self.validate_against_xsd):
             all_valid = False
 
         # Test 6: Whitespace preservation
-        if not self.validate_whitespace_preservation():
+        if not self._check("whitespace", self.validate_whitespace_preservation):
             all_valid = False
 
         # Test 7: Deletion validation
-        if not self.validate_deletions():
+        if not self._check("deletions", self.validate_deletions):
             all_valid = False
 
         # Test 8: Insertion validation
-        if not self.validate_insertions():
+        if not self._check("insertions", self.validate_insertions):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self._check("relationship_ids", self.validate_all_relationship_ids):
             all_valid = False
 
         # Count and compare paragraphs
-        self.compare_paragraph_counts()
+        self._check("paragraph_counts", self.compare_paragraph_counts)
+
+        self._report_cache_stats()
 
         return all_valid
 
@@ -80,45 +166,24 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+            part_name = self._part_name(xml_file)
+            errors.extend(
+                self._cached(
+                    "whitespace",
+                    part_name,
+                    [part_name],
+                    lambda: self._rule_results(xml_file)["whitespace"],
                 )
+            )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} whitespace preservation violations:",
+                errors,
+            )
         else:
             if self.verbose:
-                print("PASSED - All whitespace is properly preserved")
+                self._print("PASSED - All whitespace is properly preserved")
             return True
 
     def validate_deletions(self):
@@ -133,41 +198,23 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+            part_name = self._part_name(xml_file)
+            errors.extend(
+                self._cached(
+                    "deletions",
+                    part_name,
+                    [part_name],
+                    lambda: self._rule_results(xml_file)["deletions"],
                 )
+            )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} deletion validation violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} deletion validation violations:", errors
+            )
         else:
             if self.verbose:
-                print("PASSED - No w:t elements found within w:del elements")
+                self._print("PASSED - No w:t elements found within w:del elements")
             return True
 
     def count_paragraphs_in_unpacked(self):
@@ -180,12 +227,15 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+                part_name = self._part_name(xml_file)
+                count = self._cached(
+                    "paragraphs",
+                    part_name,
+                    [part_name],
+                    lambda: self._count_paragraphs(self._parse(xml_file).getroot()),
+                )
             except Exception as e:
-                print(f"Error counting paragraphs in unpacked document: {e}")
+                self._print(f"Error counting paragraphs in unpacked document: {e}")
 
         return count
 
@@ -194,25 +244,26 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
-
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
-
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
-
+            # The manifest is tied to the original file, so no parts to depend on
+            count = self._cached(
+                "paragraphs", "<original>", [], self._count_original_paragraphs
+            )
         except Exception as e:
-            print(f"Error counting paragraphs in original document: {e}")
+            self._print(f"Error counting paragraphs in original document: {e}")
 
         return count
 
+    def _count_original_paragraphs(self):
+        """Count the paragraphs of the original docx's word/document.xml."""
+        # Read the single part straight from the archive
+        with zipfile.ZipFile(self.original_file, "r") as zip_ref:
+            data = zip_ref.read("word/document.xml")
+        return self._count_paragraphs(lxml.etree.fromstring(data))
+
+    def _count_paragraphs(self, root):
+        """Count all w:p elements below a document root."""
+        return len(root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p"))
+
     def validate_insertions(self):
         """
         Validate that w:delText elements are not within w:ins elements.
@@ -224,50 +275,36 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+            part_name = self._part_name(xml_file)
+            errors.extend(
+                self._cached(
+                    "insertions",
+                    part_name,
+                    [part_name],
+                    lambda: self._rule_results(xml_file)["insertions"],
                 )
+            )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} insertion validation violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} insertion validation violations:", errors
+            )
         else:
             if self.verbose:
-                print("PASSED - No w:delText elements within w:ins elements")
+                self._print("PASSED - No w:delText elements within w:ins elements")
             return True
 
     def compare_paragraph_counts(self):
         """Compare paragraph counts between original and new document."""
+        if self.original_file is None:
+            return
+
         original_count = self.count_paragraphs_in_original()
         new_count = self.count_paragraphs_in_unpacked()
 
         diff = new_count - original_count
         diff_str = f"+{diff}" if diff > 0 else str(diff)
-        print(f"\nParagraphs: {original_count} → {new_count} ({diff_str})")
+        self._print(f"\nParagraphs: {original_count} → {new_count} ({diff_str})")
 
 
 if __name__ == "__main__":
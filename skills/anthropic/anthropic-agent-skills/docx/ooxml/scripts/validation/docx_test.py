@@ -0,0 +1,114 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from .docx import DOCXSchemaValidator
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+SECT_PR = '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/></w:sectPr>'
+
+
+def paragraph(text):
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def document_xml(*body):
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W}"><w:body>{"".join(body)}</w:body></w:document>'
+    )
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# Run from the ooxml/scripts directory: python -m unittest validation.docx_test
+class TestScopedXsdValidation(unittest.TestCase):
+
+    ORIGINAL = document_xml(paragraph("First"), paragraph("Second"), SECT_PR)
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+        self.originals = 0
+
+    def validator(self, modified, scoped_xsd=True, original=None):
+        """Create a validator of word/document.xml holding modified"""
+        # A new file each time, as original parts are split once per path and stat
+        self.originals += 1
+        original_file = self.temp_dir / f"original{self.originals}.docx"
+        with zipfile.ZipFile(original_file, "w") as zf:
+            zf.writestr("word/document.xml", original or self.ORIGINAL)
+        unpacked_dir = self.temp_dir / "unpacked"
+        (unpacked_dir / "word").mkdir(parents=True, exist_ok=True)
+        (unpacked_dir / "word" / "document.xml").write_text(modified, encoding="utf-8")
+        validator = DOCXSchemaValidator(
+            unpacked_dir, original_file, report=False, scoped_xsd=scoped_xsd
+        )
+        return validator, unpacked_dir / "word" / "document.xml"
+
+    def validated_paragraphs(self, modified):
+        """Return the scoped outcome and the text of each paragraph XSD-validated"""
+        validator, xml_file = self.validator(modified)
+        with mock.patch.object(
+            validator, "_validate_tree_xsd", wraps=validator._validate_tree_xsd
+        ) as validate_tree:
+            outcome = validator._validate_scoped_xsd(
+                xml_file, Path("word/document.xml")
+            )
+        texts = [
+            "".join(p.itertext())
+            for call in validate_tree.call_args_list
+            for p in call.args[0].iter(f"{{{W}}}p")
+        ]
+        return outcome, texts
+
+    def test_edited_paragraph_is_validated(self):
+        """Test that only the edited paragraph is validated"""
+        modified = document_xml(paragraph("First"), paragraph("Edited"), SECT_PR)
+        outcome, texts = self.validated_paragraphs(modified)
+        self.assertEqual(outcome, (True, set()))
+        self.assertEqual(texts, ["Edited"])
+
+    def test_moved_paragraph_is_skipped(self):
+        """Test that paragraphs found unchanged in the original are not validated"""
+        modified = document_xml(paragraph("Second"), paragraph("First"), SECT_PR)
+        outcome, texts = self.validated_paragraphs(modified)
+        self.assertEqual(outcome, (True, set()))
+        self.assertEqual(texts, [])
+
+    def test_paragraph_moved_past_sect_pr_falls_back(self):
+        """Test that a change to the frame around the paragraphs needs a full run"""
+        modified = document_xml(paragraph("First"), SECT_PR, paragraph("Second"))
+        outcome, texts = self.validated_paragraphs(modified)
+        self.assertIsNone(outcome)
+        self.assertEqual(texts, [])
+
+    def test_scoped_errors_match_full_run(self):
+        """Test that scoped and full runs report the same new errors"""
+        invalid = "<w:p><w:r><w:bogus/></w:r></w:p>"
+        # The original already has an error of its own, which neither reports
+        original = document_xml(
+            paragraph("First"), "<w:p><w:pPr><w:bogus/></w:pPr></w:p>", SECT_PR
+        )
+        modified = document_xml(
+            paragraph("First"),
+            "<w:p><w:pPr><w:bogus/></w:pPr></w:p>",
+            invalid,
+            SECT_PR,
+        )
+        results = []
+        for scoped_xsd in (True, False):
+            validator, xml_file = self.validator(modified, scoped_xsd, original)
+            results.append(validator.validate_file_against_xsd(xml_file))
+        scoped, full = results
+        self.assertFalse(full[0])
+        self.assertEqual(len(full[1]), 1)
+        self.assertIn("bogus", next(iter(full[1])))
+        self.assertEqual(scoped, full)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+In-memory model of an OPC package: its parts, relationships and content types.
+"""
+
+import posixpath
+from dataclasses import dataclass
+from pathlib import Path
+
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+
+@dataclass
+class Relationship:
+    """One <Relationship> of a .rels part."""
+
+    id: str
+    type: str
+    target: str
+    line: int = None
+    part: str = None  # Part name the target resolves to (None if external)
+
+    @property
+    def type_name(self):
+        """Last segment of the relationship type, e.g. "slideLayout"."""
+        return self.type.split("/")[-1]
+
+
+class Relationships:
+    """The relationships of one .rels part, indexed by ID and by target."""
+
+    def __init__(self):
+        self.items = []
+        self.types = {}  # rId -> type name (the last one wins for duplicate IDs)
+        self.targets = set()
+        self.duplicates = []  # Relationships reusing an ID seen earlier in the part
+
+    def add(self, rel):
+        self.items.append(rel)
+        if rel.id:
+            if rel.id in self.types:
+                self.duplicates.append(rel)
+            self.types[rel.id] = rel.type_name
+        self.targets.add(rel.target)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class ContentTypes:
+    """Default (by extension) and Override (by part) declarations of a package."""
+
+    def __init__(self):
+        self.defaults = {}  # Lowercase extension -> content type
+        self.overrides = {}  # Part name without leading slash -> content type
+
+    def add_override(self, part_name, content_type):
+        self.overrides[part_name.lstrip("/")] = content_type
+
+    def has_override(self, part_name):
+        return part_name.lstrip("/") in self.overrides
+
+
+class PackageModel:
+    """Parts, relationships and content types of an Office package, read once.
+
+    Part names are forward-slash paths relative to the package root, e.g.
+    "word/document.xml". The part listing is taken when the model is created;
+    .rels parts and [Content_Types].xml are parsed on first use. Checks then
+    answer from dictionaries and sets instead of statting files and parsing
+    the same XML again. A part that could not be parsed re-raises its parse
+    error every time it is asked for.
+    """
+
+    CONTENT_TYPES_PART = "[Content_Types].xml"
+
+    def __init__(self, source, parse=None):
+        """
+        Args:
+            source: DirectorySource or ArchiveSource of the package
+            parse: Function returning the lxml tree of a part's path (defaults
+                to source.parse; validators pass their caching parser)
+        """
+        self.root = source.root
+        self._parse = parse or source.parse
+        self.files = source.files()
+        self.paths = {self.part_name(f): f for f in self.files}
+        self._relationships = {}
+        self._content_types = None
+
+    def part_name(self, path):
+        """Return a file's part name, e.g. "word/document.xml"."""
+        return Path(path).relative_to(self.root).as_posix()
+
+    def has_part(self, part_name):
+        return part_name in self.paths
+
+    @staticmethod
+    def rels_part_for(part_name):
+        """Return the name of the .rels part holding a part's relationships."""
+        directory, name = posixpath.split(part_name)
+        return posixpath.join(directory, "_rels", f"{name}.rels")
+
+    def relationships(self, rels_part):
+        """Return the Relationships of a .rels part (empty if it does not exist)."""
+        if rels_part not in self._relationships:
+            try:
+                self._relationships[rels_part] = self._read_relationships(rels_part)
+            except Exception as e:
+                self._relationships[rels_part] = e
+
+        result = self._relationships[rels_part]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _read_relationships(self, rels_part):
+        relationships = Relationships()
+        if rels_part not in self.paths:
+            return relationships
+
+        # Targets are relative to the folder of the part the .rels describes,
+        # e.g. word/_rels/document.xml.rels -> word/; the package .rels
+        # describes the root
+        if posixpath.basename(rels_part) == ".rels":
+            base_dir = ""
+        else:
+            base_dir = posixpath.dirname(posixpath.dirname(rels_part))
+
+        root = self._parse(self.paths[rels_part]).getroot()
+        for rel in root.iter(f"{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"):
+            target = rel.get("Target", "")
+            part = None
+            if (
+                target
+                and rel.get("TargetMode") != "External"
+                and not target.startswith(("http", "mailto:"))
+            ):
+                if target.startswith("/"):
+                    part = posixpath.normpath(target.lstrip("/"))
+                else:
+                    part = posixpath.normpath(posixpath.join(base_dir, target))
+            relationships.add(
+                Relationship(
+                    id=rel.get("Id"),
+                    type=rel.get("Type", ""),
+                    target=target,
+                    line=rel.sourceline,
+                    part=part,
+                )
+            )
+        return relationships
+
+    def content_types(self):
+        """Return the package's ContentTypes (empty if [Content_Types].xml is missing)."""
+        if self._content_types is None:
+            try:
+                self._content_types = self._read_content_types()
+            except Exception as e:
+                self._content_types = e
+
+        if isinstance(self._content_types, Exception):
+            raise self._content_types
+        return self._content_types
+
+    def _read_content_types(self):
+        content_types = ContentTypes()
+        if self.CONTENT_TYPES_PART not in self.paths:
+            return content_types
+
+        root = self._parse(self.paths[self.CONTENT_TYPES_PART]).getroot()
+        for override in root.iter(f"{{{CONTENT_TYPES_NAMESPACE}}}Override"):
+            part_name = override.get("PartName")
+            if part_name is not None:
+                content_types.add_override(part_name, override.get("ContentType"))
+        for default in root.iter(f"{{{CONTENT_TYPES_NAMESPACE}}}Default"):
+            extension = default.get("Extension")
+            if extension is not None:
+                content_types.defaults[extension.lower()] = default.get("ContentType")
+        return content_types
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
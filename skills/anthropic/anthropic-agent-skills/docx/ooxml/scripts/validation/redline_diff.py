@@ -0,0 +1,269 @@
+"""
+Paragraph-aware text diff for redlining validation, without external tools.
+"""
+
+import re
+from dataclasses import dataclass
+
+# Paragraph pairs up to this total length are diffed character by character,
+# longer ones word by word
+CHARACTER_DIFF_LIMIT = 2000
+
+# Edit distance above which a diff gives up and reports a whole replacement
+MAX_EDITS = 1000
+
+# Characters of unchanged text kept around each change in rendered lines
+CONTEXT = 60
+
+# Changed paragraphs listed in the text report
+MAX_REPORTED_CHANGES = 50
+
+WORD_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+
+
+@dataclass
+class ParagraphChange:
+    """A paragraph that differs between the original and the modified text.
+
+    Indexes count all paragraphs of each document in order (including empty
+    ones), so they point straight at the w:p element. A paragraph missing on
+    one side has None there.
+    """
+
+    kind: str  # "changed", "inserted" or "deleted"
+    original_index: int
+    modified_index: int
+    original: str
+    modified: str
+    diff: str  # One line in git word-diff format: [-removed-]{+added+}
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "original_index": self.original_index,
+            "modified_index": self.modified_index,
+            "diff": self.diff,
+        }
+
+
+def myers_opcodes(a, b, max_edits=None):
+    """Return difflib-style opcodes turning sequence a into sequence b.
+
+    Uses Myers' O(ND) algorithm after trimming the common prefix and suffix.
+    If more than max_edits insertions and deletions are needed, the differing
+    middle is reported as one replacement instead.
+
+    Returns:
+        list: (tag, i1, i2, j1, j2) tuples with tag "equal", "replace",
+        "delete" or "insert", as from difflib.SequenceMatcher.get_opcodes()
+    """
+    n, m = len(a), len(b)
+    prefix = 0
+    while prefix < n and prefix < m and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < n - prefix
+        and suffix < m - prefix
+        and a[n - 1 - suffix] == b[m - 1 - suffix]
+    ):
+        suffix += 1
+
+    steps = [("equal", 1, 1)] * prefix
+    middle = _edit_steps(a[prefix : n - suffix], b[prefix : m - suffix], max_edits)
+    if middle is None:
+        steps.append(("delete", n - suffix - prefix, 0))
+        steps.append(("insert", 0, m - suffix - prefix))
+    else:
+        steps.extend(middle)
+    steps.extend([("equal", 1, 1)] * suffix)
+    return _group_steps(steps)
+
+
+def _edit_steps(a, b, max_edits):
+    """Return the shortest edit script as single steps, or None if too long."""
+    n, m = len(a), len(b)
+    limit = n + m if max_edits is None else min(n + m, max_edits)
+
+    # v[k]: furthest x reached on diagonal k = x - y; trace[d] is v before round d
+    v = {1: 0}
+    trace = []
+    for d in range(limit + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]  # Step down: insertion
+            else:
+                x = v[k - 1] + 1  # Step right: deletion
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace, x, y):
+    steps = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            steps.append(("equal", 1, 1))
+            x -= 1
+            y -= 1
+        if d > 0:
+            steps.append(("insert", 0, 1) if x == prev_x else ("delete", 1, 0))
+        x, y = prev_x, prev_y
+    steps.reverse()
+    return steps
+
+
+def _group_steps(steps):
+    """Merge single steps into opcodes, pairing deletions with insertions."""
+    opcodes = []
+    i = j = 0
+    for tag, di, dj in steps:
+        if tag != "equal" and opcodes and opcodes[-1][0] != "equal":
+            _, i1, i2, j1, j2 = opcodes[-1]
+            i2, j2 = i2 + di, j2 + dj
+            if i2 > i1 and j2 > j1:
+                merged = "replace"
+            else:
+                merged = "delete" if i2 > i1 else "insert"
+            opcodes[-1] = (merged, i1, i2, j1, j2)
+        elif opcodes and opcodes[-1][0] == tag:
+            _, i1, i2, j1, j2 = opcodes[-1]
+            opcodes[-1] = (tag, i1, i2 + di, j1, j2 + dj)
+        elif di or dj:
+            opcodes.append((tag, i, i + di, j, j + dj))
+        i += di
+        j += dj
+    return opcodes
+
+
+def _elide(text, keep_start, keep_end):
+    """Shorten unchanged text to its start and/or end around a change."""
+    if len(text) <= keep_start + keep_end + 3:
+        return text
+    return text[:keep_start] + "..." + text[len(text) - keep_end :]
+
+
+def inline_diff(original, modified):
+    """Render the difference between two paragraphs as one word-diff line.
+
+    Unchanged text longer than the context on either side of a change is
+    elided with "...".
+    """
+    if len(original) + len(modified) <= CHARACTER_DIFF_LIMIT:
+        a, b = original, modified
+    else:
+        a, b = WORD_PATTERN.findall(original), WORD_PATTERN.findall(modified)
+
+    opcodes = myers_opcodes(a, b, MAX_EDITS)
+    parts = []
+    for index, (tag, i1, i2, j1, j2) in enumerate(opcodes):
+        removed, added = "".join(a[i1:i2]), "".join(b[j1:j2])
+        if tag == "equal":
+            first, last = index == 0, index == len(opcodes) - 1
+            parts.append(
+                _elide(removed, 0 if first else CONTEXT, 0 if last else CONTEXT)
+            )
+            continue
+        if removed:
+            parts.append(f"[-{removed}-]")
+        if added:
+            parts.append(f"{{+{added}+}}")
+    return "".join(parts)
+
+
+def paragraph_change(original, modified):
+    """Describe how one paragraph changed.
+
+    Args:
+        original: (paragraph index, text) in the original, or None if inserted
+        modified: (paragraph index, text) in the modified, or None if deleted
+    """
+    if modified is None:
+        index, old = original
+        return ParagraphChange(
+            "deleted", index, None, old, "", f"[-{_elide(old, CONTEXT, CONTEXT)}-]"
+        )
+    if original is None:
+        index, new = modified
+        return ParagraphChange(
+            "inserted", None, index, "", new, f"{{+{_elide(new, CONTEXT, CONTEXT)}+}}"
+        )
+    (original_index, old), (modified_index, new) = original, modified
+    return ParagraphChange(
+        "changed", original_index, modified_index, old, new, inline_diff(old, new)
+    )
+
+
+def paragraph_changes(opcodes, original, modified):
+    """Turn paragraph-level opcodes into ParagraphChanges.
+
+    Runs replaced by the same number of paragraphs or fewer are paired up in
+    order; the rest are reported as deleted or inserted.
+
+    Args:
+        opcodes: Opcodes from myers_opcodes() over the two paragraph sequences
+        original: (paragraph index, text) pairs of the original document
+        modified: (paragraph index, text) pairs of the modified document
+    """
+    changes = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            continue
+        paired = min(i2 - i1, j2 - j1)
+        for offset in range(paired):
+            changes.append(
+                paragraph_change(original[i1 + offset], modified[j1 + offset])
+            )
+        for position in range(i1 + paired, i2):
+            changes.append(paragraph_change(original[position], None))
+        for position in range(j1 + paired, j2):
+            changes.append(paragraph_change(None, modified[position]))
+    return changes
+
+
+def diff_paragraphs(original, modified):
+    """Find the paragraphs that differ between two documents' text.
+
+    Paragraphs are first matched whole (each distinct text gets one ID, so
+    unchanged paragraphs compare as integers); only the unmatched ones are
+    diffed within.
+
+    Args:
+        original: (paragraph index, text) pairs of the original document
+        modified: (paragraph index, text) pairs of the modified document
+
+    Returns:
+        list: ParagraphChange per differing paragraph, in document order
+    """
+    ids = {}
+    a = [ids.setdefault(text, len(ids)) for _, text in original]
+    b = [ids.setdefault(text, len(ids)) for _, text in modified]
+    return paragraph_changes(myers_opcodes(a, b, MAX_EDITS), original, modified)
+
+
+def format_changes(changes):
+    """Render changes as report lines, listing at most MAX_REPORTED_CHANGES."""
+    lines = [change.diff for change in changes[:MAX_REPORTED_CHANGES]]
+    if len(changes) > MAX_REPORTED_CHANGES:
+        lines.append(
+            f"... and {len(changes) - MAX_REPORTED_CHANGES} more changed paragraphs"
+        )
+    return lines
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
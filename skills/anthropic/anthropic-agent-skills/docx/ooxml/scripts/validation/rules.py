@@ -0,0 +1,106 @@
+"""
+Single-pass rule engine for element-level checks on OOXML parts.
+"""
+
+from collections import Counter
+
+import lxml.etree
+
+
+class Rule:
+    """A check that inspects elements during the shared traversal of a part.
+
+    Every rule registered on a validator's RULES runs in the same pass over a
+    part, so adding a rule does not add another walk over the tree. Subclasses
+    set `name`, select parts with applies_to() and look at elements in start()
+    (attributes are complete) or end() (text is complete). Findings are
+    collected in self.result, which must be JSON-serializable.
+    """
+
+    name = None
+
+    def __init__(self, validator, xml_file):
+        self.validator = validator
+        self.xml_file = xml_file
+        self.result = []
+
+    @classmethod
+    def applies_to(cls, validator, xml_file):
+        """Return True if the rule should run on this part."""
+        return True
+
+    def start(self, elem, open_tags):
+        """Called for each element in document order.
+
+        Args:
+            elem: The element, with its attributes (children may not be parsed yet)
+            open_tags: Counter of the tags of the element's ancestors
+        """
+
+    def end(self, elem, open_tags):
+        """Called when an element is complete, before it is released."""
+
+    def failed(self, error):
+        """Record that the part could not be read."""
+        self.result = [
+            f"  {self.xml_file.relative_to(self.validator.unpacked_dir)}: Error: {error}"
+        ]
+
+
+def run_rules(rules, events):
+    """Feed one stream of (event, element) pairs to all rules.
+
+    Args:
+        rules: Rule instances for the same part
+        events: Iterable of ("start" | "end", element) pairs, as produced by
+            walk_events() or stream_events()
+
+    Returns:
+        int: Number of elements visited
+    """
+    open_tags = Counter()
+    elements = 0
+    for event, elem in events:
+        tag = elem.tag
+        if not isinstance(tag, str):
+            continue  # Comments and processing instructions
+
+        if event == "start":
+            elements += 1
+            for rule in rules:
+                rule.start(elem, open_tags)
+            open_tags[tag] += 1
+        else:
+            open_tags[tag] -= 1
+            for rule in rules:
+                rule.end(elem, open_tags)
+    return elements
+
+
+def walk_events(tree):
+    """Yield traversal events over an already parsed (shared, read-only) tree."""
+    return lxml.etree.iterwalk(tree, events=("start", "end"))
+
+
+def stream_events(source):
+    """Yield traversal events while parsing, keeping memory bounded.
+
+    Elements are cleared once all rules have seen their end event, and
+    finished siblings are dropped, so only the path to the current element
+    stays in memory however large the part is.
+
+    Args:
+        source: Binary file object with the part's XML
+    """
+    for event, elem in lxml.etree.iterparse(source, events=("start", "end")):
+        yield event, elem
+        if event == "end":
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
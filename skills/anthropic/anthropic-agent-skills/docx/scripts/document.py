@@ -8,6 +8,7 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document('workspace/unpacked', backend="lxml")  # For large documents
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
@@ -26,36 +27,56 @@ Usage:
     doc.save()
 """
 
+import copy
 import html
+import os
 import random
 import shutil
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 
+import lxml.etree
 from defusedxml import minidom
-from ooxml.scripts.pack import pack_document
+from ooxml.scripts.pack import pack_document, unchanged_original
+from ooxml.scripts.unpack_cache import clone_tree
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.package import PackageModel, Relationship
 from ooxml.scripts.validation.redlining import RedliningValidator
+from ooxml.scripts.validation.source import DirectorySource, OverlaySource
 
-from .utilities import XMLEditor
+from .utilities import LxmlXMLEditor, XMLEditor
 
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
 
-class DocxXMLEditor(XMLEditor):
-    """XMLEditor that automatically applies RSID, author, and date to new elements.
-
-    Automatically adds attributes to elements that support them when inserting new content:
-    - w:rsidR, w:rsidRDefault, w:rsidP (for w:p and w:r elements)
-    - w:author and w:date (for w:ins, w:del, w:comment elements)
-    - w:id (for w:ins and w:del elements)
-
-    Attributes:
-        dom (defusedxml.minidom.Document): The DOM document for direct manipulation
+class DocxEditing:
+    """Mixin that applies RSID, author, and date to new elements and makes tracked
+    changes, for the editors of both backends.
+
+    Elements are handled through methods each editor implements for its nodes:
+    - _is_element(node), _is(elem, tag): whether a node is an element, with a tag
+    - _descendants(elem, tag): list of the descendants with a tag, in document order
+    - _is_inside(elem, tag): whether an ancestor has the tag
+    - _text(elem): the text before its first child, or None
+    - _has(), _set(), _pop(): attributes by prefixed name; _set() declares the
+      namespaces of NAMESPACES as they are used
+    - _new_element(tag), _clone(elem): a new element, or a deep copy of one
+    - _append(parent, child), _prepend(parent, child), _add_next(elem, new)
+    - _wrap(elem, wrapper): put wrapper in the place of elem, with elem inside
+    - _wrap_children(elem, wrapper, keep=None): move the children of elem, except
+      keep elements, into wrapper and append it to elem
+    - _rename_texts(elem, old_tag, new_tag): rename descendants (w:t, w:delText)
     """
 
+    # Namespaces of attributes added to new elements, declared when first used
+    NAMESPACES = {
+        "w14": "http://schemas.microsoft.com/office/word/2010/wordml",
+        "w16du": "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
+        "w16cex": "http://schemas.microsoft.com/office/word/2018/wordml/cex",
+    }
+
     def __init__(
         self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
     ):
@@ -73,48 +94,15 @@ class DocxXMLEditor(XMLEditor):
         self.initials = initials
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
-
-    def _ensure_w16du_namespace(self):
-        """Ensure w16du namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16du"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16du",
-                "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
-            )
+        """Get the next available change ID, above every w:id of w:ins and w:del.
 
-    def _ensure_w16cex_namespace(self):
-        """Ensure w16cex namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16cex"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16cex",
-                "http://schemas.microsoft.com/office/word/2018/wordml/cex",
-            )
-
-    def _ensure_w14_namespace(self):
-        """Ensure w14 namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w14"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w14",
-                "http://schemas.microsoft.com/office/word/2010/wordml",
-            )
+        Tracked change elements are only scanned once; IDs are then handed out
+        from a counter that inserted elements with higher IDs move forward.
+        """
+        return self._allocate_id(("w:ins", "w:del"), "w:id")
 
     def _inject_attributes_to_nodes(self, nodes):
-        """Inject RSID, author, and date attributes into DOM nodes where applicable.
+        """Inject RSID, author, and date attributes into nodes where applicable.
 
         Adds attributes to elements that support them:
         - w:r: gets w:rsidR (or w:rsidDel if inside w:del)
@@ -125,117 +113,80 @@ class DocxXMLEditor(XMLEditor):
         - w16cex:commentExtensible: gets w16cex:dateUtc
 
         Args:
-            nodes: List of DOM nodes to process
+            nodes: List of nodes to process
         """
-        from datetime import datetime, timezone
-
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        def is_inside_deletion(elem):
-            """Check if element is inside a w:del element."""
-            parent = elem.parentNode
-            while parent:
-                if parent.nodeType == parent.ELEMENT_NODE and parent.tagName == "w:del":
-                    return True
-                parent = parent.parentNode
-            return False
-
         def add_rsid_to_p(elem):
-            if not elem.hasAttribute("w:rsidR"):
-                elem.setAttribute("w:rsidR", self.rsid)
-            if not elem.hasAttribute("w:rsidRDefault"):
-                elem.setAttribute("w:rsidRDefault", self.rsid)
-            if not elem.hasAttribute("w:rsidP"):
-                elem.setAttribute("w:rsidP", self.rsid)
+            for name in ("w:rsidR", "w:rsidRDefault", "w:rsidP"):
+                if not self._has(elem, name):
+                    self._set(elem, name, self.rsid)
             # Add w14:paraId and w14:textId if not present
-            if not elem.hasAttribute("w14:paraId"):
-                self._ensure_w14_namespace()
-                elem.setAttribute("w14:paraId", _generate_hex_id())
-            if not elem.hasAttribute("w14:textId"):
-                self._ensure_w14_namespace()
-                elem.setAttribute("w14:textId", _generate_hex_id())
+            for name in ("w14:paraId", "w14:textId"):
+                if not self._has(elem, name):
+                    self._set(elem, name, _generate_hex_id())
 
         def add_rsid_to_r(elem):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
-            if is_inside_deletion(elem):
-                if not elem.hasAttribute("w:rsidDel"):
-                    elem.setAttribute("w:rsidDel", self.rsid)
-            else:
-                if not elem.hasAttribute("w:rsidR"):
-                    elem.setAttribute("w:rsidR", self.rsid)
+            name = "w:rsidDel" if self._is_inside(elem, "w:del") else "w:rsidR"
+            if not self._has(elem, name):
+                self._set(elem, name, self.rsid)
 
         def add_tracked_change_attrs(elem):
             # Auto-assign w:id if not present
-            if not elem.hasAttribute("w:id"):
-                elem.setAttribute("w:id", str(self._get_next_change_id()))
-            if not elem.hasAttribute("w:author"):
-                elem.setAttribute("w:author", self.author)
-            if not elem.hasAttribute("w:date"):
-                elem.setAttribute("w:date", timestamp)
-            # Add w16du:dateUtc for tracked changes (same as w:date since we generate UTC timestamps)
-            if elem.tagName in ("w:ins", "w:del") and not elem.hasAttribute(
-                "w16du:dateUtc"
-            ):
-                self._ensure_w16du_namespace()
-                elem.setAttribute("w16du:dateUtc", timestamp)
+            if not self._has(elem, "w:id"):
+                self._set(elem, "w:id", str(self._get_next_change_id()))
+            if not self._has(elem, "w:author"):
+                self._set(elem, "w:author", self.author)
+            if not self._has(elem, "w:date"):
+                self._set(elem, "w:date", timestamp)
+            # Add w16du:dateUtc (same as w:date since we generate UTC timestamps)
+            if not self._has(elem, "w16du:dateUtc"):
+                self._set(elem, "w16du:dateUtc", timestamp)
 
         def add_comment_attrs(elem):
-            if not elem.hasAttribute("w:author"):
-                elem.setAttribute("w:author", self.author)
-            if not elem.hasAttribute("w:date"):
-                elem.setAttribute("w:date", timestamp)
-            if not elem.hasAttribute("w:initials"):
-                elem.setAttribute("w:initials", self.initials)
+            if not self._has(elem, "w:author"):
+                self._set(elem, "w:author", self.author)
+            if not self._has(elem, "w:date"):
+                self._set(elem, "w:date", timestamp)
+            if not self._has(elem, "w:initials"):
+                self._set(elem, "w:initials", self.initials)
 
         def add_comment_extensible_date(elem):
-            # Add w16cex:dateUtc for comment extensible elements
-            if not elem.hasAttribute("w16cex:dateUtc"):
-                self._ensure_w16cex_namespace()
-                elem.setAttribute("w16cex:dateUtc", timestamp)
+            if not self._has(elem, "w16cex:dateUtc"):
+                self._set(elem, "w16cex:dateUtc", timestamp)
 
         def add_xml_space_to_t(elem):
             # Add xml:space="preserve" to w:t if text has leading/trailing whitespace
-            if (
-                elem.firstChild
-                and elem.firstChild.nodeType == elem.firstChild.TEXT_NODE
-            ):
-                text = elem.firstChild.data
-                if text and (text[0].isspace() or text[-1].isspace()):
-                    if not elem.hasAttribute("xml:space"):
-                        elem.setAttribute("xml:space", "preserve")
-
+            text = self._text(elem)
+            if text and (text[0].isspace() or text[-1].isspace()):
+                if not self._has(elem, "xml:space"):
+                    self._set(elem, "xml:space", "preserve")
+
+        # New w:id values are assigned in this order
+        handlers = [
+            ("w:p", add_rsid_to_p),
+            ("w:r", add_rsid_to_r),
+            ("w:t", add_xml_space_to_t),
+            ("w:ins", add_tracked_change_attrs),
+            ("w:del", add_tracked_change_attrs),
+            ("w:comment", add_comment_attrs),
+            ("w16cex:commentExtensible", add_comment_extensible_date),
+        ]
         for node in nodes:
-            if node.nodeType != node.ELEMENT_NODE:
+            if not self._is_element(node):
                 continue
 
-            # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
-                add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
+            # Handle the node itself, then its descendants
+            for tag, handler in handlers:
+                if self._is(node, tag):
+                    handler(node)
+            for tag, handler in handlers:
+                for elem in self._descendants(node, tag):
+                    handler(elem)
+
+        # Index the nodes again with the attributes they have now
+        self._mark_changed(nodes)
 
     def replace_node(self, elem, new_content):
         """Replace node with automatic attribute injection."""
@@ -261,6 +212,14 @@ class DocxXMLEditor(XMLEditor):
         self._inject_attributes_to_nodes(nodes)
         return nodes
 
+    def _move_rsid(self, run, source, target):
+        """Move a run's RSID from one attribute to another (w:rsidR, w:rsidDel),
+        or set the target to this editor's RSID if the run has neither."""
+        if self._has(run, source):
+            self._set(run, target, self._pop(run, source))
+        elif not self._has(run, target):
+            self._set(run, target, self.rsid)
+
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
 
@@ -286,11 +245,10 @@ class DocxXMLEditor(XMLEditor):
             doc["word/document.xml"].revert_insertion(para)
         """
         # Collect insertions
-        ins_elements = []
-        if elem.tagName == "w:ins":
-            ins_elements.append(elem)
+        if self._is(elem, "w:ins"):
+            ins_elements = [elem]
         else:
-            ins_elements.extend(elem.getElementsByTagName("w:ins"))
+            ins_elements = self._descendants(elem, "w:ins")
 
         # Validate that there are insertions to reject
         if not ins_elements:
@@ -301,42 +259,23 @@ class DocxXMLEditor(XMLEditor):
 
         # Process all insertions - wrap all children in w:del
         for ins_elem in ins_elements:
-            runs = list(ins_elem.getElementsByTagName("w:r"))
+            runs = self._descendants(ins_elem, "w:r")
             if not runs:
                 continue
 
-            # Create deletion wrapper
-            del_wrapper = self.dom.createElement("w:del")
-
-            # Process each run
+            # Convert w:t → w:delText and w:rsidR → w:rsidDel
             for run in runs:
-                # Convert w:t → w:delText and w:rsidR → w:rsidDel
-                if run.hasAttribute("w:rsidR"):
-                    run.setAttribute("w:rsidDel", run.getAttribute("w:rsidR"))
-                    run.removeAttribute("w:rsidR")
-                elif not run.hasAttribute("w:rsidDel"):
-                    run.setAttribute("w:rsidDel", self.rsid)
-
-                for t_elem in list(run.getElementsByTagName("w:t")):
-                    del_text = self.dom.createElement("w:delText")
-                    # Copy ALL child nodes (not just firstChild) to handle entities
-                    while t_elem.firstChild:
-                        del_text.appendChild(t_elem.firstChild)
-                    for i in range(t_elem.attributes.length):
-                        attr = t_elem.attributes.item(i)
-                        del_text.setAttribute(attr.name, attr.value)
-                    t_elem.parentNode.replaceChild(del_text, t_elem)
-
-            # Move all children from ins to del wrapper
-            while ins_elem.firstChild:
-                del_wrapper.appendChild(ins_elem.firstChild)
-
-            # Add del wrapper back to ins
-            ins_elem.appendChild(del_wrapper)
+                self._move_rsid(run, "w:rsidR", "w:rsidDel")
+                self._rename_texts(run, "w:t", "w:delText")
+
+            # Move all children from ins to a deletion inside it
+            del_wrapper = self._new_element("w:del")
+            self._wrap_children(ins_elem, del_wrapper)
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
+        self._mark_changed([elem])
         return [elem]
 
     def revert_deletion(self, elem):
@@ -364,14 +303,12 @@ class DocxXMLEditor(XMLEditor):
             para = doc["word/document.xml"].get_node(tag="w:p", line_number=42)
             nodes = doc["word/document.xml"].revert_deletion(para)
         """
-        # Collect deletions FIRST - before we modify the DOM
-        del_elements = []
-        is_single_del = elem.tagName == "w:del"
-
+        # Collect deletions FIRST - before we modify the document
+        is_single_del = self._is(elem, "w:del")
         if is_single_del:
-            del_elements.append(elem)
+            del_elements = [elem]
         else:
-            del_elements.extend(elem.getElementsByTagName("w:del"))
+            del_elements = self._descendants(elem, "w:del")
 
         # Validate that there are deletions to reject
         if not del_elements:
@@ -385,50 +322,30 @@ class DocxXMLEditor(XMLEditor):
 
         # Process all deletions - create insertions that copy the deleted content
         for del_elem in del_elements:
-            # Clone the deleted runs and convert them to insertions
-            runs = list(del_elem.getElementsByTagName("w:r"))
+            runs = self._descendants(del_elem, "w:r")
             if not runs:
                 continue
 
-            # Create insertion wrapper
-            ins_elem = self.dom.createElement("w:ins")
-
+            # Clone the deleted runs into an insertion, converting
+            # w:delText → w:t and w:rsidDel → w:rsidR
+            ins_elem = self._new_element("w:ins")
             for run in runs:
-                # Clone the run
-                new_run = run.cloneNode(True)
-
-                # Convert w:delText → w:t
-                for del_text in list(new_run.getElementsByTagName("w:delText")):
-                    t_elem = self.dom.createElement("w:t")
-                    # Copy ALL child nodes (not just firstChild) to handle entities
-                    while del_text.firstChild:
-                        t_elem.appendChild(del_text.firstChild)
-                    for i in range(del_text.attributes.length):
-                        attr = del_text.attributes.item(i)
-                        t_elem.setAttribute(attr.name, attr.value)
-                    del_text.parentNode.replaceChild(t_elem, del_text)
-
-                # Update run attributes: w:rsidDel → w:rsidR
-                if new_run.hasAttribute("w:rsidDel"):
-                    new_run.setAttribute("w:rsidR", new_run.getAttribute("w:rsidDel"))
-                    new_run.removeAttribute("w:rsidDel")
-                elif not new_run.hasAttribute("w:rsidR"):
-                    new_run.setAttribute("w:rsidR", self.rsid)
-
-                ins_elem.appendChild(new_run)
+                new_run = self._clone(run)
+                self._rename_texts(new_run, "w:delText", "w:t")
+                self._move_rsid(new_run, "w:rsidDel", "w:rsidR")
+                self._append(ins_elem, new_run)
 
             # Insert the new insertion after the deletion
-            nodes = self.insert_after(del_elem, ins_elem.toxml())
+            self._add_next(del_elem, ins_elem)
+            self._inject_attributes_to_nodes([ins_elem])
 
-            # If processing a single w:del, track the created insertion
-            if is_single_del and nodes:
-                created_insertion = nodes[0]
+            if is_single_del:
+                created_insertion = ins_elem
 
         # Return based on input type
-        if is_single_del and created_insertion:
+        if is_single_del and created_insertion is not None:
             return [elem, created_insertion]
-        else:
-            return [elem]
+        return [elem]
 
     @staticmethod
     def suggest_paragraph(xml_content: str) -> str:
@@ -480,117 +397,287 @@ class DocxXMLEditor(XMLEditor):
         return para.toxml()
 
     def suggest_deletion(self, elem):
-        """Mark a w:r or w:p element as deleted with tracked changes (in-place DOM manipulation).
+        """Mark a w:r or w:p element as deleted with tracked changes (in-place manipulation).
 
         For w:r: wraps in <w:del>, converts <w:t> to <w:delText>, preserves w:rPr
         For w:p (regular): wraps content in <w:del>, converts <w:t> to <w:delText>
         For w:p (numbered list): adds <w:del/> to w:rPr in w:pPr, wraps content in <w:del>
 
         Args:
-            elem: A w:r or w:p DOM element without existing tracked changes
+            elem: A w:r or w:p element without existing tracked changes
 
         Returns:
-            Element: The modified element
+            Element: The w:del wrapping a w:r, or the w:p
 
         Raises:
             ValueError: If element has existing tracked changes or invalid structure
         """
-        if elem.nodeName == "w:r":
+        if self._is(elem, "w:r"):
             # Check for existing w:delText
-            if elem.getElementsByTagName("w:delText"):
+            if self._descendants(elem, "w:delText"):
                 raise ValueError("w:r element already contains w:delText")
 
-            # Convert w:t → w:delText
-            for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
-                # Copy ALL child nodes (not just firstChild) to handle entities
-                while t_elem.firstChild:
-                    del_text.appendChild(t_elem.firstChild)
-                # Preserve attributes like xml:space
-                for i in range(t_elem.attributes.length):
-                    attr = t_elem.attributes.item(i)
-                    del_text.setAttribute(attr.name, attr.value)
-                t_elem.parentNode.replaceChild(del_text, t_elem)
-
-            # Update run attributes: w:rsidR → w:rsidDel
-            if elem.hasAttribute("w:rsidR"):
-                elem.setAttribute("w:rsidDel", elem.getAttribute("w:rsidR"))
-                elem.removeAttribute("w:rsidR")
-            elif not elem.hasAttribute("w:rsidDel"):
-                elem.setAttribute("w:rsidDel", self.rsid)
+            # Convert w:t → w:delText and w:rsidR → w:rsidDel
+            self._rename_texts(elem, "w:t", "w:delText")
+            self._move_rsid(elem, "w:rsidR", "w:rsidDel")
 
             # Wrap in w:del
-            del_wrapper = self.dom.createElement("w:del")
-            parent = elem.parentNode
-            parent.insertBefore(del_wrapper, elem)
-            parent.removeChild(elem)
-            del_wrapper.appendChild(elem)
+            del_wrapper = self._new_element("w:del")
+            self._wrap(elem, del_wrapper)
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
-
             return del_wrapper
 
-        elif elem.nodeName == "w:p":
+        elif self._is(elem, "w:p"):
             # Check for existing tracked changes
-            if elem.getElementsByTagName("w:ins") or elem.getElementsByTagName("w:del"):
+            if self._descendants(elem, "w:ins") or self._descendants(elem, "w:del"):
                 raise ValueError("w:p element already contains tracked changes")
 
             # Check if it's a numbered list item
-            pPr_list = elem.getElementsByTagName("w:pPr")
-            is_numbered = pPr_list and pPr_list[0].getElementsByTagName("w:numPr")
-
-            if is_numbered:
+            pPr_list = self._descendants(elem, "w:pPr")
+            if pPr_list and self._descendants(pPr_list[0], "w:numPr"):
                 # Add <w:del/> to w:rPr in w:pPr
                 pPr = pPr_list[0]
-                rPr_list = pPr.getElementsByTagName("w:rPr")
-
+                rPr_list = self._descendants(pPr, "w:rPr")
                 if not rPr_list:
-                    rPr = self.dom.createElement("w:rPr")
-                    pPr.appendChild(rPr)
+                    rPr = self._new_element("w:rPr")
+                    self._append(pPr, rPr)
                 else:
                     rPr = rPr_list[0]
+                self._prepend(rPr, self._new_element("w:del"))
 
-                # Add <w:del/> marker
-                del_marker = self.dom.createElement("w:del")
-                rPr.insertBefore(
-                    del_marker, rPr.firstChild
-                ) if rPr.firstChild else rPr.appendChild(del_marker)
-
-            # Convert w:t → w:delText in all runs
-            for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
-                # Copy ALL child nodes (not just firstChild) to handle entities
-                while t_elem.firstChild:
-                    del_text.appendChild(t_elem.firstChild)
-                # Preserve attributes like xml:space
-                for i in range(t_elem.attributes.length):
-                    attr = t_elem.attributes.item(i)
-                    del_text.setAttribute(attr.name, attr.value)
-                t_elem.parentNode.replaceChild(del_text, t_elem)
-
-            # Update run attributes: w:rsidR → w:rsidDel
-            for run in elem.getElementsByTagName("w:r"):
-                if run.hasAttribute("w:rsidR"):
-                    run.setAttribute("w:rsidDel", run.getAttribute("w:rsidR"))
-                    run.removeAttribute("w:rsidR")
-                elif not run.hasAttribute("w:rsidDel"):
-                    run.setAttribute("w:rsidDel", self.rsid)
+            # Convert w:t → w:delText and w:rsidR → w:rsidDel in all runs
+            self._rename_texts(elem, "w:t", "w:delText")
+            for run in self._descendants(elem, "w:r"):
+                self._move_rsid(run, "w:rsidR", "w:rsidDel")
 
             # Wrap all non-pPr children in <w:del>
-            del_wrapper = self.dom.createElement("w:del")
-            for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
-                elem.removeChild(child)
-                del_wrapper.appendChild(child)
-            elem.appendChild(del_wrapper)
+            del_wrapper = self._new_element("w:del")
+            self._wrap_children(elem, del_wrapper, keep="w:pPr")
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
 
+            self._mark_changed([elem])
             return elem
 
         else:
-            raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
+            raise ValueError(f"Element must be w:r or w:p, got {elem.tagName}")
+
+
+class DocxXMLEditor(DocxEditing, XMLEditor):
+    """XMLEditor that automatically applies RSID, author, and date to new elements.
+
+    Automatically adds attributes to elements that support them when inserting new content:
+    - w:rsidR, w:rsidRDefault, w:rsidP (for w:p and w:r elements)
+    - w:author and w:date (for w:ins, w:del, w:comment elements)
+    - w:id (for w:ins and w:del elements)
+
+    Attributes:
+        dom (defusedxml.minidom.Document): The DOM document for direct manipulation
+    """
+
+    def _ensure_namespace(self, prefix):
+        """Ensure a namespace of NAMESPACES is declared on the root element."""
+        root = self.dom.documentElement
+        if not root.hasAttribute(f"xmlns:{prefix}"):  # type: ignore
+            root.setAttribute(f"xmlns:{prefix}", self.NAMESPACES[prefix])  # type: ignore
+
+    def _is_element(self, node):
+        return node.nodeType == node.ELEMENT_NODE
+
+    def _is(self, elem, tag):
+        return elem.tagName == tag
+
+    def _descendants(self, elem, tag):
+        # getElementsByTagName doesn't return the element itself
+        return elem.getElementsByTagName(tag)
+
+    def _is_inside(self, elem, tag):
+        parent = elem.parentNode
+        while parent:
+            if parent.nodeType == parent.ELEMENT_NODE and parent.tagName == tag:
+                return True
+            parent = parent.parentNode
+        return False
+
+    def _text(self, elem):
+        first = elem.firstChild
+        return first.data if first and first.nodeType == first.TEXT_NODE else None
+
+    def _has(self, elem, name):
+        return elem.hasAttribute(name)
+
+    def _set(self, elem, name, value):
+        prefix = name.partition(":")[0]
+        if prefix in self.NAMESPACES:
+            self._ensure_namespace(prefix)
+        elem.setAttribute(name, value)
+
+    def _pop(self, elem, name):
+        value = elem.getAttribute(name)
+        elem.removeAttribute(name)
+        return value
+
+    def _new_element(self, tag):
+        return self.dom.createElement(tag)
+
+    def _clone(self, elem):
+        return elem.cloneNode(True)
+
+    def _append(self, parent, child):
+        parent.appendChild(child)
+
+    def _prepend(self, parent, child):
+        parent.insertBefore(child, parent.firstChild)
+
+    def _add_next(self, elem, new):
+        elem.parentNode.insertBefore(new, elem.nextSibling)
+
+    def _wrap(self, elem, wrapper):
+        parent = elem.parentNode
+        parent.insertBefore(wrapper, elem)
+        parent.removeChild(elem)
+        wrapper.appendChild(elem)
+
+    def _wrap_children(self, elem, wrapper, keep=None):
+        for child in [c for c in elem.childNodes if c.nodeName != keep]:
+            elem.removeChild(child)
+            wrapper.appendChild(child)
+        elem.appendChild(wrapper)
+
+    def _rename_texts(self, elem, old_tag, new_tag):
+        for old in list(elem.getElementsByTagName(old_tag)):
+            new = self.dom.createElement(new_tag)
+            # Copy ALL child nodes (not just firstChild) to handle entities
+            while old.firstChild:
+                new.appendChild(old.firstChild)
+            # Preserve attributes like xml:space
+            for i in range(old.attributes.length):
+                attr = old.attributes.item(i)
+                new.setAttribute(attr.name, attr.value)
+            old.parentNode.replaceChild(new, old)
+
+
+class LxmlDocxXMLEditor(DocxEditing, LxmlXMLEditor):
+    """DocxXMLEditor for the lxml backend (see LxmlXMLEditor), for large parts.
+
+    Applies the same RSID, author, and date attributes to new elements, and has the
+    same tracked change methods. Nodes are lxml elements.
+
+    Attributes:
+        tree (lxml.etree.ElementTree): The tree for direct manipulation
+    """
+
+    def _ensure_namespace(self, prefix):
+        """Ensure a namespace of NAMESPACES is declared on the root element."""
+        root = self.tree.getroot()
+        if prefix not in root.nsmap:
+            # lxml cannot add a declaration to an element, but has cleanup
+            # declare it on the root. No other declaration may be removed, as
+            # prefixes are also named in attribute values (mc:Ignorable, and
+            # Requires of mc:Choice, often declared on the mc:Choice itself)
+            declared = {
+                p for elem in self.tree.iter(lxml.etree.Element) for p in elem.nsmap
+            }
+            lxml.etree.cleanup_namespaces(
+                self.tree,
+                top_nsmap={prefix: self.NAMESPACES[prefix]},
+                keep_ns_prefixes=[*filter(None, declared), prefix],
+            )
+
+    def _is_element(self, node):
+        return isinstance(node.tag, str)
+
+    def _is(self, elem, tag):
+        name = self._qualify(tag)
+        return name is not None and elem.tag == name
+
+    def _descendants(self, elem, tag):
+        name = self._qualify(tag)
+        return list(elem.iterdescendants(name)) if name else []
+
+    def _is_inside(self, elem, tag):
+        name = self._qualify(tag)
+        return name is not None and next(elem.iterancestors(name), None) is not None
+
+    def _text(self, elem):
+        return elem.text
+
+    def _has(self, elem, name):
+        key = self._attribute_key(elem, name)
+        return key is not None and key in elem.attrib
+
+    def _set(self, elem, name, value):
+        prefix = name.partition(":")[0]
+        if prefix in self.NAMESPACES:
+            self._ensure_namespace(prefix)
+        elem.set(self._qualify(name, attribute=True), value)
+
+    def _pop(self, elem, name):
+        return elem.attrib.pop(self._attribute_key(elem, name))
+
+    def _new_element(self, tag):
+        return self.tree.getroot().makeelement(self._qualify(tag))
+
+    def _clone(self, elem):
+        clone = copy.deepcopy(elem)
+        clone.tail = None
+        return clone
+
+    def _append(self, parent, child):
+        parent.append(child)
+
+    def _prepend(self, parent, child):
+        parent.insert(0, child)
+
+    def _add_next(self, elem, new):
+        # The text after elem goes after the new element, as with minidom
+        new.tail, elem.tail = elem.tail, None
+        elem.addnext(new)
+
+    def _wrap(self, elem, wrapper):
+        # The text after elem stays outside the wrapper
+        elem.addprevious(wrapper)
+        wrapper.tail, elem.tail = elem.tail, None
+        wrapper.append(elem)
+
+    def _wrap_children(self, elem, wrapper, keep=None):
+        # All the text between the moved children goes into the wrapper
+        kept = self._qualify(keep) if keep else None
+        wrapper.text, elem.text = elem.text, None
+        for child in list(elem):
+            if kept is None or child.tag != kept:
+                wrapper.append(child)
+            elif child.tail:
+                if len(wrapper):
+                    wrapper[-1].tail = (wrapper[-1].tail or "") + child.tail
+                else:
+                    wrapper.text = (wrapper.text or "") + child.tail
+                child.tail = None
+        elem.append(wrapper)
+
+    def _rename_texts(self, elem, old_tag, new_tag):
+        new_name = self._qualify(new_tag)
+        for text_elem in self._descendants(elem, old_tag):
+            text_elem.tag = new_name
+
+
+# Editor classes of Document's backends
+EDITOR_BACKENDS = {"minidom": DocxXMLEditor, "lxml": LxmlDocxXMLEditor}
+
+# Parts Document edits through the minidom API, whatever the backend
+MINIDOM_PARTS = {
+    "[Content_Types].xml",
+    "word/_rels/document.xml.rels",
+    "word/settings.xml",
+    "word/people.xml",
+    "word/comments.xml",
+    "word/commentsExtended.xml",
+    "word/commentsIds.xml",
+    "word/commentsExtensible.xml",
+}
 
 
 def _generate_hex_id() -> str:
@@ -609,6 +696,13 @@ def _generate_rsid() -> str:
     return "".join(random.choices("0123456789ABCDEF", k=8))
 
 
+def _relative_files(directory):
+    """Return the paths of all files in a directory, relative to it."""
+    return {
+        f.relative_to(directory).as_posix() for f in directory.rglob("*") if f.is_file()
+    }
+
+
 class Document:
     """Manages comments in unpacked Word documents."""
 
@@ -619,6 +713,7 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        backend="minidom",
     ):
         """
         Initialize with path to unpacked Word document directory.
@@ -630,23 +725,34 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            backend: Editor for the document's content parts: "minidom" (DocxXMLEditor,
+                the default) or "lxml" (LxmlDocxXMLEditor, faster and far smaller for
+                large parts). The parts this class maintains itself always use minidom
         """
+        if backend not in EDITOR_BACKENDS:
+            raise ValueError(f"Unknown editor backend: {backend}")
+        self.backend = backend
         self.original_path = Path(unpacked_dir)
 
         if not self.original_path.exists() or not self.original_path.is_dir():
             raise ValueError(f"Directory not found: {unpacked_dir}")
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
+        # Create temporary directory with subdirectories for the workspace and
+        # baseline. The workspace only holds the files written by this class;
+        # every other part is read from the original directory
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
+        self.unpacked_path.mkdir()
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+        # Baseline .docx for validation, made on first use (see original_docx)
+        self._original_docx = None
 
         self.word_path = self.unpacked_path / "word"
 
+        # Relationships and content types, read once; additions made by this
+        # class are recorded in it as they are made
+        self._package = PackageModel(DirectorySource(self.original_path))
+
         # Generate RSID if not provided
         self.rsid = rsid if rsid else _generate_rsid()
         print(f"Using RSID: {self.rsid}")
@@ -679,7 +785,7 @@ class Document:
 
     def __getitem__(self, xml_path: str) -> DocxXMLEditor:
         """
-        Get or create a DocxXMLEditor for the specified XML file.
+        Get or create a DocxXMLEditor (or LxmlDocxXMLEditor) for the specified XML file.
 
         Enables lazy-loaded editors with bracket notation:
             node = doc["word/document.xml"].get_node(tag="w:p", line_number=42)
@@ -688,7 +794,7 @@ class Document:
             xml_path: Relative path to XML file (e.g., "word/document.xml", "word/comments.xml")
 
         Returns:
-            DocxXMLEditor instance for the specified file
+            Editor for the specified file, of the class of the document's backend
 
         Raises:
             ValueError: If the file does not exist
@@ -702,12 +808,21 @@ class Document:
         """
         if xml_path not in self._editors:
             file_path = self.unpacked_path / xml_path
-            if not file_path.exists():
+            if not self._exists(file_path):
                 raise ValueError(f"XML file not found: {xml_path}")
-            # Use DocxXMLEditor with RSID, author, and initials for all editors
-            self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+            # Use RSID, author, and initials for all editors
+            editor_class = EDITOR_BACKENDS[self.backend]
+            if xml_path in MINIDOM_PARTS:
+                editor_class = DocxXMLEditor
+            editor = editor_class(
+                self._read_path(file_path),
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
             )
+            # Saved into the workspace, whichever copy it was read from
+            editor.xml_path = file_path
+            self._editors[xml_path] = editor
         return self._editors[xml_path]
 
     def add_comment(self, start, end, text: str) -> int:
@@ -727,7 +842,8 @@ class Document:
             end_node = cm.get_document_node(tag="w:ins", id="2")
             cm.add_comment(start=start_node, end=end_node, text="Explanation")
         """
-        comment_id = self.next_comment_id
+        # Skip IDs taken by comments inserted directly into comments.xml
+        comment_id = max(self.next_comment_id, self._get_next_comment_id())
         para_id = _generate_hex_id()
         durable_id = _generate_hex_id()
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -759,7 +875,7 @@ class Document:
         # Update existing_comments so replies work
         self.existing_comments[comment_id] = {"para_id": para_id}
 
-        self.next_comment_id += 1
+        self.next_comment_id = comment_id + 1
         return comment_id
 
     def reply_to_comment(
@@ -784,7 +900,8 @@ class Document:
             raise ValueError(f"Parent comment with id={parent_comment_id} not found")
 
         parent_info = self.existing_comments[parent_comment_id]
-        comment_id = self.next_comment_id
+        # Skip IDs taken by comments inserted directly into comments.xml
+        comment_id = max(self.next_comment_id, self._get_next_comment_id())
         para_id = _generate_hex_id()
         durable_id = _generate_hex_id()
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -827,7 +944,7 @@ class Document:
         # Update existing_comments so replies work
         self.existing_comments[comment_id] = {"para_id": para_id}
 
-        self.next_comment_id += 1
+        self.next_comment_id = comment_id + 1
         return comment_id
 
     def __del__(self):
@@ -835,6 +952,28 @@ class Document:
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
+    @property
+    def original_docx(self):
+        """Path to the original document as a .docx, the baseline for validation.
+
+        Made on first use. The Office file the directory was unpacked from is
+        used as it is if the directory still holds what unpack.py wrote for it;
+        otherwise the directory is packed.
+        """
+        if self._original_docx is None:
+            original_docx = Path(self.temp_dir) / "original.docx"
+            source = unchanged_original(self.original_path)
+            if source is None:
+                pack_document(self.original_path, original_docx, validate=False)
+            else:
+                try:
+                    # Unaffected if the file is later replaced, e.g. by pack.py
+                    os.link(source, original_docx)
+                except OSError:
+                    original_docx = source  # On another filesystem
+            self._original_docx = original_docx
+        return self._original_docx
+
     def validate(self) -> None:
         """
         Validate the document against XSD schema and redlining rules.
@@ -842,12 +981,21 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
+        # Create validators with current state. Only edited paragraphs and
+        # tables are checked against the schema, and the original's errors are
+        # kept across calls for when they need to be compared
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            OverlaySource(self.unpacked_path, self.original_path),
+            self.original_docx,
+            verbose=False,
+            baseline_cache_dir=Path(self.temp_dir) / "baseline",
+            scoped_xsd=True,
         )
+        modified = self.unpacked_path
+        if not (modified / "word" / "document.xml").exists():
+            modified = self.original_path  # Not saved since it was opened
         redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            modified, self.original_docx, verbose=False
         )
 
         # Run validations
@@ -861,49 +1009,75 @@ class Document:
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Saving back to the original directory only writes the files in the
+        workspace; any other destination gets a full copy of the document.
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
             validate: If True, validates document before saving (default: True).
         """
         # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
+        if self._exists(self.comments_path):
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
-        # Save all modified XML files in temp directory
+        # Save the XML files of all editors into the workspace
         for editor in self._editors.values():
+            editor.xml_path.parent.mkdir(parents=True, exist_ok=True)
             editor.save()
 
         # Validate by default
         if validate:
             self.validate()
 
-        # Copy contents from temp directory to destination (or original directory)
+        # Copy the workspace to destination (or original directory). Files are
+        # replaced rather than overwritten, in case they are hard links into
+        # unpack.py's cache
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        written = _relative_files(self.unpacked_path)
+        if target_path.resolve() == self.original_path.resolve():
+            # The baseline must be made before the original changes
+            self.original_docx
+        else:
+            unchanged = _relative_files(self.original_path) - written
+            clone_tree(self.original_path, target_path, sorted(unchanged))
+        clone_tree(self.unpacked_path, target_path, sorted(written))
 
     # ==================== Private: Initialization ====================
 
+    def _exists(self, path):
+        """Check if a file of the workspace exists there or in the original directory."""
+        return path.exists() or (
+            self.original_path / path.relative_to(self.unpacked_path)
+        ).exists()
+
+    def _read_path(self, path):
+        """Return where a file of the workspace is read from: the workspace once it
+        has been written there, the original directory until then."""
+        if path.exists():
+            return path
+        return self.original_path / path.relative_to(self.unpacked_path)
+
+    def _copy_template(self, path):
+        """Create a file of the workspace from the template of the same name."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(TEMPLATE_DIR / path.name, path)
+
     def _get_next_comment_id(self):
-        """Get the next available comment ID."""
-        if not self.comments_path.exists():
+        """Get the next available comment ID, above every w:id in comments.xml.
+
+        Comments are only scanned once; comments inserted since are accounted
+        for as they are inserted.
+        """
+        if not self._exists(self.comments_path):
             return 0
 
         editor = self["word/comments.xml"]
-        max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
-            if comment_id:
-                try:
-                    max_id = max(max_id, int(comment_id))
-                except ValueError:
-                    pass
-        return max_id + 1
+        return editor._max_id(("w:comment",), "w:id") + 1
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        if not self._exists(self.comments_path):
             return {}
 
         editor = self["word/comments.xml"]
@@ -953,9 +1127,9 @@ class Document:
 
     def _update_people_xml(self, path):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
+        if not self._exists(path):
             # Copy from template
-            shutil.copy(TEMPLATE_DIR / "people.xml", path)
+            self._copy_template(path)
 
     def _add_content_type_for_people(self, path):
         """Add people.xml content type to [Content_Types].xml if not already present."""
@@ -966,8 +1140,10 @@ class Document:
 
         # Add Override element
         root = editor.dom.documentElement
-        override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
+        content_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"
+        override_xml = f'<Override PartName="/word/people.xml" ContentType="{content_type}"/>'
         editor.append_to(root, override_xml)
+        self._package.content_types().add_override("/word/people.xml", content_type)
 
     def _add_relationship_for_people(self, path):
         """Add people.xml relationship to document.xml.rels if not already present."""
@@ -982,8 +1158,10 @@ class Document:
         next_rid = editor.get_next_rid()
 
         # Create the relationship entry
-        rel_xml = f'<{prefix}Relationship Id="{next_rid}" Type="http://schemas.microsoft.com/office/2011/relationships/people" Target="people.xml"/>'
+        rel_type = "http://schemas.microsoft.com/office/2011/relationships/people"
+        rel_xml = f'<{prefix}Relationship Id="{next_rid}" Type="{rel_type}" Target="people.xml"/>'
         editor.append_to(root, rel_xml)
+        self._relationships(editor).add(Relationship(next_rid, rel_type, "people.xml"))
 
     def _update_settings(self, path, track_revisions=False):
         """Add RSID and optionally enable track revisions in settings.xml.
@@ -1069,8 +1247,8 @@ class Document:
         self, comment_id, para_id, text, author, initials, timestamp
     ):
         """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
-            shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
+        if not self._exists(self.comments_path):
+            self._copy_template(self.comments_path)
 
         editor = self["word/comments.xml"]
         root = editor.get_node(tag="w:comments")
@@ -1090,10 +1268,8 @@ class Document:
 
     def _add_to_comments_extended_xml(self, para_id, parent_para_id):
         """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
-            )
+        if not self._exists(self.comments_extended_path):
+            self._copy_template(self.comments_extended_path)
 
         editor = self["word/commentsExtended.xml"]
         root = editor.get_node(tag="w15:commentsEx")
@@ -1106,8 +1282,8 @@ class Document:
 
     def _add_to_comments_ids_xml(self, para_id, durable_id):
         """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
-            shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
+        if not self._exists(self.comments_ids_path):
+            self._copy_template(self.comments_ids_path)
 
         editor = self["word/commentsIds.xml"]
         root = editor.get_node(tag="w16cid:commentsIds")
@@ -1117,10 +1293,8 @@ class Document:
 
     def _add_to_comments_extensible_xml(self, durable_id):
         """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
-            )
+        if not self._exists(self.comments_extensible_path):
+            self._copy_template(self.comments_extensible_path)
 
         editor = self["word/commentsExtensible.xml"]
         root = editor.get_node(tag="w16cex:commentsExtensible")
@@ -1157,19 +1331,18 @@ class Document:
 
     # ==================== Private: Metadata Updates ====================
 
+    def _relationships(self, editor):
+        """Return the package model's relationships of a .rels editor's file."""
+        rels_part = editor.xml_path.relative_to(self.unpacked_path).as_posix()
+        return self._package.relationships(rels_part)
+
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
-            if rel_elem.getAttribute("Target") == target:
-                return True
-        return False
+        return target in self._relationships(editor).targets
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
-            if override_elem.getAttribute("PartName") == part_name:
-                return True
-        return False
+        return self._package.content_types().has_override(part_name)
 
     def _has_author(self, editor, author):
         """Check if an author already exists in people.xml."""
@@ -1183,7 +1356,7 @@ class Document:
         people_path = self.word_path / "people.xml"
 
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if not self._exists(people_path):
             raise ValueError("people.xml should exist after _setup_tracking")
 
         editor = self["word/people.xml"]
@@ -1239,6 +1412,9 @@ class Document:
         for rel_id, rel_type, target in rels:
             rel_xml = f'<{prefix}Relationship Id="rId{rel_id}" Type="{rel_type}" Target="{target}"/>'
             editor.append_to(root, rel_xml)
+            self._relationships(editor).add(
+                Relationship(f"rId{rel_id}", rel_type, target)
+            )
 
     def _ensure_comment_content_types(self):
         """Ensure [Content_Types].xml has comment content types."""
@@ -1274,3 +1450,4 @@ class Document:
                 f'<Override PartName="{part_name}" ContentType="{content_type}"/>'
             )
             editor.append_to(root, override_xml)
+            self._package.content_types().add_override(part_name, content_type)
@@ -0,0 +1,186 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import lxml.etree
+
+from scripts.document import DocxXMLEditor, LxmlDocxXMLEditor
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+WPS = "http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+WP = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+WP14 = "http://schemas.microsoft.com/office/word/2010/wordprocessingDrawing"
+
+# The root declares neither w14 nor w16du, wps is declared only where
+# mc:Choice names it in Requires, and wp14 only on the wp:inline using it
+DOCUMENT_XML = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="{W}" xmlns:mc="{MC}" xmlns:wp="{WP}">
+  <w:body>
+    <w:p>
+      <w:r>
+        <mc:AlternateContent>
+          <mc:Choice xmlns:wps="{WPS}" Requires="wps">
+            <w:t>Shape</w:t>
+          </mc:Choice>
+          <mc:Fallback>
+            <w:t>Picture</w:t>
+          </mc:Fallback>
+        </mc:AlternateContent>
+      </w:r>
+    </w:p>
+    <w:p>
+      <w:r>
+        <w:drawing>
+          <wp:inline xmlns:wp14="{WP14}" wp14:anchorId="1234"/>
+        </w:drawing>
+      </w:r>
+    </w:p>
+    <w:p>
+      <w:r>
+        <w:t>Second paragraph</w:t>
+      </w:r>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+# Tracked changes by another author, with IDs 5 and 7
+CHANGES_XML = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="{W}">
+  <w:body>
+    <w:p>
+      <w:ins w:id="5" w:author="Other" w:date="2024-01-01T00:00:00Z">
+        <w:r>
+          <w:t>Inserted</w:t>
+        </w:r>
+      </w:ins>
+      <w:del w:id="7" w:author="Other" w:date="2024-01-01T00:00:00Z">
+        <w:r>
+          <w:delText>Deleted</w:delText>
+        </w:r>
+      </w:del>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+EDITORS = (DocxXMLEditor, LxmlDocxXMLEditor)
+
+
+def edit_and_save(editor_class, edit, xml=DOCUMENT_XML):
+    """Apply edit to an editor of xml and return the saved XML"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "document.xml"
+        path.write_text(xml, encoding="utf-8")
+        editor = editor_class(path, rsid="00AB12CD")
+        edit(editor)
+        editor.save()
+        return path.read_text(encoding="utf-8")
+
+
+def change_ids(xml):
+    """Return the w:id of each w:ins and w:del in saved XML, in document order"""
+    root = lxml.etree.fromstring(xml.encode())
+    return [
+        int(elem.get(f"{{{W}}}id")) for elem in root.iter(f"{{{W}}}ins", f"{{{W}}}del")
+    ]
+
+
+def tracked_run(tag, text):
+    """Return a w:ins or w:del without a w:id, for the editor to assign one"""
+    text_tag = "w:delText" if tag == "w:del" else "w:t"
+    return f"<{tag}><w:r><{text_tag}>{text}</{text_tag}></w:r></{tag}>"
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# Run from the docx directory: python -m unittest scripts.document_test
+class TestEditorBackends(unittest.TestCase):
+
+    def test_namespace_declaration_keeps_local_declarations(self):
+        """Test that declaring w16du on the root keeps mc:Choice's own declaration"""
+
+        def edit(editor):
+            elem = editor.get_node(tag="w:p", contains="Second paragraph")
+            editor.insert_after(
+                elem, "<w:p><w:ins><w:r><w:t>New</w:t></w:r></w:ins></w:p>"
+            )
+
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                xml = edit_and_save(editor_class, edit)
+                self.assertIn("w16du:dateUtc=", xml)
+                choice = lxml.etree.fromstring(xml.encode()).find(f".//{{{MC}}}Choice")
+                self.assertEqual(choice.nsmap.get("wps"), WPS)
+
+    def test_get_node_by_attribute_with_local_prefix(self):
+        """Test lookup by an attribute whose prefix is declared below the root"""
+
+        def edit(editor):
+            editor.get_node(tag="wp:inline", attrs={"wp14:anchorId": "1234"})
+            with self.assertRaises(ValueError):
+                editor.get_node(tag="wp:inline", attrs={"wp14:anchorId": "5678"})
+
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                edit_and_save(editor_class, edit)
+
+
+class TestChangeIds(unittest.TestCase):
+
+    def assert_ids(self, edit, expected):
+        """Check the change IDs after edit, with each editor backend"""
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                xml = edit_and_save(editor_class, edit, CHANGES_XML)
+                self.assertEqual(change_ids(xml), expected)
+
+    def test_ids_above_existing(self):
+        """Test that new changes are numbered on from the highest existing ID"""
+
+        def edit(editor):
+            paragraph = editor.get_node(tag="w:p")
+            editor.append_to(
+                paragraph, tracked_run("w:ins", "One") + tracked_run("w:del", "Two")
+            )
+            editor.append_to(paragraph, tracked_run("w:ins", "Three"))
+
+        self.assert_ids(edit, [5, 7, 8, 9, 10])
+
+    def test_ids_not_reused_after_removal(self):
+        """Test that IDs handed out or scanned stay taken once their elements go"""
+
+        def edit(editor):
+            paragraph = editor.get_node(tag="w:p")
+            (new,) = editor.append_to(paragraph, tracked_run("w:ins", "New"))
+            editor.replace_node(
+                editor.get_node(tag="w:del"), "<w:r><w:t>Kept</w:t></w:r>"
+            )
+            editor.replace_node(new, "<w:r><w:t>Plain</w:t></w:r>")
+            editor.append_to(paragraph, tracked_run("w:ins", "Last"))
+
+        self.assert_ids(edit, [5, 9])
+
+    def test_ids_carried_by_inserted_fragments(self):
+        """Test that IDs in inserted XML are never handed out again"""
+
+        def edit(editor):
+            paragraph = editor.get_node(tag="w:p")
+            editor.append_to(paragraph, tracked_run("w:ins", "First"))
+            # The fragment's own ID is the one the next change would get
+            editor.append_to(
+                paragraph,
+                '<w:ins w:id="9"><w:r><w:t>Given</w:t></w:r></w:ins>'
+                + tracked_run("w:del", "Assigned"),
+            )
+            editor.append_to(
+                paragraph,
+                '<w:del w:id="20"><w:r><w:delText>Far</w:delText></w:r></w:del>',
+            )
+            editor.append_to(paragraph, tracked_run("w:ins", "After"))
+
+        self.assert_ids(edit, [5, 7, 8, 9, 10, 20, 21])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark the minidom (XMLEditor) and lxml (LxmlXMLEditor) editor backends on an XML part.
+
+Usage:
+    python editor_benchmark.py <xml_file> [--tag TAG] [--edits N] [--repeat N]
+
+Each run parses a copy of the file, finds N elements with the tag by line number
+(spread over the file) and inserts an element after each, then saves. Runs take
+place in a fresh process, so that the peak memory of each backend can be reported
+along with its best times:
+
+    backend    parse (s)   edit (s)   save (s)   peak RSS (MB)
+    minidom       12.345      0.123      4.567          2,345
+    lxml           0.789      0.045      0.321            345
+"""
+
+import argparse
+import re
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utilities import LxmlXMLEditor, XMLEditor
+
+BACKENDS = {"minidom": XMLEditor, "lxml": LxmlXMLEditor}
+
+
+def edit_lines(xml_file, tag, edits):
+    """Return the lines of up to edits start tags of tag, spread over the file."""
+    start_tag = re.compile(rf"<{re.escape(tag)}[\s/>]".encode())
+    with open(xml_file, "rb") as f:
+        lines = [number for number, line in enumerate(f, 1) if start_tag.search(line)]
+    step = max(len(lines) // max(edits, 1), 1)
+    return lines[::step][:edits]
+
+
+def run(backend, xml_file, tag, lines):
+    """Parse, edit and save a copy of xml_file with one backend, in this process.
+
+    Returns:
+        tuple: (parse seconds, edit seconds, save seconds, peak RSS in bytes)
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / Path(xml_file).name
+        shutil.copyfile(xml_file, path)
+
+        started = time.perf_counter()
+        editor = BACKENDS[backend](path)
+        parsed = time.perf_counter()
+        for line in lines:
+            elem = editor.get_node(tag=tag, line_number=line)
+            editor.insert_after(elem, f"<{tag}/>")
+        edited = time.perf_counter()
+        editor.save()
+        saved = time.perf_counter()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KB on Linux
+    return parsed - started, edited - parsed, saved - edited, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XML editor backends")
+    parser.add_argument("xml_file", help="XML part, e.g. unpacked/word/document.xml")
+    parser.add_argument(
+        "--tag", default="w:p", help="Tag of the elements to edit (default: w:p)"
+    )
+    parser.add_argument(
+        "--edits",
+        type=int,
+        default=100,
+        metavar="N",
+        help="Elements to look up and insert after (default 100)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Runs per backend; the fastest times are reported (default 3)",
+    )
+    args = parser.parse_args()
+
+    lines = edit_lines(args.xml_file, args.tag, args.edits)
+    print(f"{len(lines)} edits of <{args.tag}>")
+    print(
+        f"{'backend':<9} {'parse (s)':>10} {'edit (s)':>10} {'save (s)':>10} "
+        f"{'peak RSS (MB)':>14}"
+    )
+    for backend in BACKENDS:
+        results = []
+        for _ in range(args.repeat):
+            # A process per run, so that peak RSS is that of one backend
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                results.append(
+                    pool.submit(run, backend, args.xml_file, args.tag, lines).result()
+                )
+        parse, edit, save = (min(times) for times in list(zip(*results))[:3])
+        peak = max(result[3] for result in results)
+        print(
+            f"{backend:<9} {parse:>10.3f} {edit:>10.3f} {save:>10.3f} "
+            f"{peak / (1 << 20):>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,13 @@ This module provides XMLEditor, a tool for manipulating XML files with support f
 line-number-based node finding and DOM manipulation. Each element is automatically
 annotated with its original line and column position during parsing.
 
+Lookups go through indexes built on first use (elements by tag, by attribute value,
+and by line number) and kept up to date by the editing methods. Code that changes
+the DOM directly should pass the changed nodes to _mark_changed().
+
+LxmlXMLEditor has the same API on an lxml tree, for parts too large for minidom;
+editor_benchmark.py compares the two.
+
 Example usage:
     editor = XMLEditor("document.xml")
 
@@ -22,6 +29,10 @@ Example usage:
     # Combine filters
     elem = editor.get_node(tag="w:p", line_number=range(1, 50), contains="text")
 
+    # Find every occurrence of many phrases at once
+    for match in editor.find_all_text(["first phrase", re.compile(r"[0-9]+ days")]):
+        print(match.element.parse_position, match.start, match.end, match.text)
+
     # Replace, insert, or manipulate
     new_elem = editor.replace_node(elem, "<w:r><w:t>new text</w:t></w:r>")
     editor.insert_after(new_elem, "<w:r><w:t>more</w:t></w:r>")
@@ -30,12 +41,43 @@ Example usage:
     editor.save()
 """
 
+import bisect
 import html
+import re
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Union
 
 import defusedxml.minidom
 import defusedxml.sax
+import lxml.etree
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+# Highest line number libxml2 records exactly (it is stored in 16 bits)
+MAX_SOURCELINE = 65534
+
+# Markup spanning lines, such as a start tag with attributes on lines of their own
+_MULTILINE_MARKUP = re.compile(rb"<[^<>]*\n[^<>]*>")
+
+# Markup of an XML file; group 1 is the start tag of an element
+_MARKUP = re.compile(
+    rb"<!--.*?-->|<!\[CDATA\[.*?\]\]>|<\?.*?\?>|<!DOCTYPE(?:[^\[>]|\[.*?\])*>"
+    rb"""|(<[^/!?](?:[^>"']|"[^"]*"|'[^']*')*>)""",
+    re.DOTALL,
+)
+
+
+@dataclass(frozen=True)
+class TextMatch:
+    """An occurrence of a pattern found by XMLEditor.find_all_text()."""
+
+    element: object  # defusedxml.minidom.Element whose text matched
+    start: int  # Offsets of the match in the element's text
+    end: int
+    pattern: object  # The pattern as given (str or re.Pattern)
+    text: str  # The matched text
 
 
 class XMLEditor:
@@ -73,6 +115,16 @@ class XMLEditor:
         parser = _create_line_tracking_parser()
         self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
 
+        # Lookup indexes, built on first use. Entries for elements that have
+        # since been removed or changed are filtered out by get_node()
+        self._elements = None  # {tag: {element: None}}, in document order
+        self._attr_indexes = {}  # {(tag, attribute): {value: {element: None}}}
+        self._line_indexes = {}  # {tag: ([line, ...], [element, ...])}, by line
+        self._texts = {}  # {element: text content}
+        self._changed = []  # Nodes inserted or changed since the last lookup
+        # Highest numeric ID by (tags, attribute, prefix), see _max_id()
+        self._id_maxima = {}
+
     def get_node(
         self,
         tag: str,
@@ -109,76 +161,252 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
-            # Check line_number filter
-            if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
-
-                # Handle both single line number and range
-                if isinstance(line_number, range):
-                    if elem_line not in line_number:
-                        continue
-                else:
-                    if elem_line != line_number:
-                        continue
-
-            # Check attrs filter
-            if attrs is not None:
-                if not all(
-                    elem.getAttribute(attr_name) == attr_value
-                    for attr_name, attr_value in attrs.items()
-                ):
-                    continue
+        # Normalize the search string: convert HTML entities to Unicode characters
+        # This allows searching for both "&#8220;Rowan" and ""Rowan"
+        normalized_contains = html.unescape(contains) if contains is not None else None
+
+        matches = [
+            elem
+            for elem in self._candidates(tag, attrs, line_number)
+            if self._is_attached(elem)
+            and self._matches(elem, attrs, line_number, normalized_contains)
+        ]
+        if len(matches) == 1 and contains is not None:
+            # Cached text may be stale if the DOM was changed directly
+            self._texts.pop(matches[0], None)
+            if normalized_contains not in self._get_text(matches[0]):
+                matches = []
+        if not matches:
+            # Elements added to the DOM directly are not indexed; search them
+            # all before giving up, and index them afresh if that finds any
+            matches = [
+                elem
+                for elem in self.dom.getElementsByTagName(tag)
+                if self._matches(
+                    elem, attrs, line_number, normalized_contains, cached=False
+                )
+            ]
+            if matches:
+                self._reset_indexes()
 
-            # Check contains filter
-            if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
+        if not matches:
+            raise _node_not_found(tag, attrs, line_number, contains)
+        if len(matches) > 1:
+            raise _multiple_nodes_found(tag)
+        return matches[0]
 
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+    def find_all_text(self, patterns, tag: str = "w:p"):
+        """
+        Find every occurrence of many patterns in the text of elements at once.
 
-        if not matches:
-            # Build descriptive error message
-            filters = []
-            if line_number is not None:
-                line_str = (
-                    f"lines {line_number.start}-{line_number.stop - 1}"
-                    if isinstance(line_number, range)
-                    else f"line {line_number}"
-                )
-                filters.append(f"at {line_str}")
-            if attrs is not None:
-                filters.append(f"with attributes {attrs}")
-            if contains is not None:
-                filters.append(f"containing '{contains}'")
-
-            filter_desc = " ".join(filters) if filters else ""
-            base_msg = f"Node not found: <{tag}> {filter_desc}".strip()
-
-            # Add helpful hint based on filters used
-            if contains:
-                hint = "Text may be split across elements or use different wording."
-            elif line_number:
-                hint = "Line numbers may have changed if document was modified."
-            elif attrs:
-                hint = "Verify attribute values are correct."
+        Element text is the same as for get_node(contains=...), and is cached
+        across calls until the element changes. All literal patterns are matched
+        together in a single pass over the text of all elements (Aho-Corasick);
+        regular expressions are matched within the text of each element.
+
+        Args:
+            patterns: Literal strings, which support entity notation (&#8220;) like
+                      get_node(contains=...), or compiled regular expressions
+            tag: The XML tag name of the elements to search (default: "w:p")
+
+        Returns:
+            List[TextMatch]: Every match, overlapping ones included, ordered by
+            element in document order, then by start offset, then by pattern
+
+        Example:
+            matches = editor.find_all_text(["Governing Law", "Termination"])
+            matches = editor.find_all_text([re.compile(r"within [0-9]+ days")], tag="w:r")
+        """
+        self._update_indexes()
+        elements = self.dom.getElementsByTagName(tag)
+        texts = [self._get_text(elem) for elem in elements]
+        return _find_all_text(elements, texts, patterns)
+
+    def _matches(self, elem, attrs, line_number, contains, cached=True):
+        """Return True if an element passes the get_node() filters."""
+        # Check line_number filter
+        if line_number is not None:
+            parse_pos = getattr(elem, "parse_position", (None,))
+            elem_line = parse_pos[0]
+
+            # Handle both single line number and range
+            if isinstance(line_number, range):
+                if elem_line not in line_number:
+                    return False
+            else:
+                if elem_line != line_number:
+                    return False
+
+        # Check attrs filter
+        if attrs is not None:
+            if not all(
+                elem.getAttribute(attr_name) == attr_value
+                for attr_name, attr_value in attrs.items()
+            ):
+                return False
+
+        # Check contains filter
+        if contains is not None:
+            if cached:
+                elem_text = self._get_text(elem)
             else:
-                hint = "Try adding filters (attrs, line_number, or contains)."
+                elem_text = self._get_element_text(elem)
+            if contains not in elem_text:
+                return False
 
-            raise ValueError(f"{base_msg}. {hint}")
-        if len(matches) > 1:
-            raise ValueError(
-                f"Multiple nodes found: <{tag}>. "
-                f"Add more filters (attrs, line_number, or contains) to narrow the search."
+        return True
+
+    def _candidates(self, tag, attrs, line_number):
+        """Return the indexed elements that may match a get_node() query.
+
+        Uses the narrowest index available: line numbers, then attribute values,
+        then the tag alone. Candidates still have to be checked with _matches().
+        """
+        self._update_indexes()
+        if line_number is not None:
+            lines, elements = self._line_index(tag)
+            if isinstance(line_number, range):
+                if not line_number:
+                    return []
+                start, stop = min(line_number), max(line_number) + 1
+            else:
+                start, stop = line_number, line_number + 1
+            return elements[
+                bisect.bisect_left(lines, start) : bisect.bisect_left(lines, stop)
+            ]
+        if attrs:
+            candidates = None
+            for attr_name, attr_value in attrs.items():
+                found = self._attr_index(tag, attr_name).get(attr_value, {})
+                if candidates is None or len(found) < len(candidates):
+                    candidates = found
+            return list(candidates)
+        return list(self._elements.get(tag, ()))
+
+    def _update_indexes(self):
+        """Build the tag index, or bring it up to date with _mark_changed() nodes."""
+        if self._elements is None:
+            self._elements = {}
+            for elem in self.dom.getElementsByTagName("*"):
+                self._elements.setdefault(elem.tagName, {})[elem] = None
+            self._changed = []
+            # IDs already handed out stay taken even if their elements are gone
+            for key, highest in self._id_maxima.items():
+                self._id_maxima[key] = max(highest, self._scan_max_id(*key))
+            return
+
+        changed, self._changed = self._changed, []
+        for node in changed:
+            # The text of every element around a change has changed too
+            ancestor = node.parentNode
+            while ancestor is not None:
+                self._texts.pop(ancestor, None)
+                ancestor = ancestor.parentNode
+            if node.nodeType != node.ELEMENT_NODE:
+                continue
+            for elem in [node, *node.getElementsByTagName("*")]:
+                self._texts.pop(elem, None)
+                self._elements.setdefault(elem.tagName, {})[elem] = None
+                for (tag, attr_name), index in self._attr_indexes.items():
+                    if tag == elem.tagName:
+                        value = elem.getAttribute(attr_name)
+                        index.setdefault(value, {})[elem] = None
+                for (tags, attr_name, prefix), highest in self._id_maxima.items():
+                    if elem.tagName in tags:
+                        number = _id_number(elem.getAttribute(attr_name), prefix)
+                        if number > highest:
+                            self._id_maxima[(tags, attr_name, prefix)] = number
+
+    def _attr_index(self, tag, attr_name):
+        """Return {value: elements} for an attribute of the elements with a tag.
+
+        Elements without the attribute are indexed under "", as getAttribute()
+        returns for them.
+        """
+        key = (tag, attr_name)
+        if key not in self._attr_indexes:
+            index = {}
+            for elem in self._elements.get(tag, ()):
+                index.setdefault(elem.getAttribute(attr_name), {})[elem] = None
+            self._attr_indexes[key] = index
+        return self._attr_indexes[key]
+
+    def _line_index(self, tag):
+        """Return (sorted line numbers, elements) of the elements with a tag.
+
+        Only parsed elements have a line number; inserted ones never match one.
+        """
+        if tag not in self._line_indexes:
+            positioned = sorted(
+                (elem.parse_position[0], i, elem)
+                for i, elem in enumerate(self._elements.get(tag, ()))
+                if hasattr(elem, "parse_position")
             )
-        return matches[0]
+            self._line_indexes[tag] = (
+                [line for line, _, _ in positioned],
+                [elem for _, _, elem in positioned],
+            )
+        return self._line_indexes[tag]
+
+    def _max_id(self, tags, attr_name, prefix=""):
+        """Return the highest number N of the elements with one of the tags whose
+        attribute is "<prefix>N", or -1 if there is none.
+
+        The elements are scanned on the first call only. Afterwards the highest
+        ID is raised as elements are inserted (see _mark_changed()) and as IDs
+        are handed out by _allocate_id(), so each call takes constant time.
+        Removing elements never lowers it, so IDs are not reused.
+        """
+        self._update_indexes()
+        key = (tuple(tags), attr_name, prefix)
+        if key not in self._id_maxima:
+            self._id_maxima[key] = self._scan_max_id(*key)
+        return self._id_maxima[key]
+
+    def _allocate_id(self, tags, attr_name, prefix=""):
+        """Return the next unused number for _max_id(), and mark it as used."""
+        number = self._max_id(tags, attr_name, prefix) + 1
+        self._id_maxima[(tuple(tags), attr_name, prefix)] = number
+        return number
+
+    def _scan_max_id(self, tags, attr_name, prefix):
+        """Find the highest ID for _max_id() by checking every element."""
+        return max(
+            (
+                _id_number(elem.getAttribute(attr_name), prefix)
+                for tag in tags
+                for elem in self._elements.get(tag, ())
+            ),
+            default=-1,
+        )
+
+    def _mark_changed(self, nodes):
+        """Record nodes inserted into the DOM, or whose subtree was changed.
+
+        The indexes and cached texts are updated for them before the next lookup.
+        """
+        self._changed.extend(nodes)
+
+    def _reset_indexes(self):
+        """Drop all indexes, to be rebuilt from the DOM on the next lookup."""
+        self._elements = None
+        self._attr_indexes = {}
+        self._line_indexes = {}
+        self._texts = {}
+        self._changed = []
+
+    def _is_attached(self, node):
+        """Return True if a node is still part of the document."""
+        while node.parentNode is not None:
+            node = node.parentNode
+        return node is self.dom
+
+    def _get_text(self, elem):
+        """Return the text content of an element, cached until it changes."""
+        text = self._texts.get(elem)
+        if text is None:
+            text = self._texts[elem] = self._get_element_text(elem)
+        return text
 
     def _get_element_text(self, elem):
         """
@@ -222,6 +450,7 @@ class XMLEditor:
         for node in nodes:
             parent.insertBefore(node, elem)
         parent.removeChild(elem)
+        self._mark_changed(nodes)
         return nodes
 
     def insert_after(self, elem, xml_content):
@@ -246,6 +475,7 @@ class XMLEditor:
                 parent.insertBefore(node, next_sibling)
             else:
                 parent.appendChild(node)
+        self._mark_changed(nodes)
         return nodes
 
     def insert_before(self, elem, xml_content):
@@ -266,6 +496,7 @@ class XMLEditor:
         nodes = self._parse_fragment(xml_content)
         for node in nodes:
             parent.insertBefore(node, elem)
+        self._mark_changed(nodes)
         return nodes
 
     def append_to(self, elem, xml_content):
@@ -285,18 +516,12 @@ class XMLEditor:
         nodes = self._parse_fragment(xml_content)
         for node in nodes:
             elem.appendChild(node)
+        self._mark_changed(nodes)
         return nodes
 
     def get_next_rid(self):
         """Get the next available rId for relationships files."""
-        max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
-            rel_id = rel_elem.getAttribute("Id")
-            if rel_id.startswith("rId"):
-                try:
-                    max_id = max(max_id, int(rel_id[3:]))
-                except ValueError:
-                    pass
+        max_id = max(self._max_id(("Relationship",), "Id", "rId"), 0)
         return f"rId{max_id + 1}"
 
     def save(self):
@@ -343,6 +568,578 @@ class XMLEditor:
         return nodes
 
 
+class LxmlXMLEditor:
+    """
+    Editor with the XMLEditor API, backed by lxml instead of minidom.
+
+    Parsing and saving are several times faster than with XMLEditor, and the tree
+    takes several times less memory, which matters for large parts. Line numbers
+    are those of the first line of each element's start tag, as with XMLEditor;
+    columns are not recorded.
+
+    Nodes are lxml elements. So that code written for XMLEditor keeps working, they
+    also have minidom's tagName (the prefixed name, e.g. "w:p") and parentNode.
+
+    Attributes:
+        xml_path: Path to the XML file being edited
+        encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
+        tree: Parsed lxml.etree.ElementTree
+    """
+
+    def __init__(self, xml_path):
+        """
+        Initialize with path to XML file and parse it.
+
+        Args:
+            xml_path: Path to XML file to edit (str or Path)
+
+        Raises:
+            ValueError: If the XML file does not exist
+        """
+        self.xml_path = Path(xml_path)
+        if not self.xml_path.exists():
+            raise ValueError(f"XML file not found: {xml_path}")
+
+        with open(self.xml_path, "rb") as f:
+            header = f.read(200).decode("utf-8", errors="ignore")
+        self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
+
+        data = self.xml_path.read_bytes()
+        self._parser = _create_lxml_parser()
+        self.tree = lxml.etree.fromstring(data, self._parser).getroottree()
+
+        # sourceline is the line a start tag ends on, and libxml2 keeps it in
+        # 16 bits, so it is not exact past MAX_SOURCELINE. The lines of the
+        # elements whose start tag begins elsewhere are kept here
+        self._start_lines = {}  # {element: line}
+        if data.count(b"\n") >= MAX_SOURCELINE or _MULTILINE_MARKUP.search(data):
+            self._start_lines = _start_tag_lines(data, self.tree)
+        # {tag: ([line, ...], [element, ...])} of parsed elements, built on
+        # first use; elements since removed are filtered out by get_node()
+        self._line_indexes = {}
+        # Highest numeric ID by (tags, attribute, prefix), see _max_id()
+        self._id_maxima = {}
+
+    def get_node(
+        self,
+        tag: str,
+        attrs: Optional[dict[str, str]] = None,
+        line_number: Optional[Union[int, range]] = None,
+        contains: Optional[str] = None,
+    ):
+        """
+        Get an element by tag and identifier, like XMLEditor.get_node().
+
+        Args:
+            tag: The XML tag name (e.g., "w:del", "w:ins", "w:r")
+            attrs: Dictionary of attribute name-value pairs to match (e.g., {"w:id": "1"})
+            line_number: Line number (int) or line range (range) in original XML file (1-indexed)
+            contains: Text string that must appear in any text node within the element.
+                      Supports both entity notation (&#8220;) and Unicode characters (\u201c).
+
+        Returns:
+            lxml.etree._Element: The matching element
+
+        Raises:
+            ValueError: If node not found or multiple matches found
+        """
+        normalized_contains = html.unescape(contains) if contains is not None else None
+
+        matches = [
+            elem
+            for elem in self._candidates(tag, attrs, line_number)
+            if self._matches(elem, attrs, line_number, normalized_contains)
+        ]
+        if not matches:
+            raise _node_not_found(tag, attrs, line_number, contains)
+        if len(matches) > 1:
+            raise _multiple_nodes_found(tag)
+        return matches[0]
+
+    def find_all_text(self, patterns, tag: str = "w:p"):
+        """
+        Find every occurrence of many patterns in the text of elements at once,
+        like XMLEditor.find_all_text().
+
+        Returns:
+            List[TextMatch]: Every match, ordered by element in document order,
+            then by start offset, then by pattern
+        """
+        elements = list(self._iter_tag(tag))
+        texts = [self._get_element_text(elem) for elem in elements]
+        return _find_all_text(elements, texts, patterns)
+
+    def _qualify(self, name, attribute=False):
+        """
+        Return the lxml name ("{namespace}local") of a prefixed name such as "w:p".
+
+        Prefixes are those declared on the root element. Unprefixed element names are
+        in the root's default namespace, unprefixed attribute names in none.
+
+        Returns:
+            str: The lxml name, or None if the prefix is not declared on the root
+        """
+        prefix, _, local = name.rpartition(":")
+        if prefix == "xml":
+            return f"{{{XML_NAMESPACE}}}{local}"
+        nsmap = self.tree.getroot().nsmap
+        if not prefix:
+            uri = None if attribute else nsmap.get(None)
+        elif prefix in nsmap:
+            uri = nsmap[prefix]
+        else:
+            return None
+        return f"{{{uri}}}{local}" if uri else local
+
+    def _attribute_key(self, elem, name):
+        """Return the lxml name of an element's attribute by prefixed name.
+
+        Prefixes not declared on the root are looked up in the element's scope.
+
+        Returns:
+            str: The lxml name, or None if the prefix is not declared there either
+        """
+        key = self._qualify(name, attribute=True)
+        if key is None:
+            prefix, _, local = name.rpartition(":")
+            uri = elem.nsmap.get(prefix)
+            key = f"{{{uri}}}{local}" if uri else None
+        return key
+
+    def _get_attribute(self, elem, name):
+        """Return an attribute of an element by prefixed name, or "" if it has none,
+        like minidom's getAttribute()."""
+        key = self._attribute_key(elem, name)
+        return elem.get(key, "") if key else ""
+
+    def _iter_tag(self, tag):
+        """Iterate over the elements with a prefixed tag name, in document order."""
+        root = self.tree.getroot()
+        name = self._qualify(tag)
+        if name is None:
+            # Prefix declared below the root
+            return (
+                elem
+                for elem in root.iter()
+                if isinstance(elem.tag, str) and elem.tagName == tag
+            )
+        return root.iter(name)
+
+    def _candidates(self, tag, attrs, line_number):
+        """Return the elements that may match a get_node() query.
+
+        Line numbers are looked up in an index, attribute values with XPath.
+        Candidates still have to be checked with _matches().
+        """
+        if line_number is not None:
+            lines, elements = self._line_index(tag)
+            if isinstance(line_number, range):
+                if not line_number:
+                    return []
+                start, stop = min(line_number), max(line_number) + 1
+            else:
+                start, stop = line_number, line_number + 1
+            # Indexed elements may since have been removed or renamed
+            return [
+                elem
+                for elem in elements[
+                    bisect.bisect_left(lines, start) : bisect.bisect_left(lines, stop)
+                ]
+                if elem.tagName == tag and self._is_attached(elem)
+            ]
+
+        name = self._qualify(tag)
+        # Missing attributes match "", which XPath cannot test for
+        conditions = {
+            self._qualify(attr_name, attribute=True): attr_value
+            for attr_name, attr_value in (attrs or {}).items()
+            if attr_value
+        }
+        if name is None or not conditions or None in conditions:
+            # Prefixes declared below the root are resolved per element
+            return self._iter_tag(tag)
+        variables = {f"v{i}": value for i, value in enumerate(conditions.values())}
+        predicates = "".join(f"[@{key}=$v{i}]" for i, key in enumerate(conditions))
+        return lxml.etree.ETXPath(f"//{name}{predicates}")(self.tree, **variables)
+
+    def _line_index(self, tag):
+        """Return (sorted line numbers, elements) of the parsed elements with a tag.
+
+        Inserted elements have no line number, and never match one.
+        """
+        if tag not in self._line_indexes:
+            positioned = [
+                (self._line_number(elem), elem)
+                for elem in self._iter_tag(tag)
+                if elem.sourceline is not None
+            ]
+            positioned.sort(key=lambda item: item[0])
+            self._line_indexes[tag] = (
+                [line for line, _ in positioned],
+                [elem for _, elem in positioned],
+            )
+        return self._line_indexes[tag]
+
+    def _matches(self, elem, attrs, line_number, contains):
+        """Return True if an element passes the get_node() filters."""
+        if line_number is not None:
+            elem_line = self._line_number(elem)
+            if isinstance(line_number, range):
+                if elem_line not in line_number:
+                    return False
+            elif elem_line != line_number:
+                return False
+        if attrs is not None:
+            if not all(
+                self._get_attribute(elem, attr_name) == attr_value
+                for attr_name, attr_value in attrs.items()
+            ):
+                return False
+        if contains is not None:
+            if contains not in self._get_element_text(elem):
+                return False
+        return True
+
+    def _line_number(self, elem):
+        """Return the line an element's start tag begins on in the original file,
+        or None for inserted elements."""
+        return self._start_lines.get(elem, elem.sourceline)
+
+    def _is_attached(self, elem):
+        """Return True if an element is still part of the document."""
+        for elem in elem.iterancestors():
+            pass
+        return elem is self.tree.getroot()
+
+    def _get_element_text(self, elem):
+        """
+        Return the text content of an element, as XMLEditor._get_element_text() does.
+
+        Skips text that contains only whitespace, which typically represents XML
+        formatting rather than document content.
+        """
+        return "".join(text for text in elem.itertext() if text.strip())
+
+    def replace_node(self, elem, new_content):
+        """
+        Replace an element with new XML content.
+
+        Args:
+            elem: lxml.etree._Element to replace
+            new_content: String containing XML to replace the node with
+
+        Returns:
+            List[lxml.etree._Element]: All inserted nodes
+        """
+        text, nodes = self._parse_fragment(new_content)
+        for node in nodes:
+            elem.addprevious(node)
+        _add_text_before(nodes[0], text)
+        _remove_element(elem)
+        self._mark_changed(nodes)
+        return nodes
+
+    def insert_after(self, elem, xml_content):
+        """
+        Insert XML content after an element.
+
+        Args:
+            elem: lxml.etree._Element to insert after
+            xml_content: String containing XML to insert
+
+        Returns:
+            List[lxml.etree._Element]: All inserted nodes
+        """
+        text, nodes = self._parse_fragment(xml_content)
+        # The text after elem goes after the inserted nodes, as with minidom
+        tail, elem.tail = elem.tail, None
+        previous = elem
+        for node in nodes:
+            previous.addnext(node)
+            previous = node
+        previous.tail = (previous.tail or "") + (tail or "") or None
+        _add_text_before(nodes[0], text)
+        self._mark_changed(nodes)
+        return nodes
+
+    def insert_before(self, elem, xml_content):
+        """
+        Insert XML content before an element.
+
+        Args:
+            elem: lxml.etree._Element to insert before
+            xml_content: String containing XML to insert
+
+        Returns:
+            List[lxml.etree._Element]: All inserted nodes
+        """
+        text, nodes = self._parse_fragment(xml_content)
+        for node in nodes:
+            elem.addprevious(node)
+        _add_text_before(nodes[0], text)
+        self._mark_changed(nodes)
+        return nodes
+
+    def append_to(self, elem, xml_content):
+        """
+        Append XML content as a child of an element.
+
+        Args:
+            elem: lxml.etree._Element to append to
+            xml_content: String containing XML to append
+
+        Returns:
+            List[lxml.etree._Element]: All inserted nodes
+        """
+        text, nodes = self._parse_fragment(xml_content)
+        for node in nodes:
+            elem.append(node)
+        _add_text_before(nodes[0], text)
+        self._mark_changed(nodes)
+        return nodes
+
+    def get_next_rid(self):
+        """Get the next available rId for relationships files."""
+        max_id = max(self._max_id(("Relationship",), "Id", "rId"), 0)
+        return f"rId{max_id + 1}"
+
+    def _max_id(self, tags, attr_name, prefix=""):
+        """Return the highest number N of the elements with one of the tags whose
+        attribute is "<prefix>N", or -1 if there is none.
+
+        As XMLEditor._max_id(), the elements are only scanned on the first call.
+        """
+        key = (tuple(tags), attr_name, prefix)
+        if key not in self._id_maxima:
+            self._id_maxima[key] = max(
+                (
+                    _id_number(self._get_attribute(elem, attr_name), prefix)
+                    for tag in tags
+                    for elem in self._iter_tag(tag)
+                ),
+                default=-1,
+            )
+        return self._id_maxima[key]
+
+    def _allocate_id(self, tags, attr_name, prefix=""):
+        """Return the next unused number for _max_id(), and mark it as used."""
+        number = self._max_id(tags, attr_name, prefix) + 1
+        self._id_maxima[(tuple(tags), attr_name, prefix)] = number
+        return number
+
+    def _mark_changed(self, nodes):
+        """Record nodes inserted into the tree, or whose subtree was changed.
+
+        Lookups search the tree itself, so only the highest IDs of _max_id()
+        need updating.
+        """
+        for (tags, attr_name, prefix), highest in self._id_maxima.items():
+            names = [name for name in map(self._qualify, tags) if name]
+            for node in nodes:
+                if not isinstance(node.tag, str) or not names:
+                    continue
+                for elem in node.iter(*names):
+                    number = _id_number(self._get_attribute(elem, attr_name), prefix)
+                    highest = max(highest, number)
+            self._id_maxima[(tags, attr_name, prefix)] = highest
+
+    def save(self):
+        """
+        Save the edited XML back to the file.
+
+        Serializes the tree and writes it back to the original file path,
+        preserving the original encoding (ascii or utf-8).
+        """
+        declaration = f'<?xml version="1.0" encoding="{self.encoding}"'
+        if self.tree.docinfo.standalone:
+            declaration += ' standalone="yes"'
+        content = lxml.etree.tostring(self.tree, encoding=self.encoding)
+        self.xml_path.write_bytes(f"{declaration}?>".encode() + content)
+
+    def _parse_fragment(self, xml_content):
+        """
+        Parse XML fragment with the namespaces declared on the root element.
+
+        Args:
+            xml_content: String containing XML fragment
+
+        Returns:
+            Tuple of the text before the first node, and the list of nodes; the text
+            after each node is its tail
+
+        Raises:
+            AssertionError: If fragment contains no element nodes
+        """
+        namespaces = [
+            (
+                f'xmlns:{prefix}="{html.escape(uri)}"'
+                if prefix
+                else f'xmlns="{html.escape(uri)}"'
+            )
+            for prefix, uri in self.tree.getroot().nsmap.items()
+        ]
+        wrapper = f"<root {' '.join(namespaces)}>{xml_content}</root>"
+        fragment = lxml.etree.fromstring(wrapper, self._parser)
+        nodes = list(fragment)
+        elements = [n for n in nodes if isinstance(n.tag, str)]
+        assert elements, "Fragment must contain at least one element"
+        for node in nodes:
+            for descendant in node.iter():
+                # Line numbers refer to the original file only (0 unsets them)
+                descendant.sourceline = 0
+        return fragment.text or "", nodes
+
+
+def _id_number(value, prefix):
+    """Return N for an ID "<prefix>N", or -1 for other values."""
+    if value.startswith(prefix):
+        try:
+            return int(value[len(prefix) :])
+        except ValueError:
+            pass
+    return -1
+
+
+def _node_not_found(tag, attrs, line_number, contains):
+    """Return the ValueError raised by get_node() when nothing matches."""
+    # Build descriptive error message
+    filters = []
+    if line_number is not None:
+        line_str = (
+            f"lines {line_number.start}-{line_number.stop - 1}"
+            if isinstance(line_number, range)
+            else f"line {line_number}"
+        )
+        filters.append(f"at {line_str}")
+    if attrs is not None:
+        filters.append(f"with attributes {attrs}")
+    if contains is not None:
+        filters.append(f"containing '{contains}'")
+
+    filter_desc = " ".join(filters) if filters else ""
+    base_msg = f"Node not found: <{tag}> {filter_desc}".strip()
+
+    # Add helpful hint based on filters used
+    if contains:
+        hint = "Text may be split across elements or use different wording."
+    elif line_number:
+        hint = "Line numbers may have changed if document was modified."
+    elif attrs:
+        hint = "Verify attribute values are correct."
+    else:
+        hint = "Try adding filters (attrs, line_number, or contains)."
+
+    return ValueError(f"{base_msg}. {hint}")
+
+
+def _multiple_nodes_found(tag):
+    """Return the ValueError raised by get_node() when several nodes match."""
+    return ValueError(
+        f"Multiple nodes found: <{tag}>. "
+        f"Add more filters (attrs, line_number, or contains) to narrow the search."
+    )
+
+
+def _find_all_text(elements, texts, patterns):
+    """Search the texts of elements for find_all_text()."""
+    patterns = list(patterns)
+    literals = {
+        i: html.unescape(pattern)
+        for i, pattern in enumerate(patterns)
+        if isinstance(pattern, str) and pattern
+    }
+    regexes = {
+        i: pattern
+        for i, pattern in enumerate(patterns)
+        if isinstance(pattern, re.Pattern)
+    }
+
+    # (element index, start, pattern index, end) of each match
+    found = []
+    if literals:
+        # Element texts joined by a character no pattern can contain, as
+        # XML text never does
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        automaton = _AhoCorasick(literals)
+        for end, i in automaton.search("\0".join(texts)):
+            start = end - len(literals[i])
+            index = bisect.bisect_right(starts, start) - 1
+            found.append((index, start - starts[index], i, end - starts[index]))
+    for i, regex in regexes.items():
+        for index, text in enumerate(texts):
+            for match in regex.finditer(text):
+                if match.end() > match.start():
+                    found.append((index, match.start(), i, match.end()))
+
+    found.sort()
+    return [
+        TextMatch(
+            element=elements[index],
+            start=start,
+            end=end,
+            pattern=patterns[i],
+            text=texts[index][start:end],
+        )
+        for index, start, i, end in found
+    ]
+
+
+class _AhoCorasick:
+    """Automaton matching many literal strings in one pass over a text."""
+
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns: {key: non-empty string} of the strings to find
+        """
+        # Trie of the patterns: transitions, failure links, and the keys of
+        # the patterns ending at each state (including through failure links)
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+        for key, pattern in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                    self.goto[state][char] = next_state
+                state = next_state
+            self.out[state] += (key,)
+
+        # Breadth first, so that failure links point to states already done
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                if state:
+                    self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.out[next_state] += self.out[self.fail[next_state]]
+
+    def search(self, text):
+        """Yield (end offset, key) for every occurrence of a pattern in text."""
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                for key in out[state]:
+                    yield position + 1, key
+
+
 def _create_line_tracking_parser():
     """
     Create a SAX parser that tracks line and column numbers for each element.
@@ -372,3 +1169,83 @@ def _create_line_tracking_parser():
     orig_set_content_handler = parser.setContentHandler
     parser.setContentHandler = set_content_handler  # type: ignore
     return parser
+
+
+class _LxmlElement(lxml.etree.ElementBase):
+    """lxml element with the minidom names that code using XMLEditor relies on."""
+
+    @property
+    def tagName(self):
+        """The prefixed tag name, e.g. "w:p"."""
+        local = lxml.etree.QName(self).localname
+        return f"{self.prefix}:{local}" if self.prefix else local
+
+    @property
+    def parentNode(self):
+        return self.getparent()
+
+
+def _create_lxml_parser():
+    """
+    Create an lxml parser for LxmlXMLEditor that is safe for untrusted files.
+
+    As with defusedxml, entities are not expanded, and no DTD or other external
+    resource is loaded. Elements are _LxmlElement instances.
+
+    Returns:
+        lxml.etree.XMLParser: Configured parser
+    """
+    parser = lxml.etree.XMLParser(
+        resolve_entities=False, no_network=True, load_dtd=False
+    )
+    parser.set_element_class_lookup(
+        lxml.etree.ElementDefaultClassLookup(element=_LxmlElement)
+    )
+    return parser
+
+
+def _start_tag_lines(data, tree):
+    """
+    Find the lines of elements whose start tag does not begin on the line of
+    their sourceline: start tags spanning lines, and those past MAX_SOURCELINE.
+
+    Args:
+        data: The XML file's bytes
+        tree: lxml.etree.ElementTree parsed from them
+
+    Returns:
+        dict: {element: line its start tag begins on} for those elements
+    """
+    lines = {}
+    elements = tree.iter(lxml.etree.Element)
+    line = 1
+    position = 0
+    for match in _MARKUP.finditer(data):
+        if match.group(1) is None:
+            continue
+        elem = next(elements)
+        line += data.count(b"\n", position, match.start())
+        position = match.start()
+        if line > MAX_SOURCELINE or line != elem.sourceline:
+            lines[elem] = line
+    return lines
+
+
+def _add_text_before(node, text):
+    """Append text to the text just before a node (its previous sibling's tail,
+    or its parent's text)."""
+    if not text:
+        return
+    previous = node.getprevious()
+    if previous is not None:
+        previous.tail = (previous.tail or "") + text
+    else:
+        parent = node.getparent()
+        parent.text = (parent.text or "") + text
+
+
+def _remove_element(elem):
+    """Remove an element from its parent, keeping the text after it."""
+    _add_text_before(elem, elem.tail)
+    elem.tail = None
+    elem.getparent().remove(elem)
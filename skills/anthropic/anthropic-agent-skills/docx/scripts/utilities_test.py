@@ -0,0 +1,291 @@
+import random
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.utilities import LxmlXMLEditor, XMLEditor, _AhoCorasick
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14 = "http://schemas.microsoft.com/office/word/2010/wordml"
+
+# Each paragraph starts on a line of its own: First on line 4, Second on 9
+DOCUMENT_XML = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="{W}" xmlns:w14="{W14}">
+  <w:body>
+    <w:p w14:paraId="00000001">
+      <w:r>
+        <w:t>First paragraph</w:t>
+      </w:r>
+    </w:p>
+    <w:p w14:paraId="00000002">
+      <w:r>
+        <w:t>Second paragraph</w:t>
+      </w:r>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+EDITORS = (XMLEditor, LxmlXMLEditor)
+
+
+def paragraph(para_id, text):
+    return f'<w:p w14:paraId="{para_id}"><w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def remove(elem):
+    """Remove an element from its tree directly, bypassing the editor"""
+    if hasattr(elem, "getparent"):
+        elem.getparent().remove(elem)
+    else:
+        elem.parentNode.removeChild(elem)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# Run from the docx directory: python -m unittest scripts.utilities_test
+class EditorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.xml_path = Path(temp_dir.name) / "document.xml"
+        self.xml_path.write_text(DOCUMENT_XML, encoding="utf-8")
+
+    def assert_not_found(self, editor, **kwargs):
+        with self.assertRaisesRegex(ValueError, "Node not found"):
+            editor.get_node(tag="w:p", **kwargs)
+
+
+class TestGetNodeIndex(EditorTestCase):
+
+    def test_lookup_after_insert(self):
+        """Test that inserted nodes are found and original line numbers still work"""
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                editor = editor_class(self.xml_path)
+                # Index everything before the edit
+                second = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000002"})
+                editor.insert_before(second, paragraph("00000003", "Inserted"))
+                inserted = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000003"})
+                self.assertIs(editor.get_node(tag="w:p", contains="Inserted"), inserted)
+                self.assertIs(editor.get_node(tag="w:p", line_number=9), second)
+                self.assertIs(
+                    editor.get_node(tag="w:p", line_number=range(5, 12)), second
+                )
+
+    def test_line_of_multiline_start_tag(self):
+        """Test that an element's line is where its start tag begins, in both backends"""
+        self.xml_path.write_text(
+            DOCUMENT_XML.replace(
+                '<w:p w14:paraId="00000002">',
+                '<w:p\n      w14:paraId="00000002">',
+            ),
+            encoding="utf-8",
+        )
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                editor = editor_class(self.xml_path)
+                second = editor.get_node(tag="w:p", line_number=9)
+                self.assertIs(editor.get_node(tag="w:p", contains="Second"), second)
+                self.assertIs(
+                    editor.get_node(tag="w:r", line_number=11).parentNode, second
+                )
+                self.assert_not_found(editor, line_number=10)
+
+    def test_lookup_after_replace(self):
+        """Test that a replaced node is no longer found, by any filter"""
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                editor = editor_class(self.xml_path)
+                first = editor.get_node(tag="w:p", contains="First")
+                editor.replace_node(first, paragraph("00000001", "Replacement"))
+                self.assert_not_found(editor, contains="First")
+                self.assert_not_found(editor, line_number=4)
+                replacement = editor.get_node(
+                    tag="w:p", attrs={"w14:paraId": "00000001"}
+                )
+                self.assertIs(
+                    editor.get_node(tag="w:p", contains="Replacement"), replacement
+                )
+
+    def test_lookup_after_direct_changes(self):
+        """Test that nodes removed or changed outside the editor are accounted for"""
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                editor = editor_class(self.xml_path)
+                first = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000001"})
+                second = editor.get_node(tag="w:p", contains="Second")
+                remove(first)
+                self.assert_not_found(editor, attrs={"w14:paraId": "00000001"})
+                self.assert_not_found(editor, contains="First")
+
+                # Change the text the index has cached
+                text = editor.get_node(tag="w:t", contains="Second")
+                if hasattr(text, "getparent"):
+                    text.text = "Changed"
+                else:
+                    text.firstChild.data = "Changed"
+                self.assert_not_found(editor, contains="Second")
+                self.assertIs(editor.get_node(tag="w:p", contains="Changed"), second)
+
+    def test_lookup_of_nodes_added_directly(self):
+        """Test that nodes added to the DOM outside the editor are found"""
+        editor = XMLEditor(self.xml_path)
+        first = editor.get_node(tag="w:p", contains="First")
+        added = editor.dom.createElement("w:p")
+        added.setAttribute("w14:paraId", "00000004")
+        first.parentNode.appendChild(added)
+        self.assertIs(
+            editor.get_node(tag="w:p", attrs={"w14:paraId": "00000004"}), added
+        )
+
+    def test_multiple_matches(self):
+        """Test that an ambiguous lookup fails, also once a match is inserted"""
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                editor = editor_class(self.xml_path)
+                first = editor.get_node(tag="w:p", contains="First")
+                with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+                    editor.get_node(tag="w:p", contains="paragraph")
+                editor.insert_after(first, paragraph("00000001", "Copy"))
+                with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+                    editor.get_node(tag="w:p", attrs={"w14:paraId": "00000001"})
+
+
+class TestFindAllText(EditorTestCase):
+
+    def matches(self, editor, patterns, tag="w:p"):
+        """Return (element text, start, end, pattern, text) per match"""
+        return [
+            (editor._get_element_text(m.element), m.start, m.end, m.pattern, m.text)
+            for m in editor.find_all_text(patterns, tag)
+        ]
+
+    def test_overlapping_patterns(self):
+        """Test that overlapping and nested matches are all reported in order"""
+        patterns = ["paragraph", "rst par", "graph", "a", "First paragraph"]
+        first = "First paragraph"
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                editor = editor_class(self.xml_path)
+                self.assertEqual(
+                    [m for m in self.matches(editor, patterns) if m[0] == first],
+                    [
+                        (first, 0, 15, "First paragraph", "First paragraph"),
+                        (first, 2, 9, "rst par", "rst par"),
+                        (first, 6, 15, "paragraph", "paragraph"),
+                        (first, 7, 8, "a", "a"),
+                        (first, 9, 10, "a", "a"),
+                        (first, 10, 15, "graph", "graph"),
+                        (first, 12, 13, "a", "a"),
+                    ],
+                )
+
+    def test_patterns_across_runs_and_elements(self):
+        """Test that a paragraph's runs are searched as one text, but paragraphs
+        are not"""
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                editor = editor_class(self.xml_path)
+                second = editor.get_node(tag="w:p", contains="Second")
+                editor.append_to(second, "<w:r><w:t> continued</w:t></w:r>")
+                text = "Second paragraph continued"
+                patterns = ["paragraph continued", "paragraphSecond", "graph co"]
+                self.assertEqual(
+                    self.matches(editor, patterns),
+                    [
+                        (text, 7, 26, "paragraph continued", "paragraph continued"),
+                        (text, 11, 19, "graph co", "graph co"),
+                    ],
+                )
+                # Within a single run, the pattern spanning runs is not found
+                self.assertEqual(
+                    self.matches(editor, ["paragraph continued"], "w:r"), []
+                )
+
+    def test_regular_expressions_and_entities(self):
+        """Test regular expressions next to literals in entity notation"""
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                editor = editor_class(self.xml_path)
+                first = editor.get_node(tag="w:p", contains="First")
+                editor.insert_after(first, paragraph("00000003", "\u201cQuoted\u201d"))
+                regex = re.compile(r"\w+ paragraph")
+                self.assertEqual(
+                    [
+                        (m.start, m.pattern, m.text)
+                        for m in editor.find_all_text([regex, "&#8220;Quoted"])
+                    ],
+                    [
+                        (0, regex, "First paragraph"),
+                        (0, "&#8220;Quoted", "\u201cQuoted"),
+                        (0, regex, "Second paragraph"),
+                    ],
+                )
+
+    def test_text_updated_after_edits(self):
+        """Test that cached texts follow insertions and replacements"""
+        for editor_class in EDITORS:
+            with self.subTest(editor=editor_class.__name__):
+                editor = editor_class(self.xml_path)
+                self.assertEqual(len(editor.find_all_text(["paragraph"])), 2)
+                first = editor.get_node(tag="w:p", contains="First")
+                editor.replace_node(first, paragraph("00000001", "Replaced"))
+                self.assertEqual(
+                    [m.text for m in editor.find_all_text(["paragraph", "Replaced"])],
+                    ["Replaced", "paragraph"],
+                )
+
+
+class TestAhoCorasick(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        """Test the automaton against str.find() on random texts and patterns"""
+        rng = random.Random(0)
+        for _ in range(200):
+            patterns = {
+                i: "".join(rng.choice("ab") for _ in range(rng.randint(1, 4)))
+                for i in range(rng.randint(1, 6))
+            }
+            text = "".join(rng.choice("ab\0") for _ in range(rng.randint(0, 30)))
+            expected = sorted(
+                (start + len(pattern), key)
+                for key, pattern in patterns.items()
+                for start in range(len(text))
+                if text.startswith(pattern, start)
+            )
+            with self.subTest(patterns=patterns, text=text):
+                self.assertEqual(sorted(_AhoCorasick(patterns).search(text)), expected)
+
+
+class TestRelationshipIds(unittest.TestCase):
+
+    RELS_XML = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">\n'
+        '  <Relationship Id="rId1" Type="styles" Target="styles.xml"/>\n'
+        '  <Relationship Id="rId3" Type="settings" Target="settings.xml"/>\n'
+        "</Relationships>\n"
+    )
+
+    def test_next_rid(self):
+        """Test that rIds continue above existing, inserted and removed ones"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_path = Path(temp_dir) / "document.xml.rels"
+            xml_path.write_text(self.RELS_XML, encoding="utf-8")
+            for editor_class in EDITORS:
+                with self.subTest(editor=editor_class.__name__):
+                    editor = editor_class(xml_path)
+                    self.assertEqual(editor.get_next_rid(), "rId4")
+                    last = editor.get_node(tag="Relationship", attrs={"Id": "rId3"})
+                    (added,) = editor.insert_after(
+                        last, '<Relationship Id="rId9" Type="t" Target="t.xml"/>'
+                    )
+                    self.assertEqual(editor.get_next_rid(), "rId10")
+                    remove(added)
+                    self.assertEqual(editor.get_next_rid(), "rId10")
+
+
+if __name__ == "__main__":
+    unittest.main()
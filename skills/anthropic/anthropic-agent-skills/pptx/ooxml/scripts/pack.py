@@ -3,29 +3,155 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--original <office_file>]
+        [--level N] [--deflate-media] [--jobs N] [--reencode]
+
+Parts still holding the bytes unpack.py wrote for them are copied from the
+original archive as they are, without being condensed and compressed again.
+The original is the file the directory was unpacked from, or --original.
+
+Other parts are encoded by the compression policy: media that is already
+compressed (images, audio, video, embedded packages) is stored, and the rest
+is deflated at --level, in chunks. --jobs condenses and compresses XML parts
+in parallel threads; they are still written in order. --reencode applies the
+policy to every part.
 """
 
 import argparse
+import contextlib
+import json
+import os
+import secrets
 import shutil
+import struct
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
+import lxml.etree
+
+# Parts condensed on the way into the archive; everything else is copied as is
+XML_SUFFIXES = (".xml", ".rels")
+
+# Parts whose format is already compressed, so deflating them again costs CPU
+# time for next to no gain in size
+STORED_EXTENSIONS = frozenset(
+    {
+        # Images
+        ".jpeg",
+        ".jpg",
+        ".png",
+        ".gif",
+        ".wdp",
+        ".jxr",
+        ".emz",
+        ".wmz",
+        # Audio and video
+        ".mp3",
+        ".m4a",
+        ".wma",
+        ".mp4",
+        ".m4v",
+        ".mov",
+        ".wmv",
+        ".webm",
+        # Embedded packages and archives
+        ".docx",
+        ".xlsx",
+        ".pptx",
+        ".zip",
+    }
+)
+
+# Bytes read at a time when copying parts
+CHUNK_SIZE = 1 << 20
+
+# unpack.py records the files it wrote in <unpacked_dir>.unpack.json
+UNPACK_RECORD_SUFFIX = ".unpack.json"
+
+# zipfile internals _write_compressed() relies on. Without them, unchanged
+# parts are decompressed and compressed again through the public API
+_ZIPFILE_INTERNALS = ("_lock", "_seekable", "_writecheck", "_didModify", "start_dir")
+_ZIP_HEADER_CONSTANTS = ("structFileHeader", "sizeFileHeader", "stringFileHeader")
+
+# Entities are not expanded and nothing is fetched from the network
+_CONDENSE_PARSER = lxml.etree.XMLParser(resolve_entities=False, no_network=True)
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """How pack_document() compresses the parts it encodes."""
+
+    # Deflate level, 0-9 (None: zlib's default, 6)
+    compresslevel: int = None
+    # Store STORED_EXTENSIONS parts instead of deflating them
+    store_media: bool = True
+    # Threads condensing and deflating XML parts ahead of the writer (0 = one
+    # per CPU)
+    jobs: int = 1
+
+    def compress_type(self, part_name):
+        """Return the zipfile compression method for a part."""
+        if self.store_media and Path(part_name).suffix.lower() in STORED_EXTENSIONS:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--original",
+        help="Office file to copy unchanged parts from "
+        "(default: the file the directory was unpacked from)",
+    )
+    parser.add_argument(
+        "--level",
+        type=int,
+        choices=range(10),
+        metavar="N",
+        help="Deflate level from 0 (fastest) to 9 (smallest), default 6",
+    )
+    parser.add_argument(
+        "--deflate-media",
+        action="store_true",
+        help="Deflate already-compressed media instead of storing it",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Compress XML parts in N threads (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--reencode",
+        action="store_true",
+        help="Encode every part instead of copying unchanged ones from the original",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            original=args.original,
+            compression=CompressionPolicy(
+                compresslevel=args.level,
+                store_media=not args.deflate_media,
+                jobs=args.jobs,
+            ),
+            reencode=args.reencode,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +168,34 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(
+    input_dir,
+    output_file,
+    validate=False,
+    original=None,
+    compression=None,
+    reencode=False,
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    Parts that are unchanged since unpack.py wrote them, or that hold the same
+    bytes as in the original (e.g. media), are copied from the original
+    archive still compressed. Only the other parts are condensed and
+    compressed, so repacking takes time in proportion to the edit.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        original: Office file to copy unchanged parts from (default: the one
+            recorded by unpack.py, if it has not changed since)
+        compression: CompressionPolicy for the parts that are encoded
+            (default: CompressionPolicy())
+        reencode: If True, encodes every part, copying none from the original
+
+    Raises:
+        ValueError: If the input is not a directory, the output has an
+            unsupported extension, or an XML part is not well-formed
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,32 +208,359 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    compression = compression or CompressionPolicy()
+    if reencode:
+        original, recorded = None, {}
+    else:
+        original, recorded = _read_unpack_record(input_dir, original)
+
+    # Each part is read once and written straight into the archive, which is
+    # built next to the output file and only moved into place when complete
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = _create_temp_file(output_file)
+    try:
+        with contextlib.ExitStack() as stack:
+            original_zip = original_fp = None
+            if original is not None:
+                original_zip = stack.enter_context(zipfile.ZipFile(original))
+                original_fp = stack.enter_context(open(original, "rb"))
+            zf = stack.enter_context(
+                zipfile.ZipFile(temp_file, "w", zipfile.ZIP_DEFLATED)
+            )
+            raw_writes = _can_write_compressed(zf)
+            jobs = compression.jobs or os.cpu_count() or 1
+            pool = stack.enter_context(ThreadPoolExecutor(jobs))
+
+            # Writes as (function, args) in archive order. XML parts encoded
+            # by the pool wait in line, at most a few per thread
+            pending = deque()
+            for f in input_dir.rglob("*"):
+                if not f.is_file():
+                    continue
+                arcname = f.relative_to(input_dir).as_posix()
+                compress_type = compression.compress_type(arcname)
+                member = _unchanged_member(f, arcname, original_zip, recorded)
+                if member is not None and raw_writes:
+                    # Copy the original's compressed bytes as they are
+                    pending.append((_copy_compressed, (original_fp, member, zf)))
+                elif member is not None:
+                    pending.append((_copy_decompressed, (original_zip, member, zf)))
+                elif not arcname.endswith(XML_SUFFIXES):
+                    # Media and other binary parts are copied in chunks, so
+                    # memory use does not grow with their size
+                    pending.append(
+                        (
+                            zf.write,
+                            (f, arcname, compress_type, compression.compresslevel),
+                        )
+                    )
+                elif raw_writes:
+                    encoded = pool.submit(
+                        _encode_part, f, arcname, compress_type, compression
+                    )
+                    pending.append((_write_encoded, (zf, encoded)))
+                else:
+                    # Only condensed in the pool; zipfile compresses it
+                    encoded = pool.submit(
+                        _encode_part, f, arcname, zipfile.ZIP_STORED, compression
+                    )
+                    write_args = (zf, encoded, compress_type, compression.compresslevel)
+                    pending.append((_write_condensed, write_args))
+
+                while len(pending) > 2 * jobs:
+                    write, args = pending.popleft()
+                    write(*args)
+            while pending:
+                write, args = pending.popleft()
+                write(*args)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        os.unlink(temp_file)
+        raise
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
+def unpack_record_path(unpacked_dir):
+    """Return the path of the record unpack.py keeps for an unpacked directory."""
+    return Path(f"{unpacked_dir}{UNPACK_RECORD_SUFFIX}")
+
+
+def write_unpack_record(unpacked_dir, original_file, crcs):
+    """Record the files unpack.py wrote, so that pack_document() can tell
+    which of them are still unchanged.
+
+    Args:
+        unpacked_dir: Directory the Office file was unpacked to
+        original_file: The Office file that was unpacked
+        crcs: {part name: CRC-32 of the bytes written for the part}
+    """
+    unpacked_dir = Path(unpacked_dir)
+    original_file = Path(original_file).resolve()
+    stat = original_file.stat()
+    parts = {}
+    for part_name, crc in crcs.items():
+        try:
+            part_stat = (unpacked_dir / part_name).stat()
+        except OSError:
+            continue  # Not extracted under its own name
+        parts[part_name] = [part_stat.st_size, part_stat.st_mtime_ns, crc]
+
+    record = {
+        "original": [str(original_file), stat.st_size, stat.st_mtime_ns],
+        "parts": parts,
+    }
+    with open(unpack_record_path(unpacked_dir), "w", encoding="utf-8") as f:
+        json.dump(record, f)
+
+
+def unchanged_original(unpacked_dir):
+    """Return the Office file a directory was unpacked from, if the directory
+    still holds exactly the files unpack.py wrote for all of its parts.
+
+    The file is then what packing the directory would make of it, e.g. a
+    baseline to validate edits against, without packing anything. Only file
+    sizes and modification times are compared. Returns None otherwise.
+    """
+    unpacked_dir = Path(unpacked_dir)
+    original, recorded = _read_unpack_record(unpacked_dir)
+    if not recorded:
+        return None
+
+    files = {
+        f.relative_to(unpacked_dir).as_posix(): f
+        for f in unpacked_dir.rglob("*")
+        if f.is_file()
+    }
+    if files.keys() != recorded.keys():
+        return None  # Files added or removed
+    for part_name, (size, mtime_ns, _) in recorded.items():
+        stat = files[part_name].stat()
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            return None
+
+    # A directory unpacked with --only lacks the other parts
+    with zipfile.ZipFile(original) as zf:
+        members = {name for name in zf.namelist() if not name.endswith("/")}
+    return original if members == recorded.keys() else None
+
+
+def _read_unpack_record(unpacked_dir, original=None):
+    """Return the original to copy unchanged parts from, and the parts recorded
+    by unpack.py as (size, mtime_ns, CRC-32) by part name.
+
+    The record is used only if the original it names has not changed since
+    (and is the one given, if any). Without a usable record, no parts are
+    known and the original (possibly None) is returned as given.
+    """
+    original = Path(original).resolve() if original else None
+    try:
+        with open(unpack_record_path(unpacked_dir), encoding="utf-8") as f:
+            record = json.load(f)
+        path, size, mtime_ns = record["original"]
+        stat = os.stat(path)
+    except (OSError, ValueError, KeyError):
+        return original, {}
+
+    if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns) or original not in (
+        None,
+        Path(path),
+    ):
+        return original, {}
+    return Path(path), record["parts"]
+
+
+def _unchanged_member(path, part_name, original_zip, recorded):
+    """Return the original's ZipInfo for a part whose file is unchanged, or None.
+
+    A file is unchanged if it still holds the bytes unpack.py wrote for the
+    part (by its size and modification time, or else its CRC-32), or, for
+    parts unpack.py did not record, the bytes of the original part.
+    """
+    if original_zip is None:
+        return None
+    try:
+        member = original_zip.getinfo(part_name)
+    except KeyError:
+        return None
+    if member.flag_bits & 0x1 or max(member.file_size, member.compress_size) >= (
+        zipfile.ZIP64_LIMIT
+    ):
+        return None  # Encrypted or Zip64 members are re-encoded
+
+    stat = path.stat()
+    if part_name in recorded:
+        size, mtime_ns, crc = recorded[part_name]
+        if (stat.st_size, stat.st_mtime_ns) == (size, mtime_ns):
+            return member
+    else:
+        size, crc = member.file_size, member.CRC
+    if stat.st_size != size:
+        return None
+
+    file_crc = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            file_crc = zlib.crc32(chunk, file_crc)
+    return member if file_crc == crc else None
+
+
+def _encode_part(path, arcname, compress_type, compression):
+    """Read an XML part, condense it, and compress it (unless compress_type
+    is ZIP_STORED).
+
+    Returns:
+        tuple: (ZipInfo with CRC and sizes set, compressed bytes)
+    """
+    # Remove pretty-printing whitespace
+    try:
+        data = condense_xml(path.read_bytes())
+    except lxml.etree.XMLSyntaxError as e:
+        raise ValueError(f"{arcname}: {e}") from e
+
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    zinfo.compress_type = compress_type
+    zinfo.CRC = zlib.crc32(data)
+    zinfo.file_size = len(data)
+    if compress_type == zipfile.ZIP_DEFLATED:
+        level = (
+            zlib.Z_DEFAULT_COMPRESSION
+            if compression.compresslevel is None
+            else compression.compresslevel
+        )
+        # Raw deflate stream, as zipfile writes it
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        data = compressor.compress(data) + compressor.flush()
+    zinfo.compress_size = len(data)
+    return zinfo, data
+
+
+def _write_encoded(zf, encoded):
+    """Write a part once _encode_part() has finished with it."""
+    _write_compressed(zf, *encoded.result())
+
+
+def _write_condensed(zf, encoded, compress_type, compresslevel):
+    """Compress and write a part once _encode_part() has condensed it.
+
+    The fallback for _write_encoded() when zipfile lacks the internals that
+    _write_compressed() needs.
+    """
+    zinfo, data = encoded.result()
+    zf.writestr(zinfo, data, compress_type, compresslevel)
+
+
+def _copy_compressed(original_fp, member, zf):
+    """Append a member of the original archive to zf without recompressing it.
+
+    Needs _can_write_compressed(zf).
+    """
+    original_fp.seek(member.header_offset)
+    header = struct.unpack(
+        zipfile.structFileHeader, original_fp.read(zipfile.sizeFileHeader)
+    )
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local header for {member.filename}")
+    # Skip the file name and extra field that follow the fixed-size header
+    original_fp.seek(header[10] + header[11], os.SEEK_CUR)
+
+    def chunks():
+        remaining = member.compress_size
+        while remaining:
+            chunk = original_fp.read(min(remaining, CHUNK_SIZE))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated data for {member.filename}")
+            yield chunk
+            remaining -= len(chunk)
+
+    zinfo = _member_info(member)
+    zinfo.CRC = member.CRC
+    zinfo.compress_size = member.compress_size
+    _write_compressed(zf, zinfo, chunks())
+
+
+def _copy_decompressed(original_zip, member, zf):
+    """Append a member of the original archive to zf by decompressing it and
+    compressing it again, in chunks.
+
+    The fallback for _copy_compressed() when zipfile lacks the internals it
+    needs.
+    """
+    zinfo = _member_info(member)
+    with original_zip.open(member) as src, zf.open(zinfo, "w") as dst:
+        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+
+def _member_info(member):
+    """Return a new ZipInfo for writing a copy of an original member."""
+    zinfo = zipfile.ZipInfo(member.filename, member.date_time)
+    zinfo.compress_type = member.compress_type
+    zinfo.file_size = member.file_size
+    zinfo.external_attr = member.external_attr
+    return zinfo
+
+
+def _create_temp_file(output_file):
+    """Create an empty file next to output_file to build the archive in.
+
+    Unlike tempfile.mkstemp(), the file gets the mode new files normally get
+    (0o666 less the umask), without changing the process-wide umask.
+
+    Returns:
+        Path: The file created
+    """
+    while True:
+        path = output_file.with_name(f".{output_file.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+        except FileExistsError:
+            continue
+        return path
+
+
+def _can_write_compressed(zf):
+    """Return True if _write_compressed() can append entries to zf."""
+    return (
+        all(hasattr(zf, name) for name in _ZIPFILE_INTERNALS)
+        and all(hasattr(zipfile, name) for name in _ZIP_HEADER_CONSTANTS)
+        and hasattr(zipfile.ZipInfo, "FileHeader")
+    )
+
+
+def _write_compressed(zf, zinfo, data):
+    """Append an entry whose data is already compressed to zf.
+
+    zipfile has no public API for this, so the entry is written the way
+    ZipFile.mkdir() writes its own. Check _can_write_compressed(zf) first.
+
+    Args:
+        zf: ZipFile open for writing
+        zinfo: ZipInfo of the entry, with its CRC and sizes set
+        data: The compressed bytes, or an iterable of chunks of them
+    """
+    if isinstance(data, bytes):
+        data = [data]
+    with zf._lock:
+        if zf._seekable:
+            zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zip64 = max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+        zf.fp.write(zinfo.FileHeader(zip64))
+        for chunk in data:
+            zf.fp.write(chunk)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf.start_dir = zf.fp.tell()
+
+
 def validate_document(doc_path):
     """Validate document by converting to HTML with soffice."""
     # Determine the correct filter based on file extension
@@ -130,29 +604,51 @@ def validate_document(doc_path):
             return False
 
 
-def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+def condense_xml(data):
+    """Strip unnecessary whitespace and remove comments.
+
+    Args:
+        data: Content of an XML part
+
+    Returns:
+        bytes: The condensed part, encoded as UTF-8
+    """
+    tree = lxml.etree.fromstring(data, _CONDENSE_PARSER).getroottree()
 
     # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
+    comments = []
+    for element in tree.getroot().iter(lxml.etree.Element):
         # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
+        if element.prefix and lxml.etree.QName(element).localname == "t":
             continue
 
         # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+        if element.text and element.text.strip() == "":
+            element.text = None
+        for child in element:
+            if child.tail and child.tail.strip() == "":
+                child.tail = None
+            if child.tag is lxml.etree.Comment:
+                comments.append(child)
+
+    for comment in comments:
+        # Keep the text that follows the comment
+        if comment.tail:
+            previous = comment.getprevious()
+            if previous is not None:
+                previous.tail = (previous.tail or "") + comment.tail
+            else:
+                parent = comment.getparent()
+                parent.text = (parent.text or "") + comment.tail
+        comment.getparent().remove(comment)
+
+    # Keep standalone="yes" (lxml cannot tell an absent declaration from "no")
+    declaration = '<?xml version="1.0" encoding="UTF-8"{}?>'.format(
+        ' standalone="yes"' if tree.docinfo.standalone else ""
+    )
+    return declaration.encode() + lxml.etree.tostring(
+        tree, encoding="UTF-8", xml_declaration=False
+    )
 
 
 if __name__ == "__main__":
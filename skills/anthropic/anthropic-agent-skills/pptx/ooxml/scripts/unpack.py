@@ -1,29 +1,318 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Usage:
+    python unpack.py <office_file> <output_dir> [--only GLOB]... [--jobs N]
+        [--cache] [--cache-dir DIR] [--cache-size MB] [--link]
+
+XML parts are pretty-printed exactly as minidom's toprettyxml(indent="  ",
+encoding="ascii") would print them, by a faster lxml-based indenter. Parts
+are extracted and formatted in a process pool when there is enough XML to
+make that worthwhile.
+
+--only unpacks just the parts whose names match a glob (e.g. "ppt/slides/*";
+"*" also matches "/"). A directory unpacked that way is not a complete
+document and cannot be packed back into one.
+
+With --cache, unpacked trees are kept in a cache keyed by the archive's
+content (see unpack_cache.py), so unpacking the same file again only clones
+the cached tree. The cache is in $OOXML_UNPACK_CACHE, or else ooxml-unpack in
+$XDG_CACHE_HOME (default ~/.cache), and holds up to 1 GB by default.
+"""
+
+import argparse
+import fnmatch
+import io
+import os
 import random
-import sys
-import defusedxml.minidom
 import zipfile
-from pathlib import Path
-
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import defusedxml.minidom
+import lxml.etree
+
+from pack import write_unpack_record
+from unpack_cache import DEFAULT_MAX_BYTES, UnpackCache
+
+# Parts pretty-printed after extraction
+XML_SUFFIXES = (".xml", ".rels")
+
+# Below this much XML, starting worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 4 << 20
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+
+def pretty_xml(data):
+    """Return an XML part pretty-printed like minidom's toprettyxml().
+
+    The output is byte-identical to
+    defusedxml.minidom.parseString(data).toprettyxml(indent="  ", encoding="ascii").
+    Parts the indenter does not handle the same way (DTDs, CDATA sections,
+    namespaces bound to several prefixes in scope or prefixes rebound to
+    another namespace) are formatted by minidom itself.
+    """
+    if b"<!DOCTYPE" in data or b"<![CDATA[" in data:
+        return _minidom_pretty_xml(data)
+    try:
+        return _IndentWriter(data).write()
+    except (lxml.etree.XMLSyntaxError, _AmbiguousPrefix):
+        return _minidom_pretty_xml(data)
+
+
+def _minidom_pretty_xml(data):
+    dom = defusedxml.minidom.parseString(data.decode("utf-8"))
+    return dom.toprettyxml(indent="  ", encoding="ascii")
+
+
+class _AmbiguousPrefix(Exception):
+    """The prefix of a namespaced attribute cannot be told from its namespace."""
+
+
+class _IndentWriter:
+    """Writes a parsed part the way minidom's writexml() methods do."""
+
+    def __init__(self, data):
+        # Namespace declarations of each element in document order, which
+        # minidom writes before the element's other attributes
+        self._declarations = {}
+        pending = []
+        context = lxml.etree.iterparse(
+            io.BytesIO(data),
+            events=("start-ns", "start"),
+            resolve_entities=False,
+            no_network=True,
+        )
+        for event, value in context:
+            if event == "start-ns":
+                pending.append(value)
+            elif pending:
+                self._declarations[value] = pending
+                pending = []
+        self._root = context.root
+        self._out = []
+
+    def write(self):
+        out = self._out
+        out.append('<?xml version="1.0" encoding="ascii"?>\n')
+        for node in reversed(list(self._root.itersiblings(preceding=True))):
+            self._write_node(node, "", None)
+        self._write_node(self._root, "", {XML_NAMESPACE: "xml"})
+        for node in self._root.itersiblings():
+            self._write_node(node, "", None)
+        return "".join(out).encode("ascii", "xmlcharrefreplace")
+
+    def _write_node(self, node, indent, prefixes):
+        if node.tag is lxml.etree.Comment:
+            self._out.append(f"{indent}<!--{node.text or ''}-->\n")
+        elif node.tag is lxml.etree.PI:
+            self._out.append(f"{indent}<?{node.target} {node.text or ''}?>\n")
+        else:
+            self._write_element(node, indent, prefixes)
+
+    def _write_element(self, elem, indent, prefixes):
+        out = self._out
+        declarations = self._declarations.get(elem, ())
+        if declarations:
+            prefixes = dict(prefixes)
+            for prefix, uri in declarations:
+                if not prefix or prefixes.get(uri) == prefix:
+                    continue  # Attributes are never in the default namespace
+                if uri in prefixes or prefix in prefixes.values():
+                    raise _AmbiguousPrefix(uri)
+                prefixes[uri] = prefix
+
+        name = elem.tag.split("}", 1)[1] if elem.tag[0] == "{" else elem.tag
+        if elem.prefix:
+            name = f"{elem.prefix}:{name}"
+
+        out.append(f"{indent}<{name}")
+        for prefix, uri in declarations:
+            attr = f"xmlns:{prefix}" if prefix else "xmlns"
+            out.append(f' {attr}="{_escape(uri)}"')
+        for key, value in elem.attrib.items():
+            if key[0] == "{":
+                uri, local = key[1:].split("}", 1)
+                key = f"{prefixes[uri]}:{local}"
+            out.append(f' {key}="{_escape(value)}"')
+
+        # Child nodes as minidom sees them: text runs, elements, comments and
+        # processing instructions
+        children = list(elem)
+        if not children:
+            if elem.text:
+                out.append(f">{_escape(elem.text)}</{name}>\n")
+            else:
+                out.append("/>\n")
+            return
+
+        out.append(">\n")
+        child_indent = indent + "  "
+        if elem.text:
+            out.append(_escape(f"{child_indent}{elem.text}\n"))
+        for child in children:
+            self._write_node(child, child_indent, prefixes)
+            if child.tail:
+                out.append(_escape(f"{child_indent}{child.tail}\n"))
+        out.append(f"{indent}</{name}>\n")
+
+
+def _escape(text):
+    """Escape text as minidom's _write_data() does."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if '"' in text:
+        text = text.replace('"', "&quot;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def unpack_members(input_file, names, output_dir):
+    """Extract members of an Office file, pretty-printing the XML parts.
+
+    Returns:
+        dict: {part name: CRC-32 of the bytes written}
+    """
+    crcs = {}
+    with zipfile.ZipFile(input_file) as archive:
+        for name in names:
+            info = archive.getinfo(name)
+            path = archive.extract(info, output_dir)
+            crcs[name] = info.CRC
+            if path.endswith(XML_SUFFIXES):
+                with open(path, "rb") as f:
+                    formatted = pretty_xml(f.read())
+                with open(path, "wb") as f:
+                    f.write(formatted)
+                crcs[name] = zlib.crc32(formatted)
+    return crcs
+
+
+def unpack_document(input_file, output_dir, only=None, jobs=0, cache=None, link=False):
+    """Unpack an Office file into a directory of pretty-printed parts.
+
+    Args:
+        input_file: Path to the .docx/.pptx/.xlsx file
+        output_dir: Directory to unpack into (created if missing)
+        only: Optional globs; only parts whose names match one are unpacked
+        jobs: Worker processes (0 = one per CPU, when there is enough XML)
+        cache: Optional UnpackCache to clone the tree from, or to add it to
+        link: If True, files cloned from the cache are hard links to it
+    """
+
+    def selected(name):
+        return not only or any(fnmatch.fnmatchcase(name, glob) for glob in only)
+
+    os.makedirs(output_dir, exist_ok=True)
+    if cache is not None:
+        key = cache.key(input_file)
+        crcs = cache.get(key, output_dir, selected, link)
+        if crcs is not None:
+            write_unpack_record(output_dir, input_file, crcs)
+            return
+
+    with zipfile.ZipFile(input_file) as archive:
+        members = [
+            info
+            for info in archive.infolist()
+            if not info.is_dir() and selected(info.filename)
+        ]
+
+    xml_bytes = sum(
+        info.file_size for info in members if info.filename.endswith(XML_SUFFIXES)
+    )
+    if not jobs:
+        jobs = (os.cpu_count() or 1) if xml_bytes >= PARALLEL_MIN_BYTES else 1
+
+    # Largest parts first, dealt round-robin, so the workers finish together
+    members.sort(key=lambda info: info.file_size, reverse=True)
+    names = [info.filename for info in members]
+    crcs = {}
+    if jobs == 1:
+        crcs.update(unpack_members(input_file, names, output_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            batches = [names[i :: jobs * 4] for i in range(jobs * 4)]
+            for batch_crcs in pool.map(
+                unpack_members,
+                [input_file] * len(batches),
+                batches,
+                [output_dir] * len(batches),
+            ):
+                crcs.update(batch_crcs)
+
+    # Let pack.py copy the parts that stay unchanged straight from the original
+    write_unpack_record(output_dir, input_file, crcs)
+
+    if cache is not None and not only:
+        cache.put(key, output_dir, crcs)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack and format XML contents of Office files"
+    )
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "--only",
+        action="append",
+        metavar="GLOB",
+        help="Unpack only parts whose names match GLOB (repeatable)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Worker processes (default 0 = one per CPU for large documents)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Clone the document from the cache of unpacked documents, or add it",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="Cache directory (default: $OOXML_UNPACK_CACHE, or ooxml-unpack "
+        "in $XDG_CACHE_HOME or ~/.cache)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES >> 20,
+        metavar="MB",
+        help="Evict least recently used documents beyond this size "
+        f"(default {DEFAULT_MAX_BYTES >> 20})",
+    )
+    parser.add_argument(
+        "--link",
+        action="store_true",
+        help="Hard link files to the cache instead of copying them; only for "
+        "directories that are read, as editing a file in place corrupts the cache",
+    )
+    args = parser.parse_args()
+    if args.link and not args.cache:
+        parser.error("--link requires --cache")
+
+    cache = None
+    if args.cache:
+        cache = UnpackCache(args.cache_dir, args.cache_size << 20)
+    unpack_document(
+        args.office_file, args.output_dir, args.only, args.jobs, cache, args.link
+    )
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,58 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--jobs N] [--baseline-cache <dir>]
+        [--incremental] [--full] [--scoped] [--full-diff] [--timings] [--json <file>]
+    python validate.py <office_file> --original <original_file>
+
+--timings prints the wall time, CPU time and work done by each check, and
+--json writes the structured results of all checks to a file.
+
+An Office file given in place of <dir> is validated straight from its archive,
+without unpacking it to disk.
+
+With --incremental, results are recorded in <dir>.validation.json next to the
+unpacked directory, so later incremental runs only re-check the parts that
+changed. Add --full to force a cold run.
+With --scoped, large parts such as word/document.xml are XSD-validated only in
+the paragraphs and tables that differ from the original.
+
+The tracked changes check stops at the first paragraph whose text differs from
+the original; --full-diff lists every differing paragraph instead.
+
+validate_client.py takes the same arguments and hands the work to a running
+validate_server.py, which keeps compiled schemas in memory between runs.
 """
 
 import argparse
+import json
 import sys
+import zipfile
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+# The validation package (and lxml) is imported where it is used, so that
+# validate_client.py can share the command line without loading it
 
 
-def main():
+def validators_for(file_extension):
+    """Return the validator classes for a file extension, or None if unsupported."""
+    from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+
+    match file_extension:
+        case ".docx":
+            return [DOCXSchemaValidator, RedliningValidator]
+        case ".pptx":
+            return [PPTXSchemaValidator]
+        case _:
+            return None
+
+
+def build_parser():
+    """Return the command line parser, shared with validate_client.py."""
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "unpacked_dir",
-        help="Path to unpacked Office document directory",
+        help="Path to unpacked Office document directory, or to an Office file",
     )
     parser.add_argument(
         "--original",
@@ -30,39 +67,138 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Validate parts against XSD in N worker processes (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--baseline-cache",
+        metavar="DIR",
+        help="Directory to persist original-document XSD errors across runs",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Record results in <dir>.validation.json and re-check only the parts "
+        "changed since the last incremental run",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="With --incremental, re-check every part, ignoring recorded results",
+    )
+    parser.add_argument(
+        "--scoped",
+        action="store_true",
+        help="XSD-validate only the edited subtrees of large parts",
+    )
+    parser.add_argument(
+        "--full-diff",
+        action="store_true",
+        help="List every paragraph that fails the tracked changes check",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-check wall time, CPU time, files and elements visited",
+    )
+    parser.add_argument(
+        "--json",
+        metavar="FILE",
+        help="Write structured results of all checks to FILE as JSON",
+    )
+    return parser
+
+
+def run(args):
+    """Run the validators for the document named by parsed command line args.
+
+    Raises:
+        ValueError: If the document type cannot be validated
+
+    Returns:
+        dict: JSON-serializable outcome with "success", the text "report" and
+        "timings" of each validator, and the structured "results"
+    """
+    from validation import BaseSchemaValidator, RedliningValidator
 
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
     file_extension = original_file.suffix.lower()
-    assert unpacked_dir.is_dir(), f"Error: {unpacked_dir} is not a directory"
+    assert unpacked_dir.is_dir() or zipfile.is_zipfile(
+        unpacked_dir
+    ), f"Error: {unpacked_dir} is not a directory or an Office file"
     assert original_file.is_file(), f"Error: {original_file} is not a file"
-    assert file_extension in [".docx", ".pptx", ".xlsx"], (
-        f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
-    )
+    assert file_extension in [
+        ".docx",
+        ".pptx",
+        ".xlsx",
+    ], f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
 
     # Run validations
-    match file_extension:
-        case ".docx":
-            validators = [DOCXSchemaValidator, RedliningValidator]
-        case ".pptx":
-            validators = [PPTXSchemaValidator]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
+    validators = validators_for(file_extension)
+    if validators is None:
+        raise ValueError(f"Validation not supported for file type {file_extension}")
 
     # Run validators
     success = True
+    results = []
     for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
+        options = {}
+        if issubclass(V, BaseSchemaValidator):
+            options["baseline_cache_dir"] = args.baseline_cache
+            options["jobs"] = args.jobs
+            options["incremental"] = args.incremental
+            options["full"] = args.full
+            options["scoped_xsd"] = args.scoped
+        elif V is RedliningValidator:
+            options["full_diff"] = args.full_diff
+        validator = V(
+            unpacked_dir, original_file, verbose=args.verbose, report=False, **options
+        )
         if not validator.validate():
             success = False
+        results.append(validator.result)
 
-    if success:
+    return {
+        "success": success,
+        "report": [result.format_text() for result in results],
+        "timings": [result.format_timings() for result in results],
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def finish(args, outcome):
+    """Print the outcome of run() as requested by args and exit with its status."""
+    for text in outcome["report"]:
+        if text:
+            print(text)
+    if args.timings:
+        for timings in outcome["timings"]:
+            print(timings)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(outcome["results"], f, indent=2)
+
+    if outcome["success"]:
         print("All validations PASSED!")
 
-    sys.exit(0 if success else 1)
+    sys.exit(0 if outcome["success"] else 1)
+
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        outcome = run(args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finish(args, outcome)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Thin client for validate_server.py, with the same interface as validate.py.
+
+Usage:
+    python validate_client.py <dir> --original <original_file> [validate.py options]
+
+The request goes to the server listening on $OOXML_VALIDATE_SOCKET (default:
+ooxml-validate-<uid>.sock in $XDG_RUNTIME_DIR, or in the temp directory), and
+its answer is printed exactly as validate.py would print it, with the same exit
+status. If no server is running, the document is validated in this process.
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+from validate import build_parser, finish
+
+SOCKET_ENV = "OOXML_VALIDATE_SOCKET"
+
+
+def default_socket_path():
+    """Return the socket path used by validate_server.py and this client."""
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime_dir) / f"ooxml-validate-{os.getuid()}.sock"
+
+
+def request(socket_path, args):
+    """Have the server validate with parsed command line args.
+
+    Raises:
+        OSError: If no server is listening on socket_path
+
+    Returns:
+        dict: The outcome of validate.run(), or {"error": message}
+    """
+    # The server resolves paths from its own working directory
+    options = dict(vars(args))
+    for name in ("unpacked_dir", "original", "baseline_cache"):
+        if options[name] is not None:
+            options[name] = str(Path(options[name]).resolve())
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps({"args": options}).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            response = f.readline()
+    if not response:
+        raise ConnectionError(f"Server at {socket_path} closed the connection")
+    return json.loads(response)
+
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        outcome = request(default_socket_path(), args)
+    except OSError:
+        # No server running: validate in this process instead
+        import validate
+
+        validate.main()
+        return
+
+    if "error" in outcome:
+        print(outcome["error"])
+        sys.exit(1)
+    finish(args, outcome)
+
+
+if __name__ == "__main__":
+    main()
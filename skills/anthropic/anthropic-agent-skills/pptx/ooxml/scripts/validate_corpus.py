@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Validate many Office documents concurrently, writing one JSON record per document.
+
+Usage:
+    python validate_corpus.py <dir_or_file>... [--files-from <list>] [--original <file>] [--jobs N] [--output <file>]
+
+Documents are validated straight from their archives. Each record is written as
+a JSON line as soon as the document is done (in completion order):
+
+    {"file": ..., "valid": ..., "seconds": ...,
+     "validators": [{"validator": "DOCXSchemaValidator", "passed": ...,
+                     "checks": [{"name": "xsd", "passed": ..., "errors": [...],
+                                 "files": ..., "elements": ...,
+                                 "wall_time": ..., "cpu_time": ...}, ...]}]}
+
+A record with an "error" key means the document could not be validated. Such a
+failure never stops the other documents. Throughput is reported on stderr.
+
+Without --original, every XSD error counts and the tracked changes check is
+skipped. With it, all documents are compared against that one original.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from validate import validators_for
+from validation import BaseSchemaValidator, RedliningValidator
+
+DOCUMENT_EXTENSIONS = {".docx", ".pptx", ".xlsx"}
+
+
+def validate_document(path, original=None):
+    """Validate one document and return its JSON-serializable record.
+
+    Never raises: problems with the document are reported in the record.
+    """
+    path = Path(path)
+    started = time.perf_counter()
+    record = {"file": str(path), "valid": False, "validators": []}
+
+    try:
+        validators = validators_for(path.suffix.lower())
+        if validators is None:
+            raise ValueError(f"Validation not supported for file type {path.suffix}")
+
+        for V in validators:
+            if V is RedliningValidator and original is None:
+                continue  # Tracked changes can only be checked against an original
+
+            options = {"jobs": 1} if issubclass(V, BaseSchemaValidator) else {}
+            validator = V(path, original, report=False, **options)
+            validator.validate()
+            record["validators"].append(validator.result.to_dict())
+
+        record["valid"] = all(result["passed"] for result in record["validators"])
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["seconds"] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def collect_documents(inputs, files_from=None):
+    """Expand directories and file lists into the list of documents to validate."""
+    documents = []
+    for item in inputs:
+        item = Path(item)
+        if item.is_dir():
+            documents.extend(
+                sorted(
+                    f
+                    for f in item.rglob("*")
+                    if f.suffix.lower() in DOCUMENT_EXTENSIONS and f.is_file()
+                )
+            )
+        else:
+            documents.append(item)
+
+    if files_from:
+        with (
+            contextlib.nullcontext(sys.stdin)
+            if files_from == "-"
+            else open(files_from, encoding="utf-8")
+        ) as f:
+            documents.extend(Path(line.strip()) for line in f if line.strip())
+
+    return documents
+
+
+def run(documents, original, jobs, out):
+    """Validate documents across a process pool, writing records as they finish.
+
+    Returns:
+        tuple: (number of documents, number not valid)
+    """
+    failed = 0
+
+    def emit(record):
+        nonlocal failed
+        if not record["valid"]:
+            failed += 1
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    if jobs == 1:
+        for document in documents:
+            emit(validate_document(document, original))
+        return len(documents), failed
+
+    # A worker that dies (e.g. on a crash in a native library) breaks the whole
+    # pool, so its unfinished documents are retried in isolation afterwards
+    retry = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(validate_document, document, original): document
+            for document in documents
+        }
+        for future in as_completed(futures):
+            try:
+                emit(future.result())
+            except BrokenProcessPool:
+                retry.append(futures[future])
+
+    for document in retry:
+        try:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                record = pool.submit(validate_document, document, original).result()
+        except BrokenProcessPool as e:
+            record = {
+                "file": str(document),
+                "valid": False,
+                "validators": [],
+                "error": f"Validator process died: {e}",
+            }
+        emit(record)
+
+    return len(documents), failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate a corpus of Office documents, writing JSON Lines"
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="Office files, or directories searched recursively for them",
+    )
+    parser.add_argument(
+        "--files-from",
+        metavar="LIST",
+        help="File with one document path per line ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--original",
+        help="Original file to compare every document against",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Number of worker processes (default 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Write JSON Lines to this file instead of stdout",
+    )
+    args = parser.parse_args()
+
+    documents = collect_documents(args.inputs, args.files_from)
+    if not documents:
+        parser.error("no documents to validate")
+    if args.original:
+        assert Path(args.original).is_file(), f"Error: {args.original} is not a file"
+    jobs = args.jobs if args.jobs else (os.cpu_count() or 1)
+
+    started = time.perf_counter()
+    with (
+        open(args.output, "w", encoding="utf-8")
+        if args.output
+        else contextlib.nullcontext(sys.stdout)
+    ) as out:
+        total, failed = run(documents, args.original, jobs, out)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"Validated {total} documents in {elapsed:.1f}s "
+        f"({total / elapsed:.1f} docs/s), {failed} not valid",
+        file=sys.stderr,
+    )
+    sys.exit(0 if failed == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
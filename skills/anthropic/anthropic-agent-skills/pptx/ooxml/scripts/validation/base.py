@@ -2,13 +2,98 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import hashlib
+import io
+import os
 import re
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path, PurePosixPath
 
 import lxml.etree
 
+from .baseline import BaselineErrorIndex
+from .manifest import ValidationManifest
+from .package import PackageModel
+from .results import ResultRecorder
+from .rules import Rule, run_rules, stream_events, walk_events
+from .schema_cache import schema_registry
+from .source import DirectorySource, open_source
+
+# Separates the children of a scoped container when it is serialized (a
+# private use character, not expected in documents)
+SCOPE_MARKER = "\ue000"
+
+# Template placeholders, e.g. {{ name }}, which are not valid schema content
+TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
+
+class UniqueIdsRule(Rule):
+    """Collects the IDs of a part that must be unique, outside mc:AlternateContent.
+
+    The result lists ["error", message] for IDs repeated within the part and
+    ["global", id, line, tag] for IDs whose uniqueness spans all parts, which
+    validate_unique_ids resolves.
+    """
+
+    name = "unique_ids"
+
+    def __init__(self, validator, xml_file):
+        super().__init__(validator, xml_file)
+        self._file_ids = {}  # Track IDs that must be unique within this file
+        self._alternate_content = f"{{{validator.MC_NAMESPACE}}}AlternateContent"
+
+    def start(self, elem, open_tags):
+        # Skip mc:AlternateContent elements and everything inside them
+        if elem.tag == self._alternate_content or open_tags[self._alternate_content]:
+            return
+
+        # Get the element name without namespace
+        tag = elem.tag.split("}")[-1].lower() if "}" in elem.tag else elem.tag.lower()
+
+        # Check if this element type has ID uniqueness requirements
+        if tag not in self.validator.UNIQUE_ID_REQUIREMENTS:
+            return
+        attr_name, scope = self.validator.UNIQUE_ID_REQUIREMENTS[tag]
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.attrib.items():
+            attr_local = attr.split("}")[-1].lower() if "}" in attr else attr.lower()
+            if attr_local == attr_name:
+                id_value = value
+                break
+
+        if id_value is None:
+            return
+        if scope == "global":
+            self.result.append(["global", id_value, elem.sourceline, tag])
+        elif scope == "file":
+            # Check file-level uniqueness
+            key = (tag, attr_name)
+            if key not in self._file_ids:
+                self._file_ids[key] = {}
+
+            if id_value in self._file_ids[key]:
+                prev_line = self._file_ids[key][id_value]
+                self.result.append(
+                    [
+                        "error",
+                        f"  {self.xml_file.relative_to(self.validator.unpacked_dir)}: "
+                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                        f"(first occurrence at line {prev_line})",
+                    ]
+                )
+            else:
+                self._file_ids[key][id_value] = elem.sourceline
+
+    def failed(self, error):
+        super().failed(error)
+        self.result = [["error", message] for message in self.result]
+
 
-class BaseSchemaValidator:
+class BaseSchemaValidator(ResultRecorder):
     """Base validator with common validation logic for document files."""
 
     # Elements whose 'id' attributes must be unique within their file
@@ -41,6 +126,15 @@ class BaseSchemaValidator:
     # Subclasses should override this with format-specific mappings
     ELEMENT_RELATIONSHIP_TYPES = {}
 
+    # Element-level rules run together in one traversal per part
+    RULES = [UniqueIdsRule]
+
+    # Parts whose edited subtrees can be validated without the rest of the part
+    # (scoped_xsd=True): part name -> (tag of the container element below the
+    # root, tags of the container's children that are validated one by one)
+    # Subclasses should override this with format-specific parts
+    SCOPED_XSD_PARTS = {}
+
     # Unified schema mappings for all Office document types
     SCHEMA_MAPPINGS = {
         # Document type specific schemas
@@ -103,295 +197,452 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir).resolve()
-        self.original_file = Path(original_file)
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        baseline_cache_dir=None,
+        jobs=1,
+        incremental=False,
+        full=False,
+        report=True,
+        scoped_xsd=False,
+    ):
+        # Unpacked directory, or an Office file whose parts are read in place
+        self._source = open_source(unpacked_dir)
+        self.unpacked_dir = self._source.root
+        # None validates without a baseline: every XSD error is reported
+        self.original_file = Path(original_file) if original_file else None
         self.verbose = verbose
 
+        # Print the text report when validate() finishes (results are kept
+        # in self.result either way)
+        self.report = report
+
+        # Worker processes for XSD validation (0 or None = one per CPU core)
+        self.jobs = jobs if jobs else (os.cpu_count() or 1)
+
+        # Validate only the subtrees of SCOPED_XSD_PARTS that differ from the
+        # original, instead of whole parts
+        self.scoped_xsd = scoped_xsd
+
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
         # Get all XML and .rels files
         patterns = ["*.xml", "*.rels"]
         self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
+            f for pattern in patterns for f in self._source.rglob(pattern)
         ]
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees shared by all checks in this run (path -> tree or error)
+        self._tree_cache = {}
+        self._rule_cache = {}
+        self.parse_count = 0
+        self.parse_cache_hits = 0
+
+        # XSD errors of the original document, validated lazily per part
+        self._baseline = BaselineErrorIndex(
+            self.original_file,
+            self._validate_original_part,
+            cache_dir=baseline_cache_dir,
+        )
+
+        # Part hashes and check results of the previous run, for re-checking
+        # only what changed (full=True ignores them and rebuilds the manifest)
+        self._manifest = (
+            ValidationManifest(
+                self.unpacked_dir,
+                type(self).__name__,
+                self.original_file,
+                full=full,
+                scoped_xsd=scoped_xsd,
+            )
+            if incremental
+            and self.original_file is not None
+            and isinstance(self._source, DirectorySource)
+            else None
+        )
+        # Parts, relationships and content types, read once for all checks
+        self._package = PackageModel(self._source, self._parse)
+
+    def __getstate__(self):
+        # Worker processes start with empty caches: lxml trees and open
+        # archives cannot be pickled, and each worker builds its own
+        state = self.__dict__.copy()
+        state["_tree_cache"] = {}
+        state["_rule_cache"] = {}
+        state["_baseline"] = None
+        state["_manifest"] = None
+        state["_package"] = None
+        state["result"] = None
+        state["_recording"] = False
+        state["_current_check"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._baseline = BaselineErrorIndex(
+            self.original_file, self._validate_original_part
+        )
+
     def validate(self):
-        """Run all validation checks and return True if all pass."""
-        raise NotImplementedError("Subclasses must implement the validate method")
+        """Run all validation checks and return True if all pass.
+
+        The report is printed, the manifest saved and the source released even
+        if a check raises.
+        """
+        self._start_report()
+        try:
+            return self._run_checks()
+        finally:
+            self._finish_run()
+
+    def _run_checks(self):
+        """Run the validator's checks with _check() and return True if all pass."""
+        raise NotImplementedError("Subclasses must implement the _run_checks method")
+
+    def _parse(self, xml_file):
+        """Return the parsed tree for an XML file, parsing it at most once per run.
+
+        The tree is shared between all checks and must be treated as read-only.
+        Checks that need to modify it should use _parse_copy() instead. Parse
+        errors are cached too and re-raised on every request.
+        """
+        xml_file = Path(xml_file)
+        self._visit(xml_file)
+        if xml_file in self._tree_cache:
+            self.parse_cache_hits += 1
+        else:
+            self.parse_count += 1
+            try:
+                self._tree_cache[xml_file] = self._source.parse(xml_file)
+            except Exception as e:
+                self._tree_cache[xml_file] = e
+
+        result = self._tree_cache[xml_file]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _parse_copy(self, xml_file):
+        """Return a private, modifiable copy of the cached tree for an XML file."""
+        return copy.deepcopy(self._parse(xml_file))
+
+    def _rule_results(self, xml_file):
+        """Return {rule name: result} for a part, running all its RULES in one pass.
+
+        A part that is already parsed is walked in memory; otherwise it is
+        streamed from the source and released element by element.
+        """
+        xml_file = Path(xml_file)
+        if xml_file not in self._rule_cache:
+            rules = [
+                rule(self, xml_file)
+                for rule in self.RULES
+                if rule.applies_to(self, xml_file)
+            ]
+            try:
+                if xml_file in self._tree_cache:
+                    elements = run_rules(rules, walk_events(self._parse(xml_file)))
+                else:
+                    self.parse_count += 1
+                    with self._source.open(xml_file) as f:
+                        elements = run_rules(rules, stream_events(f))
+                self._visit(xml_file, elements)
+            except Exception as e:
+                for rule in rules:
+                    rule.failed(e)
+            self._rule_cache[xml_file] = {rule.name: rule.result for rule in rules}
+        return self._rule_cache[xml_file]
+
+    def _part_name(self, file_path):
+        """Return a file's path relative to unpacked_dir as a forward-slash string."""
+        return Path(file_path).relative_to(self.unpacked_dir).as_posix()
+
+    def _list_all_files(self):
+        """Return all files in the unpacked directory (listed once per run)."""
+        return self._package.files
+
+    def _lookup_cached(self, check, entry, depends_on, extra=()):
+        """Look up a stored check result in the manifest.
+
+        Args:
+            check: Name of the check
+            entry: Name of the result within the check (usually a part name)
+            depends_on: Part names whose content the result depends on
+            extra: Additional strings the result depends on
+
+        Returns:
+            tuple: (found, value, key) where key is passed to _store_cached
+        """
+        if self._manifest is None:
+            return False, None, None
+        key = self._manifest.key_for(depends_on, extra)
+        found, value = self._manifest.lookup(check, entry, key)
+        return found, value, key
+
+    def _store_cached(self, check, entry, key, value):
+        """Record a check result in the manifest for the next run."""
+        if self._manifest is not None:
+            self._manifest.store(check, entry, key, value)
+
+    def _cached(self, check, entry, depends_on, compute, extra=()):
+        """Return compute(), reusing the previous run's result if its inputs are unchanged.
+
+        Without incremental mode this simply calls compute().
+        """
+        found, value, key = self._lookup_cached(check, entry, depends_on, extra)
+        if not found:
+            value = compute()
+            self._store_cached(check, entry, key, value)
+        return value
+
+    def _finish_run(self):
+        """Persist the incremental manifest, release the source and print the report.
+
+        Returns:
+            bool: True if all checks passed
+        """
+        if self._manifest is not None:
+            self._manifest.save()
+        self._source.close()
+        return self._finish_report()
+
+    def _report_cache_stats(self):
+        """Print how much work the tree and schema caches saved during this run."""
+        if self.verbose:
+            self._print(
+                f"Parsed {self.parse_count} XML files; "
+                f"tree cache saved {self.parse_cache_hits} re-parses"
+            )
+            self._print(
+                f"Schema cache: {schema_registry.misses} compiled, "
+                f"{schema_registry.hits} reused"
+            )
+            if self._manifest is not None:
+                self._print(
+                    f"Incremental: {len(self._manifest.changed_parts())} changed files; "
+                    f"reused {self._manifest.reused} check results, "
+                    f"recomputed {self._manifest.computed}"
+                )
 
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
-            except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
+            part_name = self._part_name(xml_file)
+            errors.extend(
+                self._cached(
+                    "xml", part_name, [part_name], lambda: self._check_xml(xml_file)
                 )
+            )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} XML violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(f"FAILED - Found {len(errors)} XML violations:", errors)
         else:
             if self.verbose:
-                print("PASSED - All XML files are well-formed")
+                self._print("PASSED - All XML files are well-formed")
             return True
 
+    def _check_xml(self, xml_file):
+        """Return well-formedness errors for a single XML file."""
+        try:
+            # Try to parse the XML file
+            self._parse(xml_file)
+        except lxml.etree.XMLSyntaxError as e:
+            return [
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Line {e.lineno}: {e.msg}"
+            ]
+        except Exception as e:
+            return [
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Unexpected error: {str(e)}"
+            ]
+        return []
+
     def validate_namespaces(self):
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
-            except lxml.etree.XMLSyntaxError:
-                continue
+            part_name = self._part_name(xml_file)
+            errors.extend(
+                self._cached(
+                    "namespaces",
+                    part_name,
+                    [part_name],
+                    lambda: self._check_namespaces(xml_file),
+                )
+            )
 
         if errors:
-            print(f"FAILED - {len(errors)} namespace issues:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(f"FAILED - {len(errors)} namespace issues:", errors)
         if self.verbose:
-            print("PASSED - All namespace prefixes properly declared")
+            self._print("PASSED - All namespace prefixes properly declared")
         return True
 
+    def _check_namespaces(self, xml_file):
+        """Return undeclared Ignorable prefixes in a single XML file."""
+        errors = []
+        try:
+            root = self._parse(xml_file).getroot()
+            declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+
+            for attr_val in [
+                v for k, v in root.attrib.items() if k.endswith("Ignorable")
+            ]:
+                undeclared = set(attr_val.split()) - declared
+                errors.extend(
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                    f"Namespace '{ns}' in Ignorable but not declared"
+                    for ns in undeclared
+                )
+        except lxml.etree.XMLSyntaxError:
+            pass
+        return errors
+
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
         errors = []
         global_ids = {}  # Track globally unique IDs across all files
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+            part_name = self._part_name(xml_file)
+            events = self._cached(
+                "unique_ids",
+                part_name,
+                [part_name],
+                lambda: self._rule_results(xml_file)["unique_ids"],
+            )
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
+            # Global uniqueness spans files, so it is resolved on every run from
+            # the (possibly cached) per-file ID events
+            for event in events:
+                if event[0] == "error":
+                    errors.append(event[1])
+                    continue
+                _, id_value, line, tag = event
+                if id_value in global_ids:
+                    prev_file, prev_line, prev_tag = global_ids[id_value]
+                    errors.append(
+                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                        f"Line {line}: Global ID '{id_value}' in <{tag}> "
+                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                    )
+                else:
+                    global_ids[id_value] = (
+                        xml_file.relative_to(self.unpacked_dir),
+                        line,
+                        tag,
                     )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} ID uniqueness violations:", errors
+            )
         else:
             if self.verbose:
-                print("PASSED - All required IDs are unique")
+                self._print("PASSED - All required IDs are unique")
             return True
 
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
         """
-        errors = []
-
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_files = [f for f in self.xml_files if f.name.endswith(".rels")]
 
         if not rels_files:
             if self.verbose:
-                print("PASSED - No .rels files found")
+                self._print("PASSED - No .rels files found")
             return True
 
-        # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
-
-        # Track all files that are referenced by any .rels file
-        all_referenced_files = set()
+        # Get all parts of the package (excluding reference files)
+        all_parts = [
+            part_name
+            for part_name in self._package.paths
+            if part_name != PackageModel.CONTENT_TYPES_PART
+            and not part_name.endswith(".rels")
+        ]  # These files are not referenced by .rels
 
         if self.verbose:
-            print(
-                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+            self._print(
+                f"Found {len(rels_files)} .rels files and {len(all_parts)} target files"
             )
 
-        # Check each .rels file
-        for rels_file in rels_files:
-            try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
-                broken_refs = []
-
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
-
-                # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
-                        errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
-                        )
-
-            except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
-
-        # Check for unreferenced files (files that exist but are not referenced anywhere)
-        unreferenced_files = set(all_files) - all_referenced_files
-
-        if unreferenced_files:
-            for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+        # The outcome depends on every .rels file and on which files exist
+        errors = self._cached(
+            "file_references",
+            "package",
+            [self._part_name(f) for f in rels_files],
+            lambda: self._check_file_references(rels_files, all_parts),
+            extra=sorted(self._package.paths),
+        )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} relationship validation errors:")
-            for error in errors:
-                print(error)
-            print(
+            return self._fail(
+                f"FAILED - Found {len(errors)} relationship validation errors:",
+                errors,
                 "CRITICAL: These errors will cause the document to appear corrupt. "
                 + "Broken references MUST be fixed, "
-                + "and unreferenced files MUST be referenced or removed."
+                + "and unreferenced files MUST be referenced or removed.",
             )
-            return False
         else:
             if self.verbose:
-                print(
+                self._print(
                     "PASSED - All references are valid and all files are properly referenced"
                 )
             return True
 
+    def _check_file_references(self, rels_files, all_parts):
+        """Return broken and missing reference errors for the whole package."""
+        errors = []
+
+        # Track all parts that are referenced by any .rels file
+        all_referenced_parts = set()
+
+        # Check each .rels file
+        for rels_file in rels_files:
+            rels_part = self._part_name(rels_file)
+            try:
+                relationships = self._package.relationships(rels_part)
+            except Exception as e:
+                errors.append(f"  Error parsing {rels_part}: {e}")
+                continue
+
+            # Targets come resolved against the .rels file's location;
+            # external URLs have no part and are skipped
+            for rel in relationships:
+                if rel.part is None:
+                    continue
+                if self._package.has_part(rel.part):
+                    all_referenced_parts.add(rel.part)
+                else:
+                    errors.append(
+                        f"  {rels_part}: Line {rel.line}: Broken reference to {rel.target}"
+                    )
+
+        # Check for unreferenced files (files that exist but are not referenced anywhere)
+        unreferenced_parts = set(all_parts) - all_referenced_parts
+
+        if unreferenced_parts:
+            for unref_part in sorted(unreferenced_parts, key=PurePosixPath):
+                errors.append(f"  Unreferenced file: {unref_part}")
+
+        return errors
+
     def validate_all_relationship_ids(self):
         """
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
@@ -406,83 +657,83 @@ class BaseSchemaValidator:
             rels_file = rels_dir / f"{xml_file.name}.rels"
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if not self._package.has_part(self._part_name(rels_file)):
                 continue
 
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+            part_name = self._part_name(xml_file)
+            errors.extend(
+                self._cached(
+                    "relationship_ids",
+                    part_name,
+                    [part_name, self._part_name(rels_file)],
+                    lambda: self._check_relationship_ids(xml_file, rels_file),
+                )
+            )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
-            for error in errors:
-                print(error)
-            print("\nThese ID mismatches will cause the document to appear corrupt!")
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} relationship ID reference errors:",
+                errors,
+                "\nThese ID mismatches will cause the document to appear corrupt!",
+            )
         else:
             if self.verbose:
-                print("PASSED - All relationship ID references are valid")
+                self._print("PASSED - All relationship ID references are valid")
             return True
 
+    def _check_relationship_ids(self, xml_file, rels_file):
+        """Return r:id reference errors of one XML file against its .rels file."""
+        errors = []
+
+        try:
+            # Valid relationship IDs and their type names, from the package model
+            relationships = self._package.relationships(self._part_name(rels_file))
+            rid_to_type = relationships.types
+
+            # Check for duplicate rIds
+            for rel in relationships.duplicates:
+                rels_rel_path = rels_file.relative_to(self.unpacked_dir)
+                errors.append(
+                    f"  {rels_rel_path}: Line {rel.line}: "
+                    f"Duplicate relationship ID '{rel.id}' (IDs must be unique)"
+                )
+
+            # Parse the XML file to find all r:id references
+            xml_root = self._parse(xml_file).getroot()
+
+            # Find all elements with r:id attributes
+            for elem in xml_root.iter():
+                # Check for r:id attribute (relationship ID)
+                rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
+                if rid_attr:
+                    xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+                    elem_name = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+
+                    # Check if the ID exists
+                    if rid_attr not in rid_to_type:
+                        errors.append(
+                            f"  {xml_rel_path}: Line {elem.sourceline}: "
+                            f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                            f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+                        )
+                    # Check if we have type expectations for this element
+                    elif self.ELEMENT_RELATIONSHIP_TYPES:
+                        expected_type = self._get_expected_relationship_type(elem_name)
+                        if expected_type:
+                            actual_type = rid_to_type[rid_attr]
+                            # Check if the actual type matches or contains the expected type
+                            if expected_type not in actual_type.lower():
+                                errors.append(
+                                    f"  {xml_rel_path}: Line {elem.sourceline}: "
+                                    f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                    f"but should point to a '{expected_type}' relationship"
+                                )
+
+        except Exception as e:
+            xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+            errors.append(f"  Error processing {xml_rel_path}: {e}")
+        return errors
+
     def _get_expected_relationship_type(self, element_name):
         """
         Get the expected relationship type for an element.
@@ -524,32 +775,14 @@ class BaseSchemaValidator:
         errors = []
 
         # Find [Content_Types].xml file
-        content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
-            print("FAILED - [Content_Types].xml file not found")
-            return False
+        if not self._package.has_part(PackageModel.CONTENT_TYPES_PART):
+            return self._fail("FAILED - [Content_Types].xml file not found", [])
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+            # Declared parts (Override) and extensions (Default)
+            content_types = self._package.content_types()
+            declared_parts = content_types.overrides
+            declared_extensions = content_types.defaults
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -576,8 +809,7 @@ class BaseSchemaValidator:
             }
 
             # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
+            all_files = self._list_all_files()
 
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
@@ -592,18 +824,20 @@ class BaseSchemaValidator:
                 ):
                     continue
 
-                try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
-
-                    if root_name in declarable_roots and path_str not in declared_parts:
-                        errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
-                        )
-
-                except Exception:
+                root_name = self._cached(
+                    "root_name",
+                    path_str,
+                    [path_str],
+                    lambda: self._get_root_name(xml_file),
+                )
+                if root_name is None:
                     continue  # Skip unparseable files
 
+                if root_name in declarable_roots and path_str not in declared_parts:
+                    errors.append(
+                        f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                    )
+
             # Check all non-XML files for Default extension declarations
             for file_path in all_files:
                 # Skip XML files and metadata files (already checked above)
@@ -627,17 +861,24 @@ class BaseSchemaValidator:
             errors.append(f"  Error parsing [Content_Types].xml: {e}")
 
         if errors:
-            print(f"FAILED - Found {len(errors)} content type declaration errors:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} content type declaration errors:", errors
+            )
         else:
             if self.verbose:
-                print(
+                self._print(
                     "PASSED - All content files are properly declared in [Content_Types].xml"
                 )
             return True
 
+    def _get_root_name(self, xml_file):
+        """Return the local name of a file's root element, or None if unparseable."""
+        try:
+            root_tag = self._parse(xml_file).getroot().tag
+        except Exception:
+            return None
+        return root_tag.split("}")[-1] if "}" in root_tag else root_tag
+
     def validate_file_against_xsd(self, xml_file, verbose=False):
         """Validate a single XML file against XSD schema, comparing with original.
 
@@ -657,6 +898,18 @@ class BaseSchemaValidator:
             xml_file, unpacked_dir
         )
 
+        return self._compare_with_original(
+            xml_file, is_valid, current_errors, verbose=verbose
+        )
+
+    def _compare_with_original(self, xml_file, is_valid, current_errors, verbose=False):
+        """Reduce a part's XSD result to the errors not already in the original.
+
+        Returns:
+            tuple: (is_valid, new_errors_set) where is_valid is True/False/None (skipped)
+        """
+        unpacked_dir = self.unpacked_dir.resolve()
+
         if is_valid is None:
             return None, set()  # Skipped
         elif is_valid:
@@ -672,15 +925,15 @@ class BaseSchemaValidator:
         if new_errors:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
-                print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
+                self._print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
                 for error in list(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
-                    print(f"  - {truncated}")
+                    self._print(f"  - {truncated}")
             return False, new_errors
         else:
             # All errors existed in original
             if verbose:
-                print(
+                self._print(
                     f"PASSED - No new errors (original had {len(current_errors)} errors)"
                 )
             return True, set()
@@ -692,11 +945,10 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        for xml_file, (is_valid, new_file_errors) in zip(
+            self.xml_files, self._xsd_outcomes()
+        ):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -717,27 +969,112 @@ class BaseSchemaValidator:
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
 
+        self._baseline.close()
+
         # Print summary
         if self.verbose:
-            print(f"Validated {len(self.xml_files)} files:")
-            print(f"  - Valid: {valid_count}")
-            print(f"  - Skipped (no schema): {skipped_count}")
+            self._print(f"Validated {len(self.xml_files)} files:")
+            self._print(f"  - Valid: {valid_count}")
+            self._print(f"  - Skipped (no schema): {skipped_count}")
             if original_error_count:
-                print(f"  - With original errors (ignored): {original_error_count}")
-            print(
+                self._print(
+                    f"  - With original errors (ignored): {original_error_count}"
+                )
+            self._print(
                 f"  - With NEW errors: {len(new_errors) > 0 and len([e for e in new_errors if not e.startswith('    ')]) or 0}"
             )
 
         if new_errors:
-            print("\nFAILED - Found NEW validation errors:")
-            for error in new_errors:
-                print(error)
-            return False
+            return self._fail("\nFAILED - Found NEW validation errors:", new_errors)
         else:
             if self.verbose:
-                print("\nPASSED - No new XSD validation errors introduced")
+                self._print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _xsd_outcomes(self):
+        """Validate every XML file against XSD, in self.xml_files order.
+
+        Returns:
+            list: (is_valid, new_errors_set) per file, as from validate_file_against_xsd
+        """
+        schema_files = [
+            f
+            for f in self.xml_files
+            if self._get_schema_path(f.relative_to(self.unpacked_dir))
+        ]
+
+        # Reuse outcomes of parts unchanged since the last incremental run
+        outcomes = {}
+        pending = []
+        for xml_file in schema_files:
+            found, value, key = self._lookup_cached(
+                "xsd", self._part_name(xml_file), [self._part_name(xml_file)]
+            )
+            if found:
+                outcomes[xml_file] = (value[0], set(value[1]))
+            else:
+                pending.append((xml_file, key))
+
+        todo = [xml_file for xml_file, _ in pending]
+        computed = None
+        if self.jobs > 1 and len(todo) > 1:
+            try:
+                computed = self._xsd_outcomes_parallel(todo)
+            except (OSError, BrokenProcessPool) as e:
+                if self.verbose:
+                    self._print(
+                        f"Parallel XSD validation unavailable ({e}), running serially"
+                    )
+        if computed is None:
+            computed = {
+                xml_file: self.validate_file_against_xsd(xml_file, verbose=False)
+                for xml_file in todo
+            }
+
+        for xml_file, key in pending:
+            is_valid, new_errors = computed[xml_file]
+            self._store_cached(
+                "xsd", self._part_name(xml_file), key, [is_valid, sorted(new_errors)]
+            )
+            outcomes[xml_file] = (is_valid, new_errors)
+
+        return [outcomes.get(f, (None, set())) for f in self.xml_files]
+
+    def _xsd_outcomes_parallel(self, schema_files):
+        """Spread XSD validation of parts, and of their baselines, over a process pool.
+
+        Each worker compiles its own schemas.
+
+        Returns:
+            dict: {xml_file: (is_valid, new_errors_set)} for the given files
+        """
+        workers = min(self.jobs, len(schema_files))
+        chunksize = max(1, len(schema_files) // (workers * 4))
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_xsd_worker, initargs=(self,)
+        ) as pool:
+            current = dict(
+                zip(
+                    schema_files,
+                    pool.map(_xsd_worker_validate, schema_files, chunksize=chunksize),
+                )
+            )
+
+            # Baseline errors are only needed for parts that failed validation
+            failed_parts = [
+                f.relative_to(self.unpacked_dir).as_posix()
+                for f, (is_valid, _) in current.items()
+                if is_valid is False
+            ]
+            missing = self._baseline.missing(failed_parts)
+            for part_name, errors in zip(
+                missing, pool.map(_xsd_worker_original_errors, missing)
+            ):
+                self._baseline.record(part_name, errors)
+
+        return {f: self._compare_with_original(f, *current[f]) for f in schema_files}
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -762,96 +1099,234 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
+    def _prepare_for_xsd(self, xml_doc, clean_namespaces):
+        """Prepare a tree for XSD validation in one pass, modifying it in place.
 
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
+        Template tags ({{ ... }} placeholders) are removed from text outside
+        w:t elements and mc:Ignorable is removed from the root. With
+        clean_namespaces, attributes and elements from namespaces other than
+        OOXML_NAMESPACES are dropped as well.
+        """
+        root = xml_doc.getroot()
+        root.attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
 
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
+        # Whether a qualified name is outside OOXML_NAMESPACES, computed once per name
+        foreign = {}
 
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
+        def is_foreign(name):
+            if name not in foreign:
+                foreign[name] = (
+                    name.startswith("{")
+                    and name[1 : name.index("}")] not in self.OOXML_NAMESPACES
+                )
+            return foreign[name]
 
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
+        removed = []
+        for elem in root.iter():
+            tag = elem.tag
+            if not isinstance(tag, str):
+                continue  # Comments and processing instructions
 
-        return lxml.etree.ElementTree(xml_copy)
+            if clean_namespaces:
+                if is_foreign(tag) and elem is not root:
+                    removed.append(elem)
+                    continue
+                for attr in [a for a in elem.keys() if is_foreign(a)]:
+                    del elem.attrib[attr]
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
-        elements_to_remove = []
+            # Text of w:t elements is document content and keeps template tags
+            if not tag.endswith("}t") and tag != "t":
+                text, tail = elem.text, elem.tail
+                if text and "{{" in text:
+                    elem.text = TEMPLATE_TAG_PATTERN.sub("", text)
+                if tail and "{{" in tail:
+                    elem.tail = TEMPLATE_TAG_PATTERN.sub("", tail)
 
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
+        # Detached only after the walk; removal takes the element's tail along
+        for elem in removed:
+            elem.getparent().remove(elem)
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
+    def _validate_single_file_xsd(self, xml_file, base_path):
+        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
+        relative_path = Path(xml_file).relative_to(base_path)
+        if not self._get_schema_path(relative_path):
+            return None, None  # Skip file
 
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
+        if self.scoped_xsd and relative_path.as_posix() in self.SCOPED_XSD_PARTS:
+            outcome = self._validate_scoped_xsd(xml_file, relative_path)
+            if outcome is not None:
+                return outcome
 
-        # Remove collected elements
-        for elem in elements_to_remove:
-            root.remove(elem)
+        try:
+            xml_doc = self._parse_copy(xml_file)
+        except Exception as e:
+            return False, {str(e)}
+        return self._validate_tree_xsd(xml_doc, relative_path)
 
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
+    def _validate_scoped_xsd(self, xml_file, relative_path):
+        """Validate only the subtrees of a part that differ from the original.
 
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+        Children of the part's container (e.g. w:p and w:tbl in w:body) that
+        occur unchanged in the original are skipped. The others are validated
+        together in a copy of the part that holds nothing else, and their
+        errors are compared with the original's like those of a full run.
 
-        return xml_doc
+        Returns:
+            tuple: (is_valid, errors_set), or None if the edits touch the
+            structure around the subtrees and the whole part must be validated
+        """
+        part_name = relative_path.as_posix()
+        original = self._original_scope(part_name)
+        if original is None:
+            return None
 
-    def _validate_single_file_xsd(self, xml_file, base_path):
-        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
-        schema_path = self._get_schema_path(xml_file)
-        if not schema_path:
-            return None, None  # Skip file
+        try:
+            root = self._parse(xml_file).getroot()
+        except Exception:
+            return None  # Reported by the full validation
+        current = self._split_scope(root, part_name)
+        if current is None or current[0] != original[0]:
+            return None
+
+        edited = [child for digest, child in current[1] if digest not in original[1]]
+        if not edited:
+            return True, set()
+
+        container_tag, _ = self.SCOPED_XSD_PARTS[part_name]
+        wrapper = lxml.etree.Element(root.tag, dict(root.attrib), nsmap=root.nsmap)
+        container = lxml.etree.SubElement(
+            wrapper, container_tag, dict(root.find(container_tag).attrib)
+        )
+        for child in edited:
+            container.append(copy.deepcopy(child))
+        return self._validate_tree_xsd(lxml.etree.ElementTree(wrapper), relative_path)
+
+    def _original_scope(self, part_name):
+        """Return (frame, subtree digests) of a part in the original, or None.
+
+        Kept for the life of the process, so repeated validations against the
+        same original (e.g. each Document.save()) split it only once. Only the
+        most recently used MAX_ORIGINAL_SCOPES parts are kept, which bounds a
+        long-running process such as validate_server.py.
+        """
+        if self.original_file is None:
+            return None
+        stat = self.original_file.stat()
+        key = (
+            str(self.original_file.resolve()),
+            stat.st_size,
+            stat.st_mtime_ns,
+            part_name,
+        )
+        if key not in _original_scopes:
+            scope = None
+            data = self._baseline.read(part_name)
+            try:
+                root = lxml.etree.parse(io.BytesIO(data)).getroot()
+                frame, subtrees = self._split_scope(root, part_name)
+                scope = frame, {digest for digest, _ in subtrees}
+            except Exception:
+                pass  # Absent, unreadable or unsplittable: validate the whole part
+            _original_scopes[key] = scope
+            while len(_original_scopes) > MAX_ORIGINAL_SCOPES:
+                del _original_scopes[next(iter(_original_scopes))]
+        else:
+            _original_scopes[key] = _original_scopes.pop(key)
+        return _original_scopes[key]
 
+    def _split_scope(self, root, part_name):
+        """Split a scoped part into its frame and its digested subtrees.
+
+        The frame is everything that is validated together: the root's
+        attributes, the root's other children, the container's attributes and
+        its children that are not scoped subtrees, in order. Subtrees are
+        digested by their serialization inside the container, which carries
+        no namespace declarations, so declarations added to the root do not
+        make unchanged subtrees look edited.
+
+        Returns:
+            tuple: (frame, [(digest, subtree element), ...]), or None if the
+            part cannot be split
+        """
+        container_tag, subtree_tags = self.SCOPED_XSD_PARTS[part_name]
+        container = root.find(container_tag)
+        if container is None:
+            return None
+
+        # Serialize the container once, with a marker between its children,
+        # rather than each child on its own (which costs far more per call)
+        children = list(container)
+        text, tails = container.text, [child.tail for child in children]
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            container.text = SCOPE_MARKER
+            for child in children:
+                child.tail = SCOPE_MARKER
+            serialized = lxml.etree.tostring(container, encoding="utf-8")
+        finally:
+            container.text = text
+            for child, tail in zip(children, tails):
+                child.tail = tail
+        chunks = serialized.split(SCOPE_MARKER.encode())[1:-1]
+        if len(chunks) != len(children):
+            return None  # The marker occurs in the content
+
+        # mc:Ignorable is removed before validation, so it is not part of the frame
+        attrib = dict(root.attrib)
+        attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
+        frame = [root.tag, attrib, dict(container.attrib)]
+        frame.extend(
+            lxml.etree.tostring(child, method="c14n", exclusive=True, with_tail=False)
+            for child in root
+            if child is not container
+        )
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+        subtrees = []
+        for child, chunk in zip(children, chunks):
+            if child.tag in subtree_tags:
+                subtrees.append((hashlib.sha1(chunk).digest(), child))
+                # Runs of subtrees may change in length without touching the frame
+                if frame[-1] is not None:
+                    frame.append(None)
+            else:
+                frame.append(chunk)
+        return frame, subtrees
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+    def _validate_original_part(self, part_name, data):
+        """Validate a part of the original document held in memory. Returns errors_set."""
+        relative_path = PurePosixPath(part_name)
+        if not self._get_schema_path(relative_path):
+            return set()
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+        try:
+            xml_doc = lxml.etree.parse(io.BytesIO(data))
+        except Exception as e:
+            return {str(e)}
+        _, errors = self._validate_tree_xsd(xml_doc, relative_path)
+        return errors
+
+    def _validate_tree_xsd(self, xml_doc, relative_path):
+        """Validate a parsed part against its XSD schema. Returns (is_valid, errors_set).
+
+        Args:
+            xml_doc: Parsed lxml tree, owned by the caller and modified in place
+            relative_path: Part path relative to the package root
+        """
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return None, None  # Skip file
+
+        try:
+            # Load schema (compiled once per process)
+            schema = schema_registry.get(schema_path)
+
+            # Only main content parts have ignorable namespaces cleaned
+            self._prepare_for_xsd(
+                xml_doc,
+                clean_namespaces=bool(
+                    relative_path.parts
+                    and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+                ),
+            )
 
             # Validate
             if schema.validate(xml_doc):
@@ -875,76 +1350,39 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        return self._baseline.errors_for(relative_path.as_posix())
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
+# Frames and subtree digests of original parts for scoped XSD validation,
+# by (original file, size, mtime, part name), least recently used first
+_original_scopes = {}
+MAX_ORIGINAL_SCOPES = 32
 
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+# Validator copy used by each XSD worker process (set by _init_xsd_worker)
+_worker_validator = None
 
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
 
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
+def _init_xsd_worker(validator):
+    global _worker_validator
+    _worker_validator = validator
 
-        Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
-        """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
-                    )
-                return template_pattern.sub("", text)
-            return text
 
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
+def _xsd_worker_validate(xml_file):
+    """Validate one part of the unpacked document in a worker process."""
+    return _worker_validator._validate_single_file_xsd(
+        xml_file, _worker_validator.unpacked_dir
+    )
 
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
 
-        return lxml.etree.ElementTree(xml_copy), warnings
+def _xsd_worker_original_errors(part_name):
+    """Validate one part of the original document in a worker process."""
+    return _worker_validator._baseline.errors_for(part_name)
 
 
 if __name__ == "__main__":
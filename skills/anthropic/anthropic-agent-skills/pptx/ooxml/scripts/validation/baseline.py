@@ -0,0 +1,140 @@
+"""
+Lazily built index of XSD errors already present in the original document.
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+from pathlib import Path
+
+
+class BaselineErrorIndex:
+    """Memoized {part_name: error_set} for the parts of an original Office file.
+
+    Parts are read one at a time straight from the original archive and
+    validated only when first requested, so unchanged or error-free parts of
+    the original are never touched. When a cache directory is given, the index
+    is persisted there keyed by the original file's content hash, letting later
+    runs against the same source document skip baseline validation entirely.
+    """
+
+    # Bump when the stored format or the error computation changes
+    INDEX_VERSION = 1
+
+    def __init__(self, original_file, validate_part, cache_dir=None):
+        """
+        Args:
+            original_file: Path to the original .docx/.pptx/.xlsx file, or None
+                if there is no original (no part has baseline errors)
+            validate_part: Callable (part_name, data) -> set of error messages
+            cache_dir: Optional directory for the persistent on-disk index
+        """
+        self.original_file = Path(original_file) if original_file else None
+        self.validate_part = validate_part
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+        self._errors = {}
+        self._zip = None
+        self._dirty = False
+        self._cache_file = None
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._loaded = True
+            if self.cache_dir and self.original_file is not None:
+                self._load_persisted()
+
+    def missing(self, part_names):
+        """Return the part names whose baseline errors are not known yet."""
+        self._ensure_loaded()
+        return [p for p in part_names if p not in self._errors]
+
+    def record(self, part_name, errors):
+        """Store baseline errors computed elsewhere (e.g. in a worker process)."""
+        self._ensure_loaded()
+        self._errors[part_name] = set(errors)
+        self._dirty = True
+
+    def errors_for(self, part_name):
+        """Return the set of XSD errors of a part in the original document.
+
+        Args:
+            part_name: Part name relative to the package root (e.g. "word/document.xml")
+
+        Returns:
+            set: Error messages, empty if the part is valid or absent in the original
+        """
+        self._ensure_loaded()
+
+        part_name = str(part_name).replace("\\", "/")
+        if part_name not in self._errors:
+            self._errors[part_name] = self._compute(part_name)
+            self._dirty = True
+        return self._errors[part_name]
+
+    def read(self, part_name):
+        """Return the content of a part of the original (None if it is absent)."""
+        if self.original_file is None:
+            return None
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.original_file, "r")
+        try:
+            return self._zip.read(part_name)
+        except KeyError:
+            return None
+
+    def _compute(self, part_name):
+        """Validate a single member of the original archive."""
+        data = self.read(part_name)
+        if data is None:
+            # File didn't exist in original, so no original errors
+            return set()
+        return set(self.validate_part(part_name, data) or ())
+
+    def close(self):
+        """Release the original archive and persist newly computed entries."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._dirty and self._cache_file is not None:
+            self._save_persisted()
+        self._dirty = False
+
+    def _load_persisted(self):
+        """Load a previously persisted index for the same original file."""
+        digest = hashlib.sha256()
+        with open(self.original_file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        self._cache_file = (
+            self.cache_dir / f"{digest.hexdigest()}.v{self.INDEX_VERSION}.json"
+        )
+
+        try:
+            stored = json.loads(self._cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        self._errors = {part: set(errors) for part, errors in stored.items()}
+
+    def _save_persisted(self):
+        """Write the index atomically so concurrent runs never see partial files."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._cache_file.with_name(
+                f"{self._cache_file.name}.{os.getpid()}.tmp"
+            )
+            tmp_file.write_text(
+                json.dumps(
+                    {part: sorted(errors) for part, errors in self._errors.items()}
+                ),
+                encoding="utf-8",
+            )
+            tmp_file.replace(self._cache_file)
+        except OSError:
+            pass  # The on-disk index is only an optimization
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,166 @@
+"""
+Persistent manifest of part hashes and check results for incremental validation.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+
+class ValidationManifest:
+    """Content hashes and per-check results of the last validation run.
+
+    The manifest lives next to the unpacked directory (never inside it, where it
+    would be packed into the document). Each cached check result is stored with
+    a key derived from the hashes of the parts it depends on, so a result is
+    reused only while none of those parts changed.
+
+    File hashes are themselves cached by (size, mtime), like a git index, so an
+    unchanged tree is not re-read on every run.
+    """
+
+    # Bump when check logic or the stored format changes
+    VERSION = 2
+
+    def __init__(
+        self, unpacked_dir, validator_name, original_file, full=False, scoped_xsd=False
+    ):
+        """
+        Args:
+            unpacked_dir: Path to the unpacked document directory
+            validator_name: Name of the validator class the results belong to
+            original_file: Path to the original file the run compares against
+            full: If True, ignore stored results and start from a cold run
+            scoped_xsd: Whether the run validates only edited subtrees against
+                XSD; its results are not reused by runs validating whole parts
+        """
+        self.unpacked_dir = Path(unpacked_dir)
+        self.path = self.unpacked_dir.with_name(
+            f"{self.unpacked_dir.name}.validation.json"
+        )
+        original_file = Path(original_file)
+        original_stat = original_file.stat()
+        self.header = {
+            "version": self.VERSION,
+            "validator": validator_name,
+            "scoped_xsd": scoped_xsd,
+            "original": [
+                str(original_file.resolve()),
+                original_stat.st_size,
+                original_stat.st_mtime_ns,
+            ],
+        }
+
+        self._files = {}
+        self._checks = {}
+        self._written_ns = 0
+        if not full:
+            self._load()
+        self._previous = {name: entry[2] for name, entry in self._files.items()}
+
+        self._hashes = {}
+        self._used = {}
+        self.reused = 0
+        self.computed = 0
+
+    def _load(self):
+        try:
+            stored = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if stored.get("header") != self.header:
+            return  # Different original, validator, mode or format: cold run
+        self._files = stored.get("files", {})
+        self._checks = stored.get("checks", {})
+        self._written_ns = stored.get("written_ns", 0)
+
+    def part_hash(self, part_name):
+        """Return the content hash of a file in the unpacked directory (None if absent)."""
+        if part_name in self._hashes:
+            return self._hashes[part_name]
+
+        file_path = self.unpacked_dir / part_name
+        try:
+            stat = file_path.stat()
+        except OSError:
+            self._hashes[part_name] = None
+            return None
+
+        # Trust the stored hash if size and mtime match, unless the file was
+        # modified so close to the last write that a same-size edit could hide
+        stored = self._files.get(part_name)
+        if (
+            stored
+            and stored[0] == stat.st_size
+            and stored[1] == stat.st_mtime_ns
+            and stat.st_mtime_ns < self._written_ns - 2_000_000_000
+        ):
+            digest = stored[2]
+        else:
+            with open(file_path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+
+        self._files[part_name] = [stat.st_size, stat.st_mtime_ns, digest]
+        self._hashes[part_name] = digest
+        return digest
+
+    def key_for(self, part_names, extra=()):
+        """Return a digest identifying the current content of a set of parts."""
+        digest = hashlib.sha256()
+        for part_name in part_names:
+            digest.update(f"{part_name}:{self.part_hash(part_name)};".encode())
+        for item in extra:
+            digest.update(f"{item};".encode())
+        return digest.hexdigest()
+
+    def lookup(self, check, entry, key):
+        """Return the stored result of a check for an entry if its key still matches.
+
+        Returns:
+            tuple: (found, value)
+        """
+        stored = self._checks.get(check, {}).get(entry)
+        if stored is not None and stored[0] == key:
+            self._used.setdefault(check, {})[entry] = stored
+            self.reused += 1
+            return True, stored[1]
+        return False, None
+
+    def store(self, check, entry, key, value):
+        """Record the result of a check for an entry (value must be JSON-serializable)."""
+        self._used.setdefault(check, {})[entry] = [key, value]
+        self.computed += 1
+
+    def changed_parts(self):
+        """Return the part names whose content differs from the stored manifest."""
+        return [
+            part_name
+            for part_name, digest in self._hashes.items()
+            if digest is not None and self._previous.get(part_name) != digest
+        ]
+
+    def save(self):
+        """Write the manifest, keeping only entries used by this run."""
+        files = {
+            part_name: self._files[part_name]
+            for part_name, digest in self._hashes.items()
+            if digest is not None
+        }
+        data = {
+            "header": self.header,
+            "written_ns": time.time_ns(),
+            "files": files,
+            "checks": self._used,
+        }
+        try:
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            tmp_path.replace(self.path)
+        except OSError:
+            pass  # The manifest is only an optimization
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
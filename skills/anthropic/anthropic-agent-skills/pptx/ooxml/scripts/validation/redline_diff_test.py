@@ -0,0 +1,119 @@
+import difflib
+import random
+import unittest
+
+from .redline_diff import diff_paragraphs, inline_diff, myers_opcodes
+
+
+def apply_opcodes(opcodes, a, b):
+    """Rebuild b from a using opcodes, checking that they cover both sequences"""
+    result = []
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j), (tag, i1, i2, j1, j2)
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+        result.extend(a[i1:i2] if tag == "equal" else b[j1:j2])
+        i, j = i2, j2
+    assert (i, j) == (len(a), len(b))
+    return result
+
+
+def edit_count(opcodes):
+    return sum(i2 - i1 + j2 - j1 for tag, i1, i2, j1, j2 in opcodes if tag != "equal")
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# Run from the ooxml/scripts directory: python -m unittest validation.redline_diff_test
+class TestMyersOpcodes(unittest.TestCase):
+
+    def test_matches_difflib(self):
+        """Test that opcodes rebuild the target and are no longer than difflib's"""
+        rng = random.Random(0)
+        for _ in range(500):
+            a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 12)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 12)))
+            with self.subTest(a=a, b=b):
+                opcodes = myers_opcodes(a, b)
+                self.assertEqual("".join(apply_opcodes(opcodes, a, b)), b)
+                expected = difflib.SequenceMatcher(None, a, b, autojunk=False)
+                # Myers finds a shortest edit script, difflib not always
+                self.assertLessEqual(
+                    edit_count(opcodes), edit_count(expected.get_opcodes())
+                )
+
+    def test_same_opcodes_as_difflib(self):
+        """Test the opcodes of simple edits against difflib"""
+        cases = [
+            ("", ""),
+            ("abc", "abc"),
+            ("abc", ""),
+            ("", "abc"),
+            ("abcdef", "abXdef"),
+            ("abcdef", "abdef"),
+            ("abcdef", "abcXYdef"),
+            ("the quick fox", "the slow fox"),
+        ]
+        for a, b in cases:
+            with self.subTest(a=a, b=b):
+                expected = difflib.SequenceMatcher(None, a, b, autojunk=False)
+                self.assertEqual(myers_opcodes(a, b), expected.get_opcodes())
+
+    def test_max_edits_reports_one_replacement(self):
+        """Test that a diff over max_edits keeps the common ends and replaces the rest"""
+        a = "start" + "x" * 20 + "end"
+        b = "start" + "y" * 20 + "end"
+        self.assertEqual(
+            myers_opcodes(a, b, max_edits=10),
+            [
+                ("equal", 0, 5, 0, 5),
+                ("replace", 5, 25, 5, 25),
+                ("equal", 25, 28, 25, 28),
+            ],
+        )
+        self.assertEqual(myers_opcodes(a, b, max_edits=40), myers_opcodes(a, b))
+
+    def test_max_edits_with_one_side_empty(self):
+        """Test that the fallback reports a plain deletion or insertion"""
+        self.assertEqual(
+            myers_opcodes("abXYZ", "ab", max_edits=1),
+            [("equal", 0, 2, 0, 2), ("delete", 2, 5, 2, 2)],
+        )
+        self.assertEqual(
+            myers_opcodes("ab", "aXYZb", max_edits=1),
+            [("equal", 0, 1, 0, 1), ("insert", 1, 1, 1, 4), ("equal", 1, 2, 4, 5)],
+        )
+
+
+class TestDiffParagraphs(unittest.TestCase):
+
+    def test_paragraphs_matched_on_exact_text(self):
+        """Test that only paragraphs whose text differs are reported"""
+        original = [(0, "Title"), (1, "Unchanged"), (2, "Old text"), (3, "Gone")]
+        modified = [(0, "Title"), (1, "Unchanged"), (2, "New text"), (4, "Added")]
+        changes = diff_paragraphs(original, modified)
+        self.assertEqual(
+            [(c.kind, c.original_index, c.modified_index) for c in changes],
+            [("changed", 2, 2), ("changed", 3, 4)],
+        )
+        self.assertEqual(changes[0].diff, "[-Old-]{+New+} text")
+
+    def test_deleted_and_inserted_paragraphs(self):
+        """Test that unpaired paragraphs are reported as deleted or inserted"""
+        original = [(0, "Keep"), (1, "Drop")]
+        modified = [(0, "Add"), (1, "Keep")]
+        changes = diff_paragraphs(original, modified)
+        self.assertEqual(
+            [(c.kind, c.original_index, c.modified_index) for c in changes],
+            [("inserted", None, 0), ("deleted", 1, None)],
+        )
+
+    def test_inline_diff_elides_context(self):
+        """Test that long unchanged text around a change is shortened"""
+        before, after = "a" * 100, "b" * 100
+        diff = inline_diff(before + "old" + after, before + "new" + after)
+        self.assertEqual(diff, "..." + "a" * 60 + "[-old-]{+new+}" + "b" * 60 + "...")
+
+
+if __name__ == "__main__":
+    unittest.main()
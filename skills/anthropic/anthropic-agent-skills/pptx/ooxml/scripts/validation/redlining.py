@@ -2,117 +2,162 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
 import zipfile
+from itertools import zip_longest
 from pathlib import Path
 
+import lxml.etree
 
-class RedliningValidator:
+from .redline_diff import diff_paragraphs, format_changes, paragraph_change
+from .results import ResultRecorder
+
+
+class RedliningValidator(ResultRecorder):
     """Validator for tracked changes in Word documents."""
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
+    def __init__(
+        self, unpacked_dir, original_docx, verbose=False, report=True, full_diff=False
+    ):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
+        self.report = report
+        # Report every differing paragraph instead of stopping at the first
+        self.full_diff = full_diff
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
+        # ParagraphChanges found by the last validation (empty if text matched)
+        self.changes = []
 
     def validate(self):
         """Main validation method that returns True if valid, False otherwise."""
+        self._start_report()
+        try:
+            self._check("tracked_changes", self.validate_tracked_changes)
+        finally:
+            # Print what was reported even if the check raised
+            passed = self._finish_report()
+        return passed
+
+    def validate_tracked_changes(self):
+        """Check that all changes by Claude are tracked with w:ins/w:del.
+
+        Both documents are streamed paragraph by paragraph, so memory use does
+        not grow with their size.
+        """
+        self.changes = []
+
         # Verify unpacked directory exists and has correct structure
-        modified_file = self.unpacked_dir / "word" / "document.xml"
-        if not modified_file.exists():
-            print(f"FAILED - Modified document.xml not found at {modified_file}")
-            return False
+        try:
+            self._open_document_xml(self.unpacked_dir).close()
+        except (OSError, KeyError, zipfile.BadZipFile):
+            modified_file = self.unpacked_dir / "word" / "document.xml"
+            return self._fail(
+                f"FAILED - Modified document.xml not found at {modified_file}", []
+            )
 
         # First, check if there are any tracked changes by Claude to validate
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
             # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
+            if not self._has_claude_changes():
                 if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
+                    self._print("PASSED - No tracked changes by Claude found.")
                 return True
-
         except Exception:
             # If we can't parse the XML, continue with full validation
             pass
 
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
-
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
-
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        try:
+            self._open_document_xml(self.original_docx).close()
+        except KeyError:
+            return self._fail(
+                f"FAILED - Original document.xml not found in {self.original_docx}",
+                [],
+            )
+        except Exception as e:
+            return self._fail(f"FAILED - Error unpacking original docx: {e}", [])
+
+        # Compare the text left after removing Claude's tracked changes
+        try:
+            if self.full_diff:
+                self.changes = self._diff_all_paragraphs()
+            else:
+                self.changes = self._find_first_difference()
+        except lxml.etree.XMLSyntaxError as e:
+            return self._fail(f"FAILED - Error parsing XML files: {e}", [])
+
+        if self.changes:
+            # Show detailed differences for each changed paragraph
+            error_message = self._generate_detailed_diff(self.changes)
+            header, *details = error_message.split("\n")
+            return self._fail(
+                header,
+                details,
+                details=[change.to_dict() for change in self.changes],
+            )
+
+        if self.verbose:
+            self._print("PASSED - All changes by Claude are properly tracked")
+        return True
+
+    @staticmethod
+    def _open_document_xml(package):
+        """Open word/document.xml of an unpacked directory or a .docx for reading."""
+        if package.is_file():
+            with zipfile.ZipFile(package, "r") as zip_ref:
+                return zip_ref.open("word/document.xml")
+        return open(package / "word" / "document.xml", "rb")
+
+    def _has_claude_changes(self):
+        """Return True if the modified document has a w:ins or w:del by Claude.
+
+        Stops reading at the first one found.
+        """
+        w = self.namespaces["w"]
+        change_tags = (f"{{{w}}}ins", f"{{{w}}}del")
+        author_attr = f"{{{w}}}author"
+        with self._open_document_xml(self.unpacked_dir) as f:
+            for event, elem in lxml.etree.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if elem.tag in change_tags and elem.get(author_attr) == "Claude":
+                        return True
+                    continue
+                self._free(elem)
+        return False
+
+    def _find_first_difference(self):
+        """Compare the documents paragraph by paragraph until they diverge.
+
+        Returns:
+            list: The ParagraphChange at the first divergence, or [] if the
+            text matches
+        """
+        with self._open_document_xml(
+            self.original_docx
+        ) as original_file, self._open_document_xml(self.unpacked_dir) as modified_file:
+            for original, modified in zip_longest(
+                self._iter_paragraphs(original_file),
+                self._iter_paragraphs(modified_file),
+            ):
+                if original is None or modified is None or original[1] != modified[1]:
+                    return [paragraph_change(original, modified)]
+        return []
+
+    def _diff_all_paragraphs(self):
+        """Find every paragraph that differs between the documents.
+
+        Returns:
+            list: ParagraphChange per differing paragraph, in document order
+        """
+        paragraphs = []
+        for package in (self.original_docx, self.unpacked_dir):
+            with self._open_document_xml(package) as f:
+                paragraphs.append(list(self._iter_paragraphs(f)))
+        return diff_paragraphs(*paragraphs)
+
+    def _generate_detailed_diff(self, changes):
+        """Generate the failure report with word-level differences per paragraph."""
         error_parts = [
             "FAILED - Document text doesn't match after removing Claude's tracked changes",
             "",
@@ -125,154 +170,87 @@ class RedliningValidator:
             "  - To reject another's INSERTION: Nest <w:del> inside their <w:ins>",
             "  - To restore another's DELETION: Add new <w:ins> AFTER their <w:del>",
             "",
+            "Differences:",
+            "============",
         ]
-
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
-
+        error_parts.extend(format_changes(changes))
+        if not self.full_diff:
+            error_parts.append(
+                "(Stopped at the first difference; use --full-diff to list all)"
+            )
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
+    def _iter_paragraphs(self, source):
+        """Stream the text of each paragraph from Word XML.
 
-        return None
-
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
-        author_attr = f"{{{self.namespaces['w']}}}author"
-
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
-
-        # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
-
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
+        Claude's tracked changes are removed on the fly: text inside a w:ins by
+        Claude is dropped, and w:delText inside a w:del by Claude counts as
+        regular text. Elements are freed as soon as they have been read.
 
         Empty paragraphs are skipped to avoid false positives when tracked
         insertions add only structural elements without text content.
-        """
-        p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
 
-        paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
-
-        return "\n".join(paragraphs)
+        Yields:
+            tuple: (paragraph index, text), where the index counts all w:p
+            elements in document order (outside Claude's insertions)
+        """
+        w = self.namespaces["w"]
+        p_tag = f"{{{w}}}p"
+        t_tag = f"{{{w}}}t"
+        deltext_tag = f"{{{w}}}delText"
+        ins_tag = f"{{{w}}}ins"
+        del_tag = f"{{{w}}}del"
+        author_attr = f"{{{w}}}author"
+
+        index = 0
+        inserted_depth = deleted_depth = 0  # Claude's w:ins and w:del being read
+        open_paragraphs = []  # (index, text parts) of the w:p being read
+        finished = []  # Paragraphs nested in one that is still being read
+        for event, elem in lxml.etree.iterparse(source, events=("start", "end")):
+            tag = elem.tag
+            claude = tag in (ins_tag, del_tag) and elem.get(author_attr) == "Claude"
+            if event == "start":
+                if claude:
+                    if tag == ins_tag:
+                        inserted_depth += 1
+                    else:
+                        deleted_depth += 1
+                elif tag == p_tag and not inserted_depth:
+                    open_paragraphs.append((index, []))
+                    index += 1
+                continue
+
+            if claude:
+                if tag == ins_tag:
+                    inserted_depth -= 1
+                else:
+                    deleted_depth -= 1
+            elif inserted_depth:
+                pass
+            elif tag == t_tag or (tag == deltext_tag and deleted_depth):
+                # Text belongs to every paragraph it is nested in
+                if elem.text:
+                    for _, parts in open_paragraphs:
+                        parts.append(elem.text)
+            elif tag == p_tag:
+                paragraph_index, parts = open_paragraphs.pop()
+                # Skip empty paragraphs - they don't affect content validation
+                if parts:
+                    finished.append((paragraph_index, "".join(parts)))
+                if not open_paragraphs:
+                    # Nested paragraphs end first but come after their parent
+                    finished.sort()
+                    yield from finished
+                    finished = []
+
+            self._free(elem)
+
+    @staticmethod
+    def _free(elem):
+        """Drop an element that iterparse has finished, and its read siblings."""
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
 
 
 if __name__ == "__main__":
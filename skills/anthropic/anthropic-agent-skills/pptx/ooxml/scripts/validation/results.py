@@ -0,0 +1,154 @@
+"""
+Structured validation results with per-check timing.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CheckResult:
+    """Outcome and cost of one validation check."""
+
+    name: str
+    passed: bool = True
+    errors: list = field(default_factory=list)
+    output: list = field(default_factory=list)  # Report lines, in order
+    files: set = field(default_factory=set)  # Parts the check read
+    elements: int = 0  # Elements walked by rule traversals
+    details: list = field(default_factory=list)  # Structured findings, if any
+    wall_time: float = 0.0
+    cpu_time: float = 0.0  # CPU time of this process (not of worker processes)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "passed": self.passed,
+            "errors": self.errors,
+            "files": len(self.files),
+            "elements": self.elements,
+            "wall_time": round(self.wall_time, 6),
+            "cpu_time": round(self.cpu_time, 6),
+            **({"details": self.details} if self.details else {}),
+        }
+
+
+class ValidationResult:
+    """Results of all checks run by one validator, in the order they ran."""
+
+    def __init__(self, validator_name):
+        self.validator = validator_name
+        self.checks = []
+        self.notes = []  # Report lines that belong to no check (e.g. cache statistics)
+
+    @property
+    def passed(self):
+        return all(check.passed for check in self.checks)
+
+    def format_text(self):
+        """Return the human-readable report, as printed by validate()."""
+        lines = [line for check in self.checks for line in check.output]
+        return "\n".join(lines + self.notes)
+
+    def format_timings(self):
+        """Return a table of per-check cost, slowest first."""
+        lines = [
+            f"{self.validator}:",
+            f"  {'check':<24} {'wall (s)':>9} {'cpu (s)':>9} {'files':>6} {'elements':>9}",
+        ]
+        for check in sorted(self.checks, key=lambda c: c.wall_time, reverse=True):
+            lines.append(
+                f"  {check.name:<24} {check.wall_time:>9.4f} {check.cpu_time:>9.4f} "
+                f"{len(check.files):>6} {check.elements:>9}"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            "validator": self.validator,
+            "passed": self.passed,
+            "checks": [check.to_dict() for check in self.checks],
+        }
+
+
+class ResultRecorder:
+    """Mixin that records a validator's checks into a ValidationResult.
+
+    Checks report through _print() and _fail() instead of print(). During
+    validate() their output is collected in the running check's CheckResult
+    and printed as one report at the end (unless the validator was created
+    with report=False). Outside validate(), e.g. when a check method is called
+    directly, output is printed immediately as before.
+    """
+
+    result = None
+    report = True
+    _recording = False
+    _current_check = None
+
+    def _start_report(self):
+        self.result = ValidationResult(type(self).__name__)
+        self._recording = True
+        self._current_check = None
+
+    def _finish_report(self):
+        """Print the collected report and return whether all checks passed."""
+        self._recording = False
+        text = self.result.format_text()
+        if self.report and text:
+            print(text)
+        return self.result.passed
+
+    def _check(self, name, method):
+        """Run a check method as a named, timed check and return whether it passed."""
+        check = CheckResult(name)
+        self.result.checks.append(check)
+        self._current_check = check
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            outcome = method()
+        finally:
+            check.wall_time = time.perf_counter() - wall_start
+            check.cpu_time = time.process_time() - cpu_start
+            self._current_check = None
+
+        # Checks that only report (returning None) never fail
+        if outcome is False:
+            check.passed = False
+        return check.passed
+
+    def _print(self, *args):
+        """Report a line of output for the running check."""
+        text = " ".join(str(arg) for arg in args)
+        if not self._recording:
+            print(text)
+        elif self._current_check is not None:
+            self._current_check.output.extend(text.split("\n"))
+        else:
+            self.result.notes.extend(text.split("\n"))
+
+    def _fail(self, header, errors, *notes, details=()):
+        """Report a failed check with its errors and return False.
+
+        details are JSON-serializable findings kept alongside the errors.
+        """
+        if self._current_check is not None:
+            # A failure without itemized errors is described by its header
+            self._current_check.errors.extend(errors or [header.strip()])
+            self._current_check.details.extend(details)
+        self._print(header)
+        for error in errors:
+            self._print(error)
+        for note in notes:
+            self._print(note)
+        return False
+
+    def _visit(self, xml_file, elements=0):
+        """Count a part (and the elements walked in it) toward the running check."""
+        if self._current_check is not None:
+            self._current_check.files.add(str(xml_file))
+            self._current_check.elements += elements
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,74 @@
+"""
+Process-wide cache of compiled XSD schemas.
+"""
+
+import threading
+from pathlib import Path
+
+import lxml.etree
+
+
+class SchemaRegistry:
+    """Compiles each XSD schema once per process and hands out the compiled copy.
+
+    Schemas are keyed by their resolved path and modification time, so editing
+    a schema file on disk invalidates its entry. The registry is shared by all
+    validator instances in the process.
+    """
+
+    def __init__(self):
+        self._schemas = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, schema_path):
+        """Return the compiled lxml.etree.XMLSchema for a schema file."""
+        schema_path = Path(schema_path).resolve()
+        key = (str(schema_path), schema_path.stat().st_mtime_ns)
+
+        with self._lock:
+            if key in self._schemas:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._schemas[key] = self._compile(schema_path)
+
+                # Drop entries compiled from an older version of the same file
+                for stale_key in [k for k in self._schemas if k[0] == key[0]]:
+                    if stale_key != key:
+                        del self._schemas[stale_key]
+
+            schema = self._schemas[key]
+
+        # Schemas that failed to compile are cached as their error
+        if isinstance(schema, Exception):
+            raise schema
+        return schema
+
+    def _compile(self, schema_path):
+        """Parse and compile a schema, returning the exception if it fails."""
+        try:
+            with open(schema_path, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(
+                    xsd_file, parser=parser, base_url=str(schema_path)
+                )
+            return lxml.etree.XMLSchema(xsd_doc)
+        except Exception as e:
+            return e
+
+    def clear(self):
+        """Forget all compiled schemas and reset the counters."""
+        with self._lock:
+            self._schemas.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by DOCXSchemaValidator, PPTXSchemaValidator and Document.validate()
+schema_registry = SchemaRegistry()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,188 @@
+"""
+Access to the parts of an Office document, unpacked on disk or still zipped.
+"""
+
+import io
+import os
+import zipfile
+from pathlib import Path, PurePosixPath
+
+import lxml.etree
+
+
+class DirectorySource:
+    """Parts of an Office document unpacked into a directory."""
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+
+    def files(self):
+        """Return the paths of all files in the document."""
+        return [f for f in self.root.rglob("*") if f.is_file()]
+
+    def rglob(self, pattern):
+        """Return the paths of all files whose name matches pattern, at any depth."""
+        return list(self.root.rglob(pattern))
+
+    def glob(self, pattern):
+        """Return the paths matching pattern relative to the document root."""
+        return list(self.root.glob(pattern))
+
+    def is_file(self, path):
+        return Path(path).is_file()
+
+    def resolve(self, path):
+        """Return path with symlinks and '..' components resolved."""
+        return Path(path).resolve()
+
+    def open(self, path):
+        """Open a part for reading as a binary stream."""
+        return open(path, "rb")
+
+    def parse(self, path):
+        """Parse an XML part into an lxml tree."""
+        return lxml.etree.parse(str(path))
+
+    def close(self):
+        pass
+
+
+class _ListedSource:
+    """Parts of an Office document known by name, presented as paths below root.
+
+    Subclasses set root, _names (the part names, in order) and _name_set.
+    """
+
+    def _member(self, path):
+        """Return the part name for a path below root (None if outside)."""
+        try:
+            return Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+    def files(self):
+        return [self.root / name for name in self._names]
+
+    def rglob(self, pattern):
+        return [
+            self.root / name
+            for name in self._names
+            if PurePosixPath(name).match(pattern)
+        ]
+
+    def glob(self, pattern):
+        depth = len(PurePosixPath(pattern).parts)
+        return [
+            self.root / name
+            for name in self._names
+            if len(PurePosixPath(name).parts) == depth
+            and PurePosixPath(name).match(pattern)
+        ]
+
+    def is_file(self, path):
+        return self._member(path) in self._name_set
+
+    def resolve(self, path):
+        # Parts may not be on disk below root, so only '..' components are resolved
+        return Path(os.path.normpath(path))
+
+
+class ArchiveSource(_ListedSource):
+    """Parts of an Office document read directly from its zip archive.
+
+    Part paths are presented as if the archive were a directory, e.g.
+    "report.docx/word/document.xml", so validators can treat both sources
+    alike. Nothing is extracted to disk: parts are read into memory only
+    when parsed.
+    """
+
+    def __init__(self, archive):
+        self.root = Path(archive).resolve()
+        self._zip = None
+        with zipfile.ZipFile(self.root, "r") as zf:
+            self._names = [n for n in zf.namelist() if not n.endswith("/")]
+        self._name_set = set(self._names)
+
+    def __getstate__(self):
+        # Open archives cannot be pickled; worker processes reopen on demand
+        state = self.__dict__.copy()
+        state["_zip"] = None
+        return state
+
+    def _archive(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.root, "r")
+        return self._zip
+
+    def open(self, path):
+        # Decompressed incrementally as it is read
+        return self._archive().open(self._member(path))
+
+    def read_bytes(self, path):
+        """Return the content of a part."""
+        return self._archive().read(self._member(path))
+
+    def parse(self, path):
+        return lxml.etree.parse(io.BytesIO(self.read_bytes(path)))
+
+    def close(self):
+        """Release the archive (it is reopened if parts are read again)."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+class OverlaySource(_ListedSource):
+    """Parts of an unpacked document whose changed files are kept apart from it.
+
+    Files in root (e.g. a workspace holding the parts that were edited)
+    stand in for the files of the same name in base, the unpacked document;
+    every other part is read from base. Parts are presented as paths below
+    root, e.g. "workspace/word/media/image1.png", wherever they are read from.
+    """
+
+    def __init__(self, root, base):
+        self.root = Path(root).resolve()
+        self.base = Path(base).resolve()
+        self._changed = self._part_names(self.root)
+        self._name_set = self._changed | self._part_names(self.base)
+        self._names = sorted(self._name_set)
+
+    @staticmethod
+    def _part_names(directory):
+        return {
+            f.relative_to(directory).as_posix()
+            for f in directory.rglob("*")
+            if f.is_file()
+        }
+
+    def _file(self, path):
+        """Return the file on disk holding the part at path."""
+        name = self._member(path)
+        return (self.root if name in self._changed else self.base) / name
+
+    def open(self, path):
+        return open(self._file(path), "rb")
+
+    def parse(self, path):
+        return lxml.etree.parse(str(self._file(path)))
+
+    def close(self):
+        pass
+
+
+def open_source(path):
+    """Return the part source for an unpacked directory or an Office file.
+
+    Sources, e.g. an OverlaySource, are returned as they are.
+    """
+    if isinstance(path, (DirectorySource, _ListedSource)):
+        return path
+    path = Path(path)
+    if path.is_file():
+        return ArchiveSource(path)
+    return DirectorySource(path)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -3,11 +3,14 @@
 Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--level N]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill --level 9
+
+--level sets the deflate level from 0 (fastest) to 9 (smallest), default 6.
 """
 
 import sys
@@ -15,14 +18,24 @@ import zipfile
 from pathlib import Path
 from quick_validate import validate_skill
 
+# Files whose format is already compressed are stored, since deflating them
+# again costs time for next to no gain in size
+STORED_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.mp3', '.m4a', '.mp4', '.mov', '.webm',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz',
+    '.docx', '.xlsx', '.pptx', '.skill',
+}
+
 
-def package_skill(skill_path, output_dir=None):
+def package_skill(skill_path, output_dir=None, compresslevel=None):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        compresslevel: Optional deflate level from 0 to 9 (defaults to zlib's default, 6)
 
     Returns:
         Path to the created .skill file, or None if error
@@ -71,7 +84,10 @@ def package_skill(skill_path, output_dir=None):
                 if file_path.is_file():
                     # Calculate the relative path within the zip
                     arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
+                    if file_path.suffix.lower() in STORED_EXTENSIONS:
+                        zipf.write(file_path, arcname, zipfile.ZIP_STORED)
+                    else:
+                        zipf.write(file_path, arcname, compresslevel=compresslevel)
                     print(f"  Added: {arcname}")
 
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
@@ -82,23 +98,39 @@ def package_skill(skill_path, output_dir=None):
         return None
 
 
+def print_usage():
+    print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory] [--level N]")
+    print("\nExample:")
+    print("  python utils/package_skill.py skills/public/my-skill")
+    print("  python utils/package_skill.py skills/public/my-skill ./dist")
+    print("  python utils/package_skill.py skills/public/my-skill --level 9")
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
+    args = sys.argv[1:]
+    compresslevel = None
+    if "--level" in args:
+        index = args.index("--level")
+        level = args[index + 1] if index + 1 < len(args) else ""
+        if not (level.isdigit() and 0 <= int(level) <= 9):
+            print("❌ Error: --level must be a number from 0 to 9")
+            sys.exit(1)
+        compresslevel = int(level)
+        del args[index:index + 2]
+
+    if len(args) < 1:
+        print_usage()
         sys.exit(1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    skill_path = args[0]
+    output_dir = args[1] if len(args) > 1 else None
 
     print(f"📦 Packaging skill: {skill_path}")
     if output_dir:
         print(f"   Output directory: {output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(skill_path, output_dir, compresslevel)
 
     if result:
         sys.exit(0)